@@ -0,0 +1,113 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements camera-aware adaptive deflection for the mesher.
+
+With a constant linear deflection, tiny far-away objects are meshed as
+finely as foreground ones, which produces a lot of sub-pixel triangles. In
+adaptive mode (see Project 'AdaptiveDeflection' property), the linear
+deflection of each object is derived from the camera and the object bounding
+box, so that the meshing error does not exceed a given size on screen (in
+pixels).
+
+The deflection is computed at the point of the object bounding box which is
+the nearest from the camera (worst case), and clamped between a minimum and
+a maximum.
+"""
+
+import math
+
+import FreeCAD as App
+
+
+class AdaptiveDeflection:
+    """A calculator of camera-aware linear deflections."""
+
+    def __init__(
+        self,
+        camera,
+        resolution,
+        max_error,
+        min_deflection,
+        max_deflection,
+    ):
+        """Initialize calculator.
+
+        Args:
+            camera -- the camera (an object with Placement, Projection,
+                HeightAngle and Height properties, see camera module)
+            resolution -- rendering resolution in pixels (width, height)
+            max_error -- maximum screen-space error, in pixels (float)
+            min_deflection -- minimum linear deflection (float)
+            max_deflection -- maximum linear deflection (float)
+        """
+        _, height = resolution
+        self.position = App.Vector(camera.Placement.Base)
+        self.max_error = float(max_error)
+        self.min_deflection = float(min_deflection)
+        self.max_deflection = max(float(max_deflection), self.min_deflection)
+
+        if camera.Projection == "Orthographic":
+            # Pixel size is constant
+            self.pixel_size = float(camera.Height) / height
+            self.pixel_ratio = 0.0
+        else:
+            # Pixel size is proportional to distance
+            fov = math.radians(float(camera.HeightAngle))
+            self.pixel_size = 0.0
+            self.pixel_ratio = 2.0 * math.tan(fov / 2) / height
+
+    def get_deflection(self, bbox):
+        """Get the linear deflection for an object.
+
+        Args:
+            bbox -- the object bounding box, in global coordinates
+                (App.BoundBox)
+
+        Returns:
+            The linear deflection (float)
+        """
+        pos = self.position
+        distance = math.hypot(
+            max(bbox.XMin - pos.x, 0.0, pos.x - bbox.XMax),
+            max(bbox.YMin - pos.y, 0.0, pos.y - bbox.YMax),
+            max(bbox.ZMin - pos.z, 0.0, pos.z - bbox.ZMax),
+        )
+        pixel_size = self.pixel_size + self.pixel_ratio * distance
+        deflection = self.max_error * pixel_size
+        return min(max(deflection, self.min_deflection), self.max_deflection)
+
+
+def get_bound_box(obj):
+    """Get the bounding box of an object, in global coordinates.
+
+    Returns:
+        The bounding box (App.BoundBox) or None if it cannot be computed
+    """
+    for attr_name in ("Shape", "Mesh"):
+        try:
+            bbox = getattr(obj, attr_name).BoundBox
+        except AttributeError:
+            continue
+        if bbox.isValid():
+            return bbox
+    return None
@@ -0,0 +1,222 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements view-frustum and sub-pixel culling of views.
+
+In large scenes rendered from an interior camera, most of the objects are
+often outside the camera field of view, but still meshed and written. In
+culling mode (see Project 'Culling' property), the bounding box of each view
+is tested against the camera frustum before export, and views that are fully
+outside the frustum, or that project below a given number of pixels, are
+skipped.
+
+Culling is conservative: frustum is enlarged by a safety margin, views
+without bounding box are kept, and lights, cameras and emissive objects are
+never culled. Nota: culled objects do not cast shadows nor appear in
+reflections anymore.
+"""
+
+import math
+import itertools
+
+import FreeCAD as App
+
+from Render.rdrhandler import RenderingTypes
+from Render.rendermaterial import is_multimat, is_valid_material
+from Render.adaptivedeflection import get_bound_box
+from Render.utils import getproxyattr
+
+
+# Keywords denoting emission in passthrough materials
+_EMISSIVE_WORDS = ("emissi", "emit", "light")
+
+
+class FrustumCulling:
+    """A visibility tester for bounding boxes, from a camera."""
+
+    def __init__(self, camera, resolution, margin, min_pixels):
+        """Initialize tester.
+
+        Args:
+            camera -- the camera (an object with Placement, Projection,
+                HeightAngle and Height properties, see camera module)
+            resolution -- rendering resolution in pixels (width, height)
+            margin -- safety margin, relative to frustum size (float)
+            min_pixels -- minimum projected size, in pixels (float, 0 to
+                disable sub-pixel culling)
+        """
+        width, height = resolution
+        aspect = width / height
+        scale = 1.0 + max(float(margin), 0.0)
+        self.position = App.Vector(camera.Placement.Base)
+        self.rotation = camera.Placement.Rotation.inverted()
+        self.min_pixels = max(float(min_pixels), 0.0)
+        self.orthographic = camera.Projection == "Orthographic"
+
+        if self.orthographic:
+            # Frustum is a box (half-sizes), pixel size is constant
+            half_height = float(camera.Height) / 2
+            self.half_sizes = (
+                half_height * aspect * scale,
+                half_height * scale,
+            )
+            self.pixel_size = float(camera.Height) / height
+            self.pixel_ratio = 0.0
+        else:
+            # Frustum is a pyramid (half-slopes), pixel size is proportional
+            # to distance
+            tan_y = math.tan(math.radians(float(camera.HeightAngle)) / 2)
+            self.half_sizes = (tan_y * aspect * scale, tan_y * scale)
+            self.pixel_size = 0.0
+            self.pixel_ratio = 2.0 * tan_y / height
+
+    def test(self, bbox):
+        """Test whether a bounding box may be visible.
+
+        Args:
+            bbox -- the bounding box, in global coordinates (App.BoundBox)
+
+        Returns:
+            None if the box may be visible, otherwise the reason why it is
+            not (string)
+        """
+        if self._is_outside(bbox):
+            return "outside frustum"
+        if self.min_pixels and self._projected_size(bbox) < self.min_pixels:
+            return "sub-pixel"
+        return None
+
+    def _is_outside(self, bbox):
+        """Check whether a bounding box is fully outside the frustum.
+
+        The box is outside if all its corners are on the outer side of the
+        same frustum plane (conservative test).
+        """
+        # Corners in camera coordinates (x right, y up, depth forward)
+        corners = [
+            self.rotation.multVec(App.Vector(*c) - self.position)
+            for c in itertools.product(
+                (bbox.XMin, bbox.XMax),
+                (bbox.YMin, bbox.YMax),
+                (bbox.ZMin, bbox.ZMax),
+            )
+        ]
+        corners = [(c.x, c.y, -c.z) for c in corners]
+        half_x, half_y = self.half_sizes
+
+        if self.orthographic:
+            planes = (
+                lambda x, y, d: x + half_x,
+                lambda x, y, d: half_x - x,
+                lambda x, y, d: y + half_y,
+                lambda x, y, d: half_y - y,
+            )
+        else:
+            planes = (
+                lambda x, y, d: d,
+                lambda x, y, d: x + half_x * d,
+                lambda x, y, d: half_x * d - x,
+                lambda x, y, d: y + half_y * d,
+                lambda x, y, d: half_y * d - y,
+            )
+
+        return any(all(p(*c) < 0.0 for c in corners) for p in planes)
+
+    def _projected_size(self, bbox):
+        """Get the projected size of a bounding box, in pixels (upper bound).
+
+        The size is computed at the point of the box which is the nearest from
+        the camera.
+        """
+        pos = self.position
+        distance = math.hypot(
+            max(bbox.XMin - pos.x, 0.0, pos.x - bbox.XMax),
+            max(bbox.YMin - pos.y, 0.0, pos.y - bbox.YMax),
+            max(bbox.ZMin - pos.z, 0.0, pos.z - bbox.ZMax),
+        )
+        pixel_size = self.pixel_size + self.pixel_ratio * distance
+        if pixel_size <= 0.0:
+            return math.inf
+        return bbox.DiagonalLength / pixel_size
+
+
+def cull_views(views, culling):
+    """Split views into visible and culled ones.
+
+    Args:
+        views -- the views to test (list of Render.View)
+        culling -- the visibility tester (FrustumCulling)
+
+    Returns:
+        A list of visible views and a list of (culled view, reason) tuples
+    """
+    visible, culled = [], []
+    for view in views:
+        reason = None if _is_protected(view) else _test_view(view, culling)
+        if reason:
+            culled.append((view, reason))
+        else:
+            visible.append(view)
+    return visible, culled
+
+
+def _test_view(view, culling):
+    """Test a view for culling (see FrustumCulling.test)."""
+    bbox = get_bound_box(view.Source)
+    return culling.test(bbox) if bbox is not None else None
+
+
+def _is_protected(view):
+    """Check whether a view must never be culled.
+
+    Lights and cameras are protected, as well as emissive objects, which may
+    lighten the scene from outside the frustum.
+    """
+    source = view.Source
+    rendering_type = getproxyattr(source, "RENDERING_TYPE", None)
+    if rendering_type not in (None, RenderingTypes.OBJECT):
+        return True
+    materials = (
+        getattr(view, "Material", None),
+        getattr(source, "Material", None),
+    )
+    return any(_is_emissive(m) for m in materials)
+
+
+def _is_emissive(material):
+    """Check whether a material may be emissive.
+
+    Passthrough materials are checked by keywords (conservative).
+    """
+    if is_multimat(material):
+        return any(_is_emissive(m) for m in material.Materials)
+    if not is_valid_material(material):
+        return False
+    mat = material.Material
+    if mat.get("Render.Type", None) == "Emission":
+        return True
+    passthrough = (
+        str(v).lower()
+        for k, v in mat.items()
+        if k.startswith("Render.") and k.rsplit(".", 1)[-1].isdigit()
+    )
+    return any(w in line for line in passthrough for w in _EMISSIVE_WORDS)
@@ -0,0 +1,214 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements cost estimation for scene export scheduling.
+
+Export is run by a pool of workers (see 'project._get_objstrings_worker').
+To keep the pool busy, views are scheduled by decreasing processing time
+(LPT - longest processing time first), so that a heavy object is not
+started last.
+
+Processing time is estimated from cheap signals (faces and edges counts,
+size relative to meshing deflection, facets count for meshes, array or link
+multiplicity). Estimates are expressed in arbitrary units, roughly
+proportional to the number of triangles to generate.
+
+Actual durations are recorded after export, so that later exports of the
+same document may use them instead of estimates. Recorded timings are
+also used to scale estimates of new objects into seconds.
+"""
+
+import os
+import math
+import json
+import hashlib
+
+import FreeCAD as App
+
+from Render.constants import USERAPPDIR
+from Render.utils import debug
+
+
+# Timings location
+TIMINGSDIR = os.path.join(USERAPPDIR, "Render", "ExportTimings")
+
+# Cost weights
+FACE_COST = 20.0  # Per face
+EDGE_COST = 2.0  # Per edge
+FACET_COST = 0.01  # Per mesh facet
+WRITE_RATIO = 0.1  # Cost of an array/link element, relative to base cost
+MIN_COST = 1.0  # Lights, cameras, empty objects...
+
+# Weight of the last duration in recorded timings (exponential smoothing)
+SMOOTHING = 0.5
+
+
+# ===========================================================================
+#                               Estimates
+# ===========================================================================
+
+
+def estimate_cost(view, linear_deflection):
+    """Estimate the cost of exporting a view.
+
+    Args:
+        view -- the view to estimate (Render.View, or ducktyping object)
+        linear_deflection -- the meshing linear deflection (float)
+
+    Returns:
+        An estimated cost (float, arbitrary units)
+    """
+    try:
+        source = view.Source
+        base, multiplicity = _get_base_and_multiplicity(source)
+        cost = _mesh_cost(base) or _shape_cost(base, linear_deflection)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # Estimation must not break export
+        return MIN_COST
+    cost *= 1.0 + WRITE_RATIO * (multiplicity - 1)
+    return max(cost, MIN_COST)
+
+
+def _get_base_and_multiplicity(source):
+    """Get the object to be actually meshed, and the number of its copies.
+
+    Link arrays and arrays with links mesh their base only once.
+    """
+    if source.isDerivedFrom("App::Link") and source.ElementCount:
+        return source.LinkedObject, source.ElementCount
+    placements = getattr(source, "PlacementList", None)
+    base = getattr(source, "Base", None)
+    if placements and base is not None:
+        return base, len(placements)
+    return source, 1
+
+
+def _mesh_cost(obj):
+    """Compute the cost of a mesh object (or 0 if not a mesh)."""
+    mesh = getattr(obj, "Mesh", None)
+    if mesh is None:
+        return 0.0
+    return FACET_COST * mesh.CountFacets
+
+
+def _shape_cost(obj, linear_deflection):
+    """Compute the cost of a shape object (or 0 if no shape)."""
+    shape = getattr(obj, "Shape", None)
+    if shape is None or shape.isNull():
+        return 0.0
+    diagonal = shape.BoundBox.DiagonalLength
+    resolution = diagonal / linear_deflection if linear_deflection else 1.0
+    base_cost = FACE_COST * len(shape.Faces) + EDGE_COST * len(shape.Edges)
+    return base_cost * (1.0 + math.log2(1.0 + resolution))
+
+
+# ===========================================================================
+#                               Timings
+# ===========================================================================
+
+
+class ExportTimings:
+    """Recorded export timings of a document.
+
+    Timings are stored in user application data directory, one file per
+    document, keyed by object full name.
+    """
+
+    def __init__(self, document):
+        """Initialize timings, loading previous records if any.
+
+        Args:
+            document -- the document to record (App.Document)
+        """
+        docid = getattr(document, "FileName", "") or document.Name
+        digest = hashlib.sha256(docid.encode("utf-8")).hexdigest()
+        self.path = os.path.join(TIMINGSDIR, digest + ".json")
+        try:
+            with open(self.path, encoding="utf-8") as timings_file:
+                self.records = dict(json.load(timings_file))
+        except (OSError, ValueError, TypeError):
+            self.records = {}
+
+    def get(self, name):
+        """Get recorded duration for an object (or None)."""
+        return self.records.get(name)
+
+    def record(self, name, duration):
+        """Record duration for an object."""
+        if (previous := self.records.get(name)) is not None:
+            duration = SMOOTHING * duration + (1.0 - SMOOTHING) * previous
+        self.records[name] = duration
+
+    def save(self):
+        """Save timings."""
+        try:
+            os.makedirs(TIMINGSDIR, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as timings_file:
+                json.dump(self.records, timings_file)
+        except OSError as err:
+            debug("Objstrings", "Timings", f"Cannot save timings ({err})")
+
+
+# ===========================================================================
+#                               Scheduling
+# ===========================================================================
+
+
+def schedule(views, linear_deflection, timings=None):
+    """Compute costs of views, and order them for export (LPT).
+
+    If timings are provided, recorded durations are used in place of
+    estimates, and estimates are scaled to seconds.
+
+    Args:
+        views -- the views to export (list)
+        linear_deflection -- the meshing linear deflection (float)
+        timings -- recorded timings (ExportTimings or None)
+
+    Returns:
+        A list of (index, cost) tuples, by decreasing cost, where 'index' is
+        the index of the view in 'views'
+    """
+    estimates = [estimate_cost(v, linear_deflection) for v in views]
+    recorded = [timings.get(view_name(v)) if timings else None for v in views]
+
+    # Calibrate estimates against recorded timings
+    pairs = [(e, r) for e, r in zip(estimates, recorded) if r is not None]
+    sum_estimates = sum(e for e, _ in pairs)
+    factor = sum(r for _, r in pairs) / sum_estimates if sum_estimates else 1.0
+
+    costs = [
+        r if r is not None else e * factor for e, r in zip(estimates, recorded)
+    ]
+    if pairs:
+        msg = (
+            f"[Render][Objstrings] Scheduling with {len(pairs)} "
+            f"recorded timings (scale: {factor:.3g} s/unit)\n"
+        )
+        App.Console.PrintLog(msg)
+
+    return sorted(enumerate(costs), key=lambda x: x[1], reverse=True)
+
+
+def view_name(view):
+    """Get the name of a view source, for timings records."""
+    return str(view.Source.FullName)
@@ -0,0 +1,752 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements a process-based engine for scene export.
+
+Meshing is the most expensive step of scene export. As it is CPU-bound, it
+does not scale well with the threads used by project export (see
+'project._get_objstrings_worker').
+
+The export engine runs a pool of headless FreeCAD processes (see
+rendermesh_mp/shapemesher.py), to which export threads delegate meshing,
+mesh post-processing (decimation, uv map, autosmooth...) and mesh file
+writing: shapes are shipped to workers as BREP strings, along with meshing
+parameters, and workers build RenderMesh objects, which they keep in
+memory. Export threads get remote meshes in return (see
+RenderMeshRemoteMixin), whose files are written by workers, on request.
+Threads just wait for workers, so that meshes are actually computed and
+written in parallel; only material and object string assembly remain in
+threads.
+
+Small meshes, which are likely to be batched (see staticbatch module), are
+given back to threads as computed internals, instead of being kept in
+workers.
+
+Huge single shapes may also be split into batches of faces, meshed
+concurrently in several workers and stitched back together (see
+'ExportEngine.mesh_faces').
+
+The engine is scoped to an export session (see 'session'). If the engine
+cannot be started, or if a worker dies, the callers are expected to mesh
+by themselves (thread fallback).
+"""
+
+import os
+import sys
+import runpy
+import tempfile
+import threading
+import weakref
+import itertools
+import collections
+import contextlib
+import concurrent.futures
+import multiprocessing as mp
+from multiprocessing import connection
+
+import FreeCAD as App
+import Mesh
+import Part
+
+from Render.constants import PKGDIR, PARAMS
+from Render.utils import debug, warn
+from Render import rendermesh
+
+# pylint: disable=protected-access
+from Render.rendermesh_mixins import _find_python, _topology_np
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    pass
+
+
+# Welding tolerance for split meshing, relative to shape size
+WELD_TOLERANCE = 1e-7
+
+# Tolerance on open edges length for split meshing, relative to free edges
+# length (see ExportEngine.mesh_faces)
+CRACK_TOLERANCE = 1e-5
+
+
+class ExportEngineError(Exception):
+    """Exception raised when the export engine is not able to mesh."""
+
+
+class ExportWorkerError(Exception):
+    """Exception raised when a worker failed to mesh a shape.
+
+    The message contains the worker traceback.
+    """
+
+
+class ExportWorker:
+    """A headless FreeCAD process meshing shapes."""
+
+    START_TIMEOUT = 60  # Seconds
+
+    def __init__(self, python):
+        """Start worker process and wait for it to be ready.
+
+        Raises:
+            ExportEngineError if the worker fails to start
+        """
+        path = os.path.join(PKGDIR, "rendermesh_mp", "shapemesher.py")
+        main_conn, sub_conn = connection.Pipe()
+        init_globals = {"CONNECTION": sub_conn, "SYSPATH": list(sys.path)}
+        kwargs = {"init_globals": init_globals, "run_name": "__main__"}
+        context = mp.get_context("spawn")
+        context.set_executable(python)
+        self._process = context.Process(
+            target=runpy.run_path,
+            args=(path,),
+            kwargs=kwargs,
+            name="render-export",
+            daemon=True,
+        )
+        self._connection = main_conn
+        try:
+            self._process.start()
+        except OSError as err:
+            main_conn.close()
+            raise ExportEngineError(str(err)) from err
+        finally:
+            sub_conn.close()
+
+        reply, content = self._recv(self.START_TIMEOUT)
+        if reply != "ready":
+            self.kill()
+            raise ExportEngineError(f"worker failed to start\n{content}")
+        self.can_render = bool(content)
+
+    def mesh(self, brep, linear_deflection, angular_deflection, path):
+        """Mesh a shape and write the mesh to 'path'.
+
+        Raises:
+            ExportWorkerError if meshing failed (the worker remains usable)
+            ExportEngineError if the worker died
+        """
+        self._request(
+            "mesh", brep, linear_deflection, angular_deflection, path
+        )
+
+    def render(self, key, source, options, path, inline_below):
+        """Build a RenderMesh, and keep it under 'key' (or write it to 'path').
+
+        See rendermesh_mp/shapemesher.py for arguments.
+
+        Returns:
+            a summary of the mesh (dict)
+
+        Raises:
+            See 'mesh'
+        """
+        return self._request(
+            "render", key, source, options, path, inline_below
+        )
+
+    def write(self, key, ratio, args, kwargs):
+        """Write a file from the RenderMesh kept under 'key'.
+
+        See rendermesh_mp/shapemesher.py for arguments.
+
+        Raises:
+            See 'mesh'
+        """
+        self._request("write", key, ratio, args, kwargs)
+
+    def release(self, keys):
+        """Release the RenderMesh objects kept under 'keys'.
+
+        Raises:
+            ExportEngineError if the worker died
+        """
+        self._send(("release", keys))
+
+    def _request(self, *request):
+        """Send a request and wait for the reply."""
+        self._send(request)
+        reply, content = self._recv()
+        if reply == "error":
+            raise ExportWorkerError(content)
+        return content
+
+    def _send(self, request):
+        """Send a request to worker."""
+        try:
+            self._connection.send(request)
+        except OSError as err:
+            self.kill()
+            raise ExportEngineError(str(err)) from err
+
+    def stop(self):
+        """Stop the worker."""
+        try:
+            self._connection.send(("stop",))
+        except OSError:
+            pass
+        self._process.join(ExportWorker.START_TIMEOUT)
+        self.kill()
+
+    def is_alive(self):
+        """Check whether the worker process is alive."""
+        return self._process.is_alive()
+
+    def kill(self):
+        """Kill the worker process."""
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._connection.close()
+
+    def _recv(self, timeout=None):
+        """Receive a reply from worker, watching for worker death."""
+        sentinel = self._process.sentinel
+        ready = connection.wait([self._connection, sentinel], timeout)
+        if self._connection not in ready:
+            self.kill()
+            raise ExportEngineError("worker is not responding")
+        try:
+            return self._connection.recv()
+        except (OSError, EOFError) as err:
+            self.kill()
+            raise ExportEngineError(str(err)) from err
+
+
+class ExportEngine:
+    """A pool of headless FreeCAD workers, for scene export.
+
+    Workers are started on demand, up to 'processes'. Once a worker failed to
+    start, the engine is considered as broken and does not accept meshing
+    requests anymore.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, processes, python):
+        """Initialize engine.
+
+        Args:
+            processes -- the maximum number of workers (int)
+            python -- the Python executable to use (str)
+        """
+        self.processes = processes
+        self.python = python
+        self.broken = False
+        self._workers = []
+        self._idle = []
+        self._released = collections.deque()  # Released remote meshes
+        self._releases = {}  # Remote meshes to release, by worker
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._counter = itertools.count()
+
+    def mesh_shape(
+        self, shape, linear_deflection, angular_deflection, directory
+    ):
+        """Mesh a shape in a worker.
+
+        The shape is meshed with its current placement. Mesh file is written
+        in 'directory', and removed once loaded.
+
+        Args:
+            shape -- the shape to mesh (Part.Shape)
+            linear_deflection -- meshing linear deflection (float)
+            angular_deflection -- meshing angular deflection (float)
+            directory -- a directory for mesh file transfer (str or None)
+
+        Returns:
+            the mesh (Mesh.Mesh)
+
+        Raises:
+            ExportWorkerError if meshing failed in worker
+            ExportEngineError if engine is not able to mesh
+        """
+        brep = shape.exportBrepToString()
+        path = self._transfer_path(directory, ".bms")
+        self._run(
+            ExportWorker.mesh,
+            brep,
+            linear_deflection,
+            angular_deflection,
+            path,
+        )
+        try:
+            return Mesh.Mesh(path)
+        finally:
+            os.remove(path)
+
+    def render_shape(
+        self,
+        shape,
+        linear_deflection,
+        angular_deflection,
+        directory,
+        inline_below=0,
+        **kwargs,
+    ):
+        """Mesh a shape and build a RenderMesh from it, in a worker.
+
+        The shape is meshed with its current placement. The RenderMesh is
+        kept by the worker, which will write its files (remote mesh), unless
+        it has less than 'inline_below' facets: in this case, it is
+        transferred back to the caller.
+
+        Args:
+            shape -- the shape to mesh (Part.Shape)
+            linear_deflection -- meshing linear deflection (float)
+            angular_deflection -- meshing angular deflection (float)
+            directory -- a directory for file transfer (str or None)
+            inline_below -- the facet count below which the RenderMesh is
+                transferred back (int)
+
+        Keyword args:
+            See Render.rendermesh.create_rendermesh
+
+        Returns:
+            the mesh (RenderMesh)
+
+        Raises:
+            See 'mesh_shape'
+        """
+        brep = shape.exportBrepToString()
+        source = ("brep", brep, linear_deflection, angular_deflection)
+        placement = App.Base.Placement()
+        return self._render(source, placement, directory, inline_below, kwargs)
+
+    def render_mesh(self, mesh, directory, inline_below=0, **kwargs):
+        """Build a RenderMesh from a mesh, in a worker.
+
+        The RenderMesh gets the mesh placement as transformation. See
+        'render_shape' for other arguments, return value and exceptions.
+        """
+        placement = mesh.Placement
+        path = self._transfer_path(directory, ".bms")
+        mesh.Placement = App.Base.Placement()
+        try:
+            mesh.write(path)
+        finally:
+            mesh.Placement = placement
+        try:
+            return self._render(
+                ("mesh", path), placement, directory, inline_below, kwargs
+            )
+        finally:
+            os.remove(path)
+
+    def _render(self, source, placement, directory, inline_below, kwargs):
+        """Build a RenderMesh in a worker (helper)."""
+        # Parameters for worker / for local RenderMesh
+        worker_keys = (
+            "autosmooth",
+            "split_angle",
+            "compute_uvmap",
+            "uvmap_projection",
+            "name",
+            "decimation",
+        )
+        local_keys = (
+            "name",
+            "project_directory",
+            "export_directory",
+            "relative_path",
+            "cache_key",
+        )
+        options = {k: v for k, v in kwargs.items() if k in worker_keys}
+        local = {k: v for k, v in kwargs.items() if k in local_keys}
+        if not rendermesh.numpy_enabled():
+            inline_below = 0
+
+        key = next(self._counter)
+        path = self._transfer_path(directory, ".npz")
+        worker, summary = self._run(
+            ExportWorker.render,
+            key,
+            source,
+            options,
+            path,
+            inline_below,
+            can_render=True,
+        )
+
+        if summary["inline"]:
+            try:
+                return rendermesh.load_rendermesh(path, placement, **local)
+            finally:
+                os.remove(path)
+
+        remote = Remote(self, worker, key, summary)
+        return rendermesh.create_remote_rendermesh(remote, placement, **local)
+
+    def write(self, worker, key, ratio, args, kwargs):
+        """Write a file from a remote mesh (see Remote.write)."""
+        self._run(ExportWorker.write, key, ratio, args, kwargs, worker=worker)
+
+    def release(self, worker, key):
+        """Release a remote mesh.
+
+        Release is deferred to next worker request, as worker may be busy.
+        This method is called by Remote finalizers, which may run in any
+        thread, at any time (including while engine lock is held by the
+        same thread): therefore it does not lock (deque.append is atomic).
+        """
+        self._released.append((worker, key))
+
+    def mesh_faces(
+        self, shape, linear_deflection, angular_deflection, directory
+    ):
+        """Mesh a shape in several workers concurrently, by batches of faces.
+
+        This is intended for huge single shapes, which would otherwise keep
+        one worker busy while the others are idle. Faces are split into
+        contiguous batches (one per worker), batches are meshed concurrently
+        and resulting meshes are stitched back together, with welding of
+        the vertices of shared edges (see 'weld_meshes').
+
+        As batches are meshed separately, their shared edges may have been
+        discretized differently, leaving cracks that welding cannot close.
+        In this case, the shape is meshed in one piece (see 'mesh_shape').
+
+        Numpy is required. Otherwise, the shape is meshed in one piece.
+
+        See 'mesh_shape' for arguments, return value and exceptions.
+        """
+        faces = shape.Faces
+        count = min(self.processes, len(faces))
+        if count <= 1 or not rendermesh.numpy_enabled():
+            return self.mesh_shape(
+                shape, linear_deflection, angular_deflection, directory
+            )
+        bounds = [len(faces) * i // count for i in range(count + 1)]
+        batches = [
+            Part.makeCompound(faces[start:stop])
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+
+        def mesh_batch(batch):
+            return self.mesh_shape(
+                batch, linear_deflection, angular_deflection, directory
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(count) as executor:
+            meshes = list(executor.map(mesh_batch, batches))
+
+        tolerance = shape.BoundBox.DiagonalLength * WELD_TOLERANCE
+        points, facets = weld_meshes(meshes, tolerance)
+
+        # Check for cracks: open edges of the merged mesh should lie on free
+        # edges of the shape only. As mesh edges are chords, their total
+        # length cannot exceed free edges one (but for rounding errors).
+        open_length = _open_edges_length(points, facets)
+        free_length = _free_edges_length(shape)
+        if open_length > free_length * (1.0 + CRACK_TOLERANCE) + tolerance:
+            msg = (
+                f"Split meshing left open edges ({open_length} > "
+                f"{free_length}) - Meshing in one piece"
+            )
+            debug("Export", "Engine", msg)
+            return self.mesh_shape(
+                shape, linear_deflection, angular_deflection, directory
+            )
+
+        return Mesh.Mesh((points.tolist(), facets.tolist()))
+
+    def stop(self):
+        """Stop all workers."""
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._idle = []
+            self._released.clear()
+            self._releases = {}
+            self._condition.notify_all()
+        for worker in workers:
+            if worker is not None:
+                worker.stop()
+
+    def _transfer_path(self, directory, extension):
+        """Get a new path for file transfer with workers."""
+        filename = f"_render_export_{os.getpid()}_{next(self._counter)}"
+        return os.path.join(
+            directory or tempfile.gettempdir(), filename + extension
+        )
+
+    def _run(self, method, *args, worker=None, can_render=False):
+        """Run a request in a worker.
+
+        Args:
+            method -- the ExportWorker method to run
+            args -- the arguments to pass to 'method'
+            worker -- the worker to run the request in (ExportWorker). If
+                None, any worker is used.
+            can_render -- flag to require a worker able to build RenderMesh
+                objects (bool)
+
+        Returns:
+            the worker and the result of 'method'
+
+        Raises:
+            See 'mesh_shape'
+        """
+        worker = self._acquire(worker)
+        try:
+            if can_render and not worker.can_render:
+                raise ExportEngineError("worker cannot build render meshes")
+            with self._lock:
+                self._dispatch_releases()
+                releases = self._releases.pop(worker, None)
+            if releases:
+                worker.release(releases)
+            result = method(worker, *args)
+        except ExportEngineError:
+            if worker.is_alive():
+                self._release_worker(worker)
+                raise
+            with self._condition:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+                    self._releases.pop(worker, None)
+                self._condition.notify_all()
+            raise
+        except ExportWorkerError:
+            self._release_worker(worker)
+            raise
+        self._release_worker(worker)
+        return worker, result
+
+    def _dispatch_releases(self):
+        """Dispatch released remote meshes to their workers.
+
+        Must be called with engine lock held.
+        """
+        while True:
+            try:
+                worker, key = self._released.popleft()
+            except IndexError:
+                break
+            if worker in self._workers:
+                self._releases.setdefault(worker, []).append(key)
+
+    def _release_worker(self, worker):
+        """Put a worker back in the idle workers."""
+        with self._condition:
+            if worker in self._workers:
+                self._idle.append(worker)
+                self._condition.notify_all()
+
+    def _acquire(self, worker=None):
+        """Acquire an idle worker, starting a new one if possible.
+
+        If 'worker' is provided, wait for this one specifically.
+        """
+        with self._condition:
+            while True:
+                if worker is not None:
+                    if worker not in self._workers:
+                        raise ExportEngineError("worker is gone")
+                    if worker in self._idle:
+                        self._idle.remove(worker)
+                        return worker
+                elif self._idle:
+                    return self._idle.pop()
+                elif self.broken:
+                    raise ExportEngineError("engine is broken")
+                elif len(self._workers) < self.processes:
+                    self._workers.append(None)  # Reserve slot
+                    break
+                # Wait for a worker to be released (or a slot to be freed)
+                self._condition.wait()
+
+        try:
+            worker = ExportWorker(self.python)
+        except ExportEngineError as err:
+            with self._condition:
+                self._workers.remove(None)
+                self.broken = True
+                self._condition.notify_all()
+            warn("Export", "Engine", f"Cannot start worker ({err})")
+            raise
+        with self._lock:
+            self._workers[self._workers.index(None)] = worker
+        debug("Export", "Engine", f"Worker #{len(self._workers)} started")
+        return worker
+
+
+class Remote:
+    """A handle to a RenderMesh held by an export worker.
+
+    This is the 'remote' attribute of RenderMeshRemoteMixin. Remote mesh is
+    released when the handle is garbage-collected.
+    """
+
+    def __init__(self, engine, worker, key, summary):
+        """Initialize handle.
+
+        Args:
+            engine -- the engine (ExportEngine)
+            worker -- the worker holding the mesh (ExportWorker)
+            key -- the mesh key in worker (int)
+            summary -- the mesh summary, given by worker (dict)
+        """
+        self._engine = engine
+        self._worker = worker
+        self._key = key
+        self.count_points = summary["count_points"]
+        self.count_facets = summary["count_facets"]
+        self.uvmap = summary["uvmap"]
+        self.vnormals = summary["vnormals"]
+        weakref.finalize(self, engine.release, worker, key)
+
+    def write(self, ratio, args, kwargs):
+        """Write a file from remote mesh.
+
+        Args:
+            ratio -- the scale to apply to points (float)
+            args -- the arguments of RenderMesh._write_file_helper (tuple)
+            kwargs -- the keyword arguments to write (dict)
+
+        Raises:
+            See ExportEngine.mesh_shape
+        """
+        self._engine.write(self._worker, self._key, ratio, args, kwargs)
+
+
+def weld_meshes(meshes, tolerance):
+    """Merge meshes, welding coincident vertices.
+
+    Vertices closer than 'tolerance' (roughly: they are snapped to a grid of
+    'tolerance' step) are merged into one, so that meshes of adjacent faces
+    are stitched along their shared edges. Facets which become degenerated
+    are removed.
+
+    Args:
+        meshes -- the meshes to merge (list of Mesh.Mesh)
+        tolerance -- the welding tolerance (float)
+
+    Returns:
+        the points (float64 numpy array, shape (n, 3)) and the facets
+        (int64 numpy array, shape (m, 3)) of the merged mesh
+    """
+    topologies = [_topology_np(mesh) for mesh in meshes]
+    offsets = np.cumsum([0] + [len(p) for p, _ in topologies[:-1]])
+    points = np.concatenate([p for p, _ in topologies]).astype(np.float64)
+    facets = np.concatenate(
+        [f + offset for (_, f), offset in zip(topologies, offsets)]
+    )
+    if not len(points):  # pylint: disable=use-implicit-booleaness-not-len
+        return points, facets
+
+    # Quantize points and merge identical ones (first occurrence order)
+    scale = 1.0 / tolerance if tolerance > 0.0 else 1.0e7
+    # (lexsort is stable: in each group of identical keys, the first
+    # element is the first occurrence)
+    keys = np.round(points * scale).astype(np.int64)
+    order = np.lexsort(keys.T[::-1])
+    sorted_keys = keys[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = np.any(sorted_keys[1:] != sorted_keys[:-1], axis=1)
+    groups = np.cumsum(starts) - 1
+    first = order[starts]
+    inverse = np.empty_like(groups)
+    inverse[order] = groups
+    ranking = np.argsort(first)
+    rank = np.empty_like(ranking)
+    rank[ranking] = np.arange(len(ranking))
+    points = points[first[ranking]]
+    facets = rank[inverse][facets]
+
+    # Remove degenerated facets
+    valid = (
+        (facets[:, 0] != facets[:, 1])
+        & (facets[:, 1] != facets[:, 2])
+        & (facets[:, 2] != facets[:, 0])
+    )
+    return points, facets[valid]
+
+
+def _open_edges_length(points, facets):
+    """Compute the total length of the open edges of a mesh.
+
+    Open edges are edges which belong to only one facet.
+
+    Args:
+        points -- the mesh points (numpy array, shape (n, 3))
+        facets -- the mesh facets (numpy array, shape (m, 3))
+    """
+    edges = np.sort(facets[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    codes = edges[:, 0].astype(np.int64) * len(points) + edges[:, 1]
+    codes, counts = np.unique(codes, return_counts=True)
+    codes = codes[counts == 1]
+    edges = np.stack((codes // len(points), codes % len(points)), axis=1)
+    vectors = points[edges[:, 1]] - points[edges[:, 0]]
+    return float(np.sum(np.linalg.norm(vectors, axis=1)))
+
+
+def _free_edges_length(shape):
+    """Compute the total length of the free edges of a shape.
+
+    Free edges are edges which belong to only one face (seam edges, which
+    belong twice to a same face, are not free).
+    """
+    # Face.Edges holds seam edges once, whereas wire.OrderedEdges holds them
+    # twice (one per orientation)
+    edges = [
+        edge
+        for face in shape.Faces
+        for wire in face.Wires
+        for edge in wire.OrderedEdges
+    ]
+    counts = collections.Counter(edge.hashCode() for edge in edges)
+    return sum(edge.Length for edge in edges if counts[edge.hashCode()] == 1)
+
+
+_ENGINE = None
+
+
+@contextlib.contextmanager
+def session():
+    """Open an export session, with a process-based engine.
+
+    The number of workers is given by 'ExportProcesses' parameter (0 means
+    the engine is disabled: export is done by threads only).
+
+    Yields:
+        the engine, or None if it is disabled
+    """
+    global _ENGINE  # pylint: disable=global-statement
+    processes = PARAMS.GetInt("ExportProcesses")
+    python = _find_python()
+    if processes <= 0 or not python:
+        yield None
+        return
+
+    engine = ExportEngine(processes, python)
+    _ENGINE = engine
+    try:
+        yield engine
+    finally:
+        _ENGINE = None
+        engine.stop()
+
+
+def get_engine():
+    """Get the engine of current export session (or None)."""
+    return _ENGINE
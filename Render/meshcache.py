@@ -0,0 +1,326 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements a persistent mesh cache for Render workbench.
+
+The mesh cache stores the mesh files written by RenderMesh (OBJ, PLY,
+Cycles, Povray...), so that they can be reused from one rendering to another
+when neither the geometry nor the meshing parameters have changed.
+
+Cache entries are content-addressed: keys are computed from a hash of the
+geometry (shape or mesh, at null placement) and of every parameter that may
+alter the written file.
+
+The cache lives in user application data directory, so that it outlives
+the document transient directory. Its size is bounded: least recently used
+entries are evicted when the limit is exceeded.
+"""
+
+import os
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+
+import FreeCAD as App
+
+from Render.constants import PARAMS, USERAPPDIR
+from Render.utils import debug, message, warn
+
+
+# Cache location
+CACHEDIR = os.path.join(USERAPPDIR, "Render", "MeshCache")
+
+# Cache version - to be incremented when mesh file formats change, in order
+# to invalidate existing entries
+CACHE_VERSION = 1
+
+# Default cache size (MB)
+DEFAULT_SIZE = 2048
+
+# Extensions for cache entries
+_MESHEXT = ".mesh"
+_METAEXT = ".json"
+
+
+# ===========================================================================
+#                                 Keys
+# ===========================================================================
+
+
+def make_key(*components):
+    """Make a cache key from components.
+
+    Components must have a deterministic 'repr'.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(str(CACHE_VERSION).encode("utf-8"))
+    for component in components:
+        hasher.update(b"\x00")
+        hasher.update(repr(component).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def shape_digest(shape):
+    """Compute a digest of a Part shape geometry.
+
+    The digest is computed at null placement.
+    """
+    shape = shape.copy()
+    shape.Placement = App.Base.Placement()
+    brep = shape.exportBrepToString()
+    return hashlib.sha256(brep.encode("utf-8")).hexdigest()
+
+
+def mesh_digest(mesh):
+    """Compute a digest of a Mesh.Mesh geometry.
+
+    The digest is computed at null placement.
+    """
+    mesh = mesh.copy()
+    mesh.Placement = App.Base.Placement()
+    points, facets = mesh.Topology
+    hasher = hashlib.sha256()
+    hasher.update(repr([tuple(p) for p in points]).encode("utf-8"))
+    hasher.update(repr(facets).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+# ===========================================================================
+#                                 Cache
+# ===========================================================================
+
+
+class MeshCache:
+    """A persistent, size-bounded, content-addressed cache for mesh files.
+
+    Two kinds of entries are stored:
+    - mesh files, keyed by a full key (geometry, meshing parameters and
+      write parameters)
+    - mesh metadata (uv map, vertex normals...), keyed by a base key
+      (geometry and meshing parameters), which allows to know whether a mesh
+      may be reused without recomputing it.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, directory, max_size):
+        """Initialize cache.
+
+        Args:
+            directory -- the directory where the cache is stored (str)
+            max_size -- the maximum size of the cache, in bytes (int)
+        """
+        self.directory = str(directory)
+        self.max_size = int(max_size)
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._size = None  # Lazily computed
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key, extension):
+        """Get path of an entry."""
+        return os.path.join(self.directory, key[:2], key + extension)
+
+    def fetch(self, key, filename):
+        """Copy a cached mesh file to filename.
+
+        Args:
+            key -- the key of the entry (str)
+            filename -- the target file name (str)
+
+        Returns:
+            True if the entry was found and copied, False otherwise.
+        """
+        path = self._path(key, _MESHEXT)
+        try:
+            shutil.copyfile(path, filename)
+            os.utime(path)  # Record access, for LRU
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key, filename, metakey=None, metadata=None):
+        """Store a mesh file into the cache.
+
+        Args:
+            key -- the key of the entry (str)
+            filename -- the mesh file to store (str)
+            metakey -- the key of metadata (str, optional)
+            metadata -- the metadata to store (dict, optional)
+        """
+
+        def copy_mesh(target):
+            with open(filename, "rb") as source:
+                shutil.copyfileobj(source, target)
+
+        try:
+            added = self._write_entry(self._path(key, _MESHEXT), copy_mesh)
+            if metakey is not None:
+                content = json.dumps(metadata or {}).encode("utf-8")
+                added += self._write_entry(
+                    self._path(metakey, _METAEXT), lambda f: f.write(content)
+                )
+        except OSError as err:
+            warn("MeshCache", filename, f"Cannot store mesh ({err})")
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += added
+            oversized = self._get_size() > self.max_size
+        if oversized:
+            self._evict()
+
+    def probe(self, metakey):
+        """Look for metadata of a reusable mesh.
+
+        Args:
+            metakey -- the key of metadata (str)
+
+        Returns:
+            The metadata (dict) if mesh may be reused, None otherwise.
+        """
+        path = self._path(metakey, _METAEXT)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self.reused += 1
+        return metadata
+
+    def reset_counters(self):
+        """Reset hit/miss counters."""
+        with self._lock:
+            self.hits = self.misses = self.reused = 0
+
+    def report(self, name):
+        """Report hit/miss counters in console."""
+        msg = (
+            f"Mesh cache: {self.hits} hit(s), {self.misses} miss(es), "
+            f"{self.reused} mesh(es) reused without meshing"
+        )
+        message("MeshCache", name, msg)
+
+    def clear(self):
+        """Clear the cache."""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
+            self._size = 0
+
+    def _write_entry(self, path, writer):
+        """Write an entry atomically and return its size."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmpname, path)
+        except OSError:
+            os.remove(tmpname)
+            raise
+        return os.path.getsize(path)
+
+    def _entries(self):
+        """List cache entries, as (mtime, size, path) tuples."""
+        res = []
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                res.append((stat.st_mtime, stat.st_size, path))
+        return res
+
+    def _get_size(self):
+        """Get the size of the cache (lock must be held)."""
+        if self._size is None:
+            self._size = sum(e[1] for e in self._entries())
+        return self._size
+
+    def _evict(self):
+        """Evict least recently used entries until cache fits max size."""
+        with self._lock:
+            entries = sorted(self._entries())
+            size = sum(e[1] for e in entries)
+            target = self.max_size * 0.9  # Hysteresis
+            evicted = 0
+            for _, entry_size, path in entries:
+                if size <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                size -= entry_size
+                evicted += 1
+            self._size = size
+        debug("MeshCache", self.directory, f"Evicted {evicted} entries")
+
+
+class MeshCacheMissError(Exception):
+    """Exception raised when a mesh reused from cache lacks its file."""
+
+    def __init__(self, filename):
+        self.filename = str(filename)
+        msg = f"'{filename}' not found in mesh cache."
+        super().__init__(msg)
+
+
+# ===========================================================================
+#                              Session cache
+# ===========================================================================
+
+_MESHCACHE = None
+_MESHCACHE_LOCK = threading.Lock()
+
+
+def get_meshcache():
+    """Get the session mesh cache.
+
+    Returns:
+        The MeshCache object, or None if mesh cache is disabled in
+        preferences.
+    """
+    global _MESHCACHE  # pylint: disable=global-statement
+    if not PARAMS.GetBool("EnableMeshCache"):
+        return None
+    max_size = PARAMS.GetInt("MeshCacheSize") or DEFAULT_SIZE
+    max_size *= 1024 * 1024
+    with _MESHCACHE_LOCK:
+        if _MESHCACHE is None:
+            _MESHCACHE = MeshCache(CACHEDIR, max_size)
+        _MESHCACHE.max_size = max_size
+    return _MESHCACHE
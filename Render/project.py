@@ -29,12 +29,10 @@ the scene to render
 """
 
 import math
-import sys
 import os
 import re
 from collections import namedtuple
 import concurrent.futures
-import itertools as it
 import time
 import tracemalloc
 import traceback
@@ -45,8 +43,17 @@ import FreeCAD as App
 import FreeCADGui as Gui
 
 from Render.constants import TEMPLATEDIR, PARAMS, FCDVERSION
-from Render.rdrhandler import RendererHandler, RendererNotFoundError
+from Render.rdrhandler import (
+    RendererHandler,
+    RendererNotFoundError,
+    RenderingTypes,
+)
 from Render.rdrexecutor import RendererExecutor, RendererWorker, ExporterWorker
+from Render.meshcache import get_meshcache
+from Render import exportengine
+from Render import exportcost
+from Render.adaptivedeflection import AdaptiveDeflection
+from Render.culling import FrustumCulling, cull_views
 from Render.utils import (
     translate,
     set_last_cmd,
@@ -54,6 +61,8 @@ from Render.utils import (
     WHITE,
     is_derived_or_link,
     is_derived_or_link_asm3,
+    getproxyattr,
+    debug,
 )
 from Render.view import View
 from Render.groundplane import create_groundplane_view
@@ -188,6 +197,79 @@ class Project(FeatureBase):
             ),
             math.pi / 6,
         ),
+        "AdaptiveDeflection": Prop(
+            "App::PropertyBool",
+            "Mesher",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "If true, the linear deflection of each object is adapted to "
+                "its distance to the camera, so that the meshing error on "
+                "screen does not exceed 'MaxScreenError' (LinearDeflection "
+                "is then ignored).",
+            ),
+            False,
+        ),
+        "MaxScreenError": Prop(
+            "App::PropertyFloat",
+            "Mesher",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Adaptive deflection: the maximum meshing error on screen, "
+                "in pixels.",
+            ),
+            0.5,
+        ),
+        "MinDeflection": Prop(
+            "App::PropertyFloat",
+            "Mesher",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Adaptive deflection: the minimum linear deflection.",
+            ),
+            0.01,
+        ),
+        "MaxDeflection": Prop(
+            "App::PropertyFloat",
+            "Mesher",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Adaptive deflection: the maximum linear deflection.",
+            ),
+            10.0,
+        ),
+        "Culling": Prop(
+            "App::PropertyBool",
+            "Culling",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "If true, objects outside the camera field of view, or "
+                "smaller than 'CullingMinPixels' on screen, are not exported. "
+                "Lights and emissive objects are never culled. WARNING: "
+                "culled objects do not cast shadows nor appear in "
+                "reflections.",
+            ),
+            False,
+        ),
+        "CullingMargin": Prop(
+            "App::PropertyFloat",
+            "Culling",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Culling: the safety margin, relative to the camera field of "
+                "view (0.1 = 10%).",
+            ),
+            0.1,
+        ),
+        "CullingMinPixels": Prop(
+            "App::PropertyFloat",
+            "Culling",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Culling: the minimum size of an object on screen, in pixels "
+                "(0 = no sub-pixel culling).",
+            ),
+            1.0,
+        ),
         "TransparencySensitivity": Prop(
             "App::PropertyIntegerConstraint",
             "Render",
@@ -465,6 +547,8 @@ class Project(FeatureBase):
                 project_directory=project_directory,
                 object_directory=object_directory,
                 skip_meshing=skip_meshing,
+                adaptive_deflection=self._get_adaptive_deflection(),
+                static_batching=PARAMS.GetInt("StaticBatchingFacets", 0),
             )
         except RendererNotFoundError as err:
             msg = translate("Render", "Renderer not found ('{}') ")
@@ -478,17 +562,17 @@ class Project(FeatureBase):
         # scene
         defaultcam = self._get_default_cam(renderer)
 
-        # Get objects rendering strings (including lights, cameras...)
-        objstrings = self._get_objstrings(renderer)
-
-        # Instantiate template: merge all strings (cam, objects, ground
-        # plane...) into rendering template
-        instantiated = _instantiate_template(template, objstrings, defaultcam)
-
-        # Write instantiated template into a temporary file
-        fpath = self._write_instantiated_template_to_file(
-            instantiated, project_directory
-        )
+        # Instantiate template into a temporary file: merge all strings (cam,
+        # objects, ground plane...) into rendering template. Objects
+        # rendering strings (including lights, cameras...) are streamed to
+        # the file as they are computed
+        if meshcache := get_meshcache():
+            meshcache.reset_counters()
+        fpath = self._get_instantiated_template_path(project_directory)
+        with TemplateWriter(template, defaultcam, fpath) as writer:
+            self._write_objstrings(renderer, writer)
+        if meshcache:
+            meshcache.report(self.fpo.Label)
 
         # Get the renderer command on the generated temp file, with rendering
         # params
@@ -574,12 +658,16 @@ class Project(FeatureBase):
 
         return template
 
-    def _get_objstrings(self, renderer):
-        """Get rendering strings for all objects in project.
+    def _write_objstrings(self, renderer, writer):
+        """Write rendering strings for all objects in project.
 
         This method is a (private) subroutine of `render` method.
         Besides standard FCD objects (parts, shapes...), objects encompass
         lights and cameras.
+
+        Args:
+            renderer -- the renderer handler (RendererHandler)
+            writer -- the writer of the instantiated template (TemplateWriter)
         """
         # Gather the views to render
         # If App.Gui is up, we take View's Visibility property into account
@@ -589,6 +677,9 @@ class Project(FeatureBase):
             else self.all_views()
         )
 
+        # Cull views that cannot appear in the image, if required
+        views = self._cull_views(views)
+
         # Add a ground plane if required
         if getattr(self.fpo, "GroundPlane", False):
             views.append(create_groundplane_view(self))
@@ -596,23 +687,20 @@ class Project(FeatureBase):
         # If DelayedBuild is false, we rely on views' ViewResult precomputed
         # values.
         if not self.fpo.DelayedBuild:
-            return [v.ViewResult for v in views]
+            for view in views:
+                writer.write(view.ViewResult)
+            return
 
         # Otherwise, we have to compute strings
-        return _get_objstrings_helper(renderer, views)
+        _get_objstrings_helper(renderer, views, writer.write)
 
-    def _write_instantiated_template_to_file(self, template, directory):
-        """Write an instantiated template to a temporary file.
+    def _get_instantiated_template_path(self, directory):
+        """Get the path of the instantiated template (temporary file).
 
         This method is a (private) subroutine of `render` method.
-
-        Returns path to temp file.
         """
         _, suffix = os.path.splitext(self.fpo.Template)
-        fpath = os.path.join(directory, self.fpo.Name + suffix)
-        with open(fpath, "w", encoding="utf8") as fobj:
-            fobj.write(template)
-        return fpath
+        return os.path.join(directory, self.fpo.Name + suffix)
 
     def _get_rendering_params(self):
         """Fetch the rendering parameters.
@@ -671,8 +759,12 @@ class Project(FeatureBase):
         (console mode), the camera is built from a hardcoded value, hosted in
         DEFAULT_CAMERA_STRING constant.
         """
-        project = self.fpo
-        docname = project.Document.Name
+        camsource = self._get_default_camsource()
+        return renderer.get_camsource_string(camsource, self.fpo)
+
+    def _get_default_camsource(self):
+        """Get default camera data (see `_get_default_cam`)."""
+        docname = self.fpo.Document.Name
         if App.GuiUp:
             App.setActiveDocument(docname)
             camstr = Gui.ActiveDocument.ActiveView.getCamera()
@@ -682,44 +774,181 @@ class Project(FeatureBase):
             camsource = get_cam_from_coin_string(camstr)
         except ValueError:
             camsource = get_cam_from_coin_string(DEFAULT_CAMERA_STRING)
-        return renderer.get_camsource_string(camsource, project)
+        return camsource
 
+    def _get_adaptive_deflection(self):
+        """Get adaptive deflection calculator, if enabled.
 
-def _instantiate_template(template, objstrings, defaultcam):
-    """Instantiate template (merge all objects into template).
+        This function is a (private) subroutine of `render` method.
+        The camera is the first camera of the project, or the default camera
+        if there is none.
 
-    This function is a (private) subroutine of `render` method.
+        Returns:
+            An AdaptiveDeflection object, or None if adaptive deflection is
+            disabled
+        """
+        fpo = self.fpo
+        if not getattr(fpo, "AdaptiveDeflection", False):
+            return None
+        return AdaptiveDeflection(
+            self._get_render_camera(),
+            (fpo.RenderWidth, fpo.RenderHeight),
+            fpo.MaxScreenError,
+            fpo.MinDeflection,
+            fpo.MaxDeflection,
+        )
+
+    def _get_render_camera(self):
+        """Get the camera the scene is rendered from.
+
+        This is the first camera of the project, or the default camera if
+        there is none (see `_get_default_camsource`).
+        """
+        camera = next(
+            (
+                v.Source
+                for v in self.all_views()
+                if getproxyattr(v.Source, "RENDERING_TYPE", None)
+                == RenderingTypes.CAMERA
+            ),
+            None,
+        )
+        return camera or self._get_default_camsource()
+
+    def _cull_views(self, views):
+        """Remove views that cannot appear in the image, if culling enabled.
+
+        This function is a (private) subroutine of `render` method.
+        Culled objects are listed in report view, with the time saved
+        according to recorded export timings (see exportcost module).
+
+        Args:
+            views -- the views to cull (list)
+
+        Returns:
+            The list of remaining views
+        """
+        fpo = self.fpo
+        if not getattr(fpo, "Culling", False) or not views:
+            return views
+        culling = FrustumCulling(
+            self._get_render_camera(),
+            (fpo.RenderWidth, fpo.RenderHeight),
+            fpo.CullingMargin,
+            fpo.CullingMinPixels,
+        )
+        views, culled = cull_views(views, culling)
+
+        timings = exportcost.ExportTimings(fpo.Document)
+        saved, unknown = 0.0, 0
+        for view, reason in culled:
+            label = view.Source.Label
+            msg = f"[Render][Culling] '{label}': Culled ({reason})\n"
+            App.Console.PrintMessage(msg)
+            duration = timings.get(exportcost.view_name(view))
+            if duration is None:
+                unknown += 1
+            else:
+                saved += duration
+        msg = (
+            f"[Render][Culling] {len(culled)} object(s) culled, "
+            f"{len(views)} kept - Time saved: {saved:.3f}s"
+        )
+        if unknown:
+            msg += f" (+ {unknown} object(s) without recorded timings)"
+        App.Console.PrintMessage(msg + "\n")
+        return views
+
+
+class TemplateWriter:
+    """A streaming writer for instantiated templates.
+
+    The template is split once, at RaytracingContent marker. The header
+    (with the camera) is written at once, then object strings are written
+    one by one, as they are provided, and the footer is eventually written
+    when the writer is closed. Thus, the whole scene never needs to be held
+    in memory.
+
+    Only the first RaytracingContent marker is instantiated.
+
+    For compatibility with former template instantiation (re.sub), escape
+    sequences and group references in strings are processed as in a
+    replacement string.
     """
-    renderobjs = "\n".join(objstrings)
 
-    if "RaytracingCamera" in template:
-        template = re.sub("(.*RaytracingCamera.*)", defaultcam, template)
-        content = renderobjs
-    else:
-        content = defaultcam + "\n" + renderobjs
+    def __init__(self, template, defaultcam, fpath):
+        """Initialize writer and write template header.
 
-    try:
-        template = re.sub("(.*RaytracingContent.*)", content, template)
-    except re.error as err:
-        if lineno := err.lineno:
-            split_content = content.splitlines()
-            begin = max(0, lineno - 5)
-            end = min(len(split_content), lineno + 4)
-            App.Console.PrintError(
-                "[Render][Project] Merge error - Offending content:\n"
-            )
-            pad = math.ceil(math.log10(end)) if end > 0 else 1
-            pad = max(pad, 3)
+        Args:
+            template -- the template to instantiate (str)
+            defaultcam -- the default camera string (str)
+            fpath -- the path of the file to write (str)
+        """
+        self.fpath = fpath
+        self._first = True
+
+        if "RaytracingCamera" in template:
+            template = re.sub("(.*RaytracingCamera.*)", defaultcam, template)
+            camera = None
+        else:
+            camera = defaultcam
+
+        if match := re.search("(.*RaytracingContent.*)", template):
+            header = template[: match.start()]
+            self._footer = template[match.end() :]
+        else:
+            header, self._footer = template, ""
+        self._match = match
+
+        # pylint: disable=consider-using-with
+        self._file = open(fpath, "w", encoding="utf8")
+        self._file.write(header)
+        if camera is not None and match:
+            self._file.write(self._expand(camera) + "\n")
+
+    def write(self, objstring):
+        """Write an object string into content."""
+        if not self._match:
+            return
+        if not self._first:
+            self._file.write("\n")
+        self._file.write(self._expand(objstring))
+        self._first = False
+
+    def close(self):
+        """Write template footer and close file."""
+        if self._file.closed:
+            return
+        self._file.write(self._footer)
+        self._file.close()
 
-            for index in range(begin, end):
-                line = split_content[index]
-                tick = ">>" if index == lineno - 1 else "  "
-                App.Console.PrintError(f"{tick} {index+1:0{pad}}   {line}\n")
-        raise
+    def __enter__(self):
+        return self
 
-    version_major = sys.version_info.major
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
 
-    return template.encode("utf8") if version_major < 3 else template
+    def _expand(self, content):
+        """Expand content as a replacement string of content marker."""
+        try:
+            return self._match.expand(content)
+        except re.error as err:
+            if lineno := err.lineno:
+                split_content = content.splitlines()
+                begin = max(0, lineno - 5)
+                end = min(len(split_content), lineno + 4)
+                App.Console.PrintError(
+                    "[Render][Project] Merge error - Offending content:\n"
+                )
+                pad = math.ceil(math.log10(end)) if end > 0 else 1
+                pad = max(pad, 3)
+                for index in range(begin, end):
+                    line = split_content[index]
+                    tick = ">>" if index == lineno - 1 else "  "
+                    App.Console.PrintError(
+                        f"{tick} {index+1:0{pad}}   {line}\n"
+                    )
+            raise
 
 
 class RenderingError(Exception):
@@ -848,45 +1077,43 @@ def user_select_template(renderer):
     return os.path.relpath(template_path, TEMPLATEDIR)
 
 
-def _get_objstrings_helper(renderer, views):
+def _get_objstrings_helper(renderer, views, sink=None):
     """Get strings from renderer (helper).
 
     This helper is convenient for debugging purpose (easier to reload).
+    See '_get_objstrings_worker' for 'sink'.
     """
+    renderer.deduplicate(views)
     get_rdr_string = renderer.get_rendering_string
     exporter_worker = ExporterWorker(
-        _get_objstrings_worker, (get_rdr_string, views)
+        _get_objstrings_worker,
+        (get_rdr_string, views, renderer.linear_deflection, True, sink),
     )
     rdr_executor = RendererExecutor(exporter_worker)
     rdr_executor.start()
     rdr_executor.join()
     objstrings = exporter_worker.result()
 
+    # Batched renderables are written once all objects have been processed
+    # (see staticbatch module)
+    for objstring in renderer.write_batches():
+        (sink or objstrings.append)(objstring)
+
     renderer.clean()
 
     return objstrings
 
 
-def grouper(iterable, number):
-    "Collect data into fixed-length chunks or blocks"
-    # grouper('ABCDEFG', 3, 'x') --> ABC DEF G"
-    args = [iter(iterable)] * number
-    return it.zip_longest(*args, fillvalue=None)
-
-
-def partition(pred, iterable):
-    "Use a predicate to partition entries into false entries and true entries"
-    # partition(is_odd, range(10)) --> 0 2 4 6 8   and  1 3 5 7 9
-    tee1, tee2 = it.tee(iterable)
-    return it.filterfalse(pred, tee1), filter(pred, tee2)
+def _get_objstrings_worker(
+    get_rdr_string, views, linear_deflection, multithreaded=True, sink=None
+):
+    """Get strings from renderer (worker).
 
-
-MIN_CHUNK_SIZE = 100
-MAX_CHUNK_SIZE = 1000
-
-
-def _get_objstrings_worker(get_rdr_string, views, multithreaded=True):
-    """Get strings from renderer (worker)."""
+    If 'sink' is provided, strings are passed to it (in views order) as soon
+    as they are available, instead of being returned.
+    """
+    objstrings = []
+    sink = sink or objstrings.append
     try:
         if App.GuiUp:
             QApplication.setOverrideCursor(Qt.WaitCursor)
@@ -898,43 +1125,64 @@ def _get_objstrings_worker(get_rdr_string, views, multithreaded=True):
 
         max_workers = min(32, os.cpu_count() + 4)
 
-        # Objects will be processed in chunks
-        # Heavy objects will be "packed individually" (1 chunk per object)
-        # For light objects, we'll compute a chunk size
-        heavy, light = partition(
-            lambda x: not hasattr(x.Source, "Terrain"), views
+        # Views are scheduled by decreasing cost (LPT), so that heavy objects
+        # are not started last. Costs are estimated, or learnt from previous
+        # exports of the same document (see exportcost module)
+        timings = (
+            exportcost.ExportTimings(views[0].Source.Document)
+            if views
+            else None
         )
+        scheduled = exportcost.schedule(views, linear_deflection, timings)
+        costs = dict(scheduled)
 
-        heavy = list(heavy)
-        light = list(light)
-
-        chunk_size = len(light) // (max_workers * 2)
-        chunk_size = max(chunk_size, MIN_CHUNK_SIZE)
-        chunk_size = min(chunk_size, MAX_CHUNK_SIZE)
-        chunk_size = 1
-
-        chunks = list(it.chain(grouper(heavy, 1), grouper(light, chunk_size)))
-
-        msg = (
-            f"[Render][Objstrings] {len(chunks)} chunks: "
-            f"{len(heavy)} heavy - {len(chunks) - len(heavy)} light "
-            f"(size: {chunk_size})\n"
-        )
+        msg = f"[Render][Objstrings] {len(views)} objects, largest first\n"
         App.Console.PrintMessage(msg)
 
-        def worker(chunk):
-            return [get_rdr_string(v) for v in chunk if v is not None]
+        durations = []
+
+        def worker(index):
+            tm0 = time.time()
+            objstring = get_rdr_string(views[index])
+            return objstring, time.time() - tm0
 
         # Process views
+        # Results are passed to sink in views order, as soon as they are
+        # available, so that output is deterministic and can be streamed.
+        # If export engine is enabled, threads delegate meshing to worker
+        # processes (see exportengine module)
         if multithreaded:
-            with concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
-                submits = (pool.submit(worker, chunk) for chunk in chunks)
-                futures = concurrent.futures.as_completed(submits)
-                objstrings = list(
-                    it.chain.from_iterable(f.result() for f in futures)
-                )
+            session = exportengine.session()
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+            with session as engine, executor as pool:
+                if engine:
+                    msg = (
+                        "[Render][Objstrings] Process-based export "
+                        f"(up to {engine.processes} workers)\n"
+                    )
+                    App.Console.PrintMessage(msg)
+                futures = {i: pool.submit(worker, i) for i, _ in scheduled}
+                for index in range(len(views)):
+                    objstring, duration = futures.pop(index).result()
+                    sink(objstring)
+                    durations.append(duration)
         else:
-            objstrings = list(map(get_rdr_string, views))
+            for index in range(len(views)):
+                objstring, duration = worker(index)
+                sink(objstring)
+                durations.append(duration)
+
+        # Log and record timings
+        for index, duration in enumerate(durations):
+            name = exportcost.view_name(views[index])
+            msg = (
+                f"Estimated cost: {costs[index]:.3g} - "
+                f"Duration: {duration:.3f}s"
+            )
+            debug("Objstrings", name, msg)
+            timings.record(name, duration)
+        if timings:
+            timings.save()
 
         App.Console.PrintMessage(
             "[Render][Objstrings] ENDING OBJECTS EXPORT - TIME: "
@@ -43,6 +43,7 @@ input colors in linear colorspace. A conversion is made.
 
 import functools
 import enum
+import math
 from importlib import import_module
 from types import SimpleNamespace
 import time
@@ -56,6 +57,11 @@ from Render.utils import translate, debug, message, warn, getproxyattr, RGB
 from Render.constants import PARAMS
 from Render import renderables
 from Render import rendermaterial
+from Render import meshcache
+from Render import exportengine
+from Render import shapededup
+from Render import adaptivedeflection
+from Render import staticbatch
 
 
 # ===========================================================================
@@ -118,6 +124,12 @@ class RendererHandler:
             object_directory -- the directory where the objects are to be
                 exported
             skip_meshing -- a flag to skip the meshing step
+            adaptive_deflection -- a calculator of per-object linear
+                deflection (AdaptiveDeflection, optional). If provided,
+                linear_deflection is ignored for objects.
+            static_batching -- the facet count below which renderables are
+                batched (int, 0 to disable, see staticbatch module). Batched
+                renderables are to be written by 'write_batches'.
         """
         self.renderer_name = str(rdrname)
         self.linear_deflection = float(kwargs.get("linear_deflection", 0.1))
@@ -128,6 +140,34 @@ class RendererHandler:
         self.project_directory = kwargs.get("project_directory")
         self.object_directory = kwargs.get("object_directory")
         self.skip_meshing = bool(kwargs.get("skip_meshing", False))
+        self.adaptive_deflection = kwargs.get("adaptive_deflection")
+
+        # Export-scoped memo for renderables of repeated linked objects
+        self.renderables_memo = renderables.RenderablesMemo()
+
+        # Reuse of viewport tessellation (optional)
+        self.reuse_viewport = App.GuiUp and PARAMS.GetBool(
+            "ReuseViewportTessellation", False
+        )
+
+        # Face count from which shapes are meshed by several workers
+        # (0 to disable, see exportengine module)
+        self.split_meshing_faces = PARAMS.GetInt("SplitMeshingFaces", 0)
+
+        # Export-scoped registry for static batching (optional)
+        static_batching = int(kwargs.get("static_batching", 0))
+        self.static_batch = (
+            staticbatch.StaticBatch(static_batching)
+            if static_batching > 0
+            else None
+        )
+
+        # Export-scoped registry for identical shapes (optional)
+        self.shape_dedup = (
+            shapededup.ShapeDedup()
+            if PARAMS.GetBool("EnableShapeDedup", False)
+            else None
+        )
 
         try:
             module_name = f"Render.renderers.{rdrname}"
@@ -246,9 +286,49 @@ class RendererHandler:
 
         return res
 
-    @staticmethod
-    def clean():
+    def deduplicate(self, views):
+        """Group views with identical shapes, before export.
+
+        This is a no-op if shape deduplication is disabled (see shapededup
+        module).
+        """
+        if self.shape_dedup is not None:
+            self.shape_dedup.group_views(views)
+
+    def write_batches(self):
+        """Write renderables collected for static batching.
+
+        This is a no-op if static batching is disabled (see staticbatch
+        module).
+
+        Returns:
+            A list of rendering strings (one per batch)
+        """
+        if self.static_batch is None:
+            return []
+        get_mat = rendermaterial.get_rendering_material
+        res = []
+        for renderable, kwargs in self.static_batch.pop_groups("StaticBatch"):
+            material = get_mat(
+                renderable.name,
+                renderable.material,
+                self.renderer_name,
+                renderable.defcolor,
+            )
+            objstring = self._call_renderer(
+                "write_mesh",
+                renderable.name,
+                renderable.mesh,
+                material,
+                **kwargs,
+            )
+            res.append(objstring)
+        return res
+
+    def clean(self):
         """Clean workspace after getting strings."""
+        if self.shape_dedup is not None:
+            self.shape_dedup.report()
         renderables.clean_a2p()
 
     @staticmethod
@@ -381,7 +461,7 @@ class RendererHandler:
             SimpleNamespace(Source=camsource, InListRecursive=[project]),
         )
 
-    def _render_object(self, name, view):
+    def _render_object(self, name, view, cache_lookup=True, use_engine=True):
         """Get a rendering string for a generic FreeCAD object.
 
         This method follows EAFP idiom and will raise exceptions if something
@@ -390,6 +470,10 @@ class RendererHandler:
         Parameters:
         name -- the name of the object
         view -- a view of the object to render
+        cache_lookup -- a flag to allow reusing meshes from mesh cache without
+          meshing
+        use_engine -- a flag to allow delegating meshing to export engine
+          (see exportengine module)
 
         Returns: a rendering string, obtained from the renderer module
         """
@@ -400,14 +484,32 @@ class RendererHandler:
         except AttributeError:
             autosmooth_angle = 0
 
+        # Deduplicated object: written along with its group leader
+        if self.shape_dedup and (leader := self.shape_dedup.leader(view)):
+            debug("Object", name, f"Deduplicated (written with '{leader}')")
+            return ""
+
+        # Linear deflection
+        linear_deflection = self._get_linear_deflection(name, view)
+
+        # Decimation (level of detail)
+        decimation = (
+            max(int(getattr(view, "LOD", 0)), 0),
+            max(float(getattr(view, "LODError", 0.0)), 0.0),
+        )
+
+        # Viewport tessellation
+        reuse_viewport = self._can_reuse_viewport(view, linear_deflection)
+
         # Mesher
-        def mesher(
+        def mesh_shape(
             shape,
             compute_uvmap=True,
             uvmap_projection=None,
             is_already_a_mesh=False,
             name=None,
             label=None,
+            reuse_tessellation=True,
         ):
             """Mesh a shape.
 
@@ -417,6 +519,8 @@ class RendererHandler:
                     object and RenderMesh)
                 is_already_a_mesh  -- Flag to indicate the shape is actually
                     already a mesh, so no meshing should be applied
+                reuse_tessellation -- Flag to allow reuse of the shape
+                    viewport tessellation, if compatible
 
             Returns a RenderMesh.
             """
@@ -441,42 +545,154 @@ class RendererHandler:
                 )
                 return rendermesh
 
+            reuse_tessellation = (
+                reuse_viewport and reuse_tessellation and not is_already_a_mesh
+            )
+
+            # Mesh cache?
+            cache_key = None
+            if cache := meshcache.get_meshcache():
+                digest = (
+                    meshcache.mesh_digest(shape.Mesh)
+                    if is_already_a_mesh
+                    else meshcache.shape_digest(shape)
+                )
+                cache_key = meshcache.make_key(
+                    digest,
+                    linear_deflection,
+                    self.angular_deflection,
+                    autosmooth,
+                    autosmooth_angle,
+                    compute_uvmap,
+                    uvmap_projection,
+                    decimation,
+                    reuse_tessellation,
+                    PARAMS.GetBool("CompactMeshStorage", False),
+                )
+                if cache_lookup and (metadata := cache.probe(cache_key)):
+                    # Mesh files are in cache: we just need placement,
+                    # and an empty mesh
+                    debug("Object", fullname, "Reuse mesh from cache")
+                    mesh = Mesh.Mesh()
+                    mesh.Placement = shape.Placement
+                    rendermesh = Render.rendermesh.create_rendermesh(
+                        mesh,
+                        project_directory=self.project_directory,
+                        export_directory=self.object_directory,
+                        relative_path=True,
+                        skip_meshing=True,
+                        name=fullname,
+                        cache_key=cache_key,
+                        cache_metadata=metadata,
+                    )
+                    return rendermesh
+
             # Log
             debug("Object", fullname, "Begin meshing")
             tm0 = time.time()
 
+            # Export engine (process-based export), if enabled
+            engine = exportengine.get_engine() if use_engine else None
+            rendermesh_kwargs = {
+                "autosmooth": autosmooth,
+                "split_angle": autosmooth_angle,
+                "compute_uvmap": compute_uvmap,
+                "uvmap_projection": uvmap_projection,
+                "project_directory": self.project_directory,
+                "export_directory": self.object_directory,
+                "relative_path": True,
+                "name": fullname,
+                "cache_key": cache_key,
+                "decimation": decimation if any(decimation) else None,
+            }
+            inline_below = (
+                self.static_batch.max_facets if self.static_batch else 0
+            )
+            mesh = rendermesh = None
+
             # Standard case
             if is_already_a_mesh:
                 mesh = shape.Mesh.copy()
+            elif (
+                reuse_tessellation
+                and (mesh := _mesh_from_tessellation(shape, linear_deflection))
+                is not None
+            ):
+                # Viewport tessellation is compatible: no meshing
+                debug("Object", fullname, "Reuse viewport tessellation")
             else:
                 # Generate mesh
                 # Nota: the shape placement is stored in the mesh placement...
                 shape = shape.copy()
                 shape_plc = shape.Placement
                 shape.Placement = App.Base.Placement()
-                mesh = MeshPart.meshFromShape(
-                    Shape=shape,
-                    LinearDeflection=self.linear_deflection,
-                    AngularDeflection=self.angular_deflection,
-                    Relative=False,
+                split = (
+                    engine is not None
+                    and 0 < self.split_meshing_faces <= len(shape.Faces)
                 )
-                mesh.Placement = shape_plc
+                try:
+                    if split:
+                        # Huge shape: mesh in several workers
+                        mesh = engine.mesh_faces(
+                            shape,
+                            linear_deflection,
+                            self.angular_deflection,
+                            self.object_directory,
+                        )
+                        msg = f"Split meshing ({len(shape.Faces)} faces)"
+                        debug("Object", fullname, msg)
+                    elif engine:
+                        # Mesh, post-process and write in a worker
+                        rendermesh = engine.render_shape(
+                            shape,
+                            linear_deflection,
+                            self.angular_deflection,
+                            self.object_directory,
+                            inline_below,
+                            **rendermesh_kwargs,
+                        )
+                        rendermesh.transformation.apply_placement(shape_plc)
+                except exportengine.ExportEngineError as err:
+                    msg = f"Export engine unavailable ({err})"
+                    debug("Object", fullname, msg)
+                    engine = None
+                except exportengine.ExportWorkerError as err:
+                    if not split:
+                        raise
+                    msg = f"Split meshing failed ({err})"
+                    debug("Object", fullname, msg)
+                if mesh is None and rendermesh is None:
+                    mesh = MeshPart.meshFromShape(
+                        Shape=shape,
+                        LinearDeflection=linear_deflection,
+                        AngularDeflection=self.angular_deflection,
+                        Relative=False,
+                    )
+                if mesh is not None:
+                    mesh.Placement = shape_plc
             if debug_flag:
                 tm1 = time.time() - tm0
                 print(f"End generating mesh ({tm1})")
 
-            mesh = Render.rendermesh.create_rendermesh(
-                mesh,
-                autosmooth,
-                autosmooth_angle,
-                compute_uvmap,
-                uvmap_projection,
-                project_directory=self.project_directory,
-                export_directory=self.object_directory,
-                relative_path=True,
-                skip_meshing=skip_meshing,
-                name=fullname,
-            )
+            # Post-process and write in a worker (mesh was not generated
+            # there)
+            if rendermesh is None and engine:
+                try:
+                    rendermesh = engine.render_mesh(
+                        mesh,
+                        self.object_directory,
+                        inline_below,
+                        **rendermesh_kwargs,
+                    )
+                except exportengine.ExportEngineError as err:
+                    msg = f"Export engine unavailable ({err})"
+                    debug("Object", fullname, msg)
+
+            if rendermesh is None:
+                rendermesh = Render.rendermesh.create_rendermesh(
+                    mesh, skip_meshing=skip_meshing, **rendermesh_kwargs
+                )
+            mesh = rendermesh
 
             duration = time.time() - tm0
             msg = f"End meshing ({duration}s)"
@@ -484,6 +700,48 @@ class RendererHandler:
             if debug_flag:
                 print(msg + "\n")
 
+            return mesh
+            # End mesh_shape
+
+        def mesher(
+            shape,
+            compute_uvmap=True,
+            uvmap_projection=None,
+            is_already_a_mesh=False,
+            name=None,
+            label=None,
+        ):
+            """Mesh a shape, reusing meshes of identical shapes if enabled.
+
+            See 'mesh_shape' for arguments.
+            """
+            args = (compute_uvmap, uvmap_projection, is_already_a_mesh)
+            dedup = self.shape_dedup
+            if dedup is None or is_already_a_mesh:
+                return mesh_shape(shape, *args, name, label)
+
+            key = (
+                shapededup.shape_fingerprint(shape),
+                linear_deflection,
+                decimation,
+                compute_uvmap,
+                uvmap_projection,
+                autosmooth,
+                autosmooth_angle,
+                force_meshing,
+                cache_lookup,
+                use_engine,
+            )
+
+            def compute():
+                # Shared mesh is computed at null placement
+                shape_at_origin = shape.copy()
+                shape_at_origin.Placement = App.Base.Placement()
+                # (the copy has no tessellation to reuse)
+                return mesh_shape(shape_at_origin, *args, name, label, False)
+
+            mesh = dedup.get_mesh(key, compute).copy()
+            mesh.transformation.apply_placement(shape.Placement)
             return mesh
             # End mesher
 
@@ -508,12 +766,34 @@ class RendererHandler:
             mesher,
             transparency_boost=tpboost,
             uvprojection=uvproj,
+            memo=self.renderables_memo,
+            memo_context=(
+                linear_deflection,
+                decimation,
+                reuse_viewport,
+                autosmooth,
+                autosmooth_angle,
+                force_meshing,
+                cache_lookup,
+                use_engine,
+            ),
         )
-        rends = renderables.check_renderables(rends)
 
-        # Rescale to meters
-        for rend in rends:
-            rend.mesh.convert_distances(SCALE, self.skip_meshing)
+        # Deduplicated objects of the group, if view is a leader: their
+        # renderables share meshes with the leader's ones, and thus will be
+        # written as instances
+        if self.shape_dedup:
+            for follower in self.shape_dedup.followers(view):
+                rends += renderables.get_renderables(
+                    follower.Source,
+                    str(follower.Source.FullName),
+                    material,
+                    mesher,
+                    transparency_boost=tpboost,
+                    uvprojection=uvproj,
+                )
+
+        rends = renderables.check_renderables(rends)
 
         # Call renderer on renderables, concatenate and return
         write_mesh = functools.partial(
@@ -523,11 +803,45 @@ class RendererHandler:
             **kwargs,
         )
 
+        write_instances = functools.partial(
+            RendererHandler._call_renderer,
+            self,
+            "write_instances",
+            **kwargs,
+        )
+
         get_mat = rendermaterial.get_rendering_material
         rdrname = self.renderer_name
 
+        # Group renderables sharing geometry and material, to be written as
+        # instances (if renderer supports it)
+        instancing = PARAMS.GetBool("EnableInstancing", True) and hasattr(
+            self.renderer_module, "write_instances"
+        )
+        if instancing:
+            groups = _group_instances(rends)
+        else:
+            groups = [[r] for r in rends]
+
+        # Rescale to meters
+        # (instances just need their transformation to be rescaled, as their
+        # geometry is written from the first renderable of the group)
+        for group in groups:
+            for index, rend in enumerate(group):
+                skip_points = rend.mesh.skip_meshing or index > 0
+                rend.mesh.convert_distances(SCALE, skip_points)
+
         res = []
-        for renderable in rends:
+        for group in groups:
+            renderable = group[0]
+            if (
+                len(group) == 1
+                and self.static_batch
+                and self.static_batch.add(renderable, kwargs)
+            ):
+                # Renderable will be written in a batch (see write_batches)
+                debug("Object", renderable.name, "Batched")
+                continue
             material = get_mat(
                 renderable.name,
                 renderable.material,
@@ -535,22 +849,98 @@ class RendererHandler:
                 renderable.defcolor,
             )
             try:
-                objstring = write_mesh(
-                    renderable.name,
-                    renderable.mesh,
-                    material,
-                )
+                if len(group) > 1:
+                    debug("Object", label, f"{len(group)} instances")
+                    objstring = write_instances(
+                        renderable.name,
+                        renderable.mesh,
+                        material,
+                        [(r.name, r.mesh.transformation) for r in group],
+                    )
+                else:
+                    objstring = write_mesh(
+                        renderable.name,
+                        renderable.mesh,
+                        material,
+                    )
             except Render.rendermesh.SkipMeshingError as err:
                 msg = (
                     f"[Render][Objstring] '{label}': File not found "
                     f"while attempting to reuse meshing ('{err.filename}').\n"
                 )
                 App.Console.PrintWarning(msg)
+            except meshcache.MeshCacheMissError:
+                # Cache has been partially evicted, or mesh is requested with
+                # new write parameters: we have to mesh again
+                debug("Object", label, "Mesh cache miss - Remeshing")
+                return self._render_object(
+                    name, view, cache_lookup=False, use_engine=use_engine
+                )
+            except exportengine.ExportEngineError as err:
+                # Worker holding the mesh is gone: we have to mesh again,
+                # in thread
+                msg = f"Export engine unavailable ({err}) - Remeshing"
+                debug("Object", label, msg)
+                return self._render_object(
+                    name, view, cache_lookup=cache_lookup, use_engine=False
+                )
             else:
                 res.append(objstring)
 
         return "".join(res)
 
+    def _get_linear_deflection(self, name, view):
+        """Get the linear deflection to mesh an object.
+
+        In adaptive mode, the deflection is computed from the camera and the
+        object bounding box (see adaptivedeflection module). Otherwise, or if
+        the object has no bounding box, this is the project deflection.
+        If the object leads a group of deduplicated objects, the finest
+        deflection of the group is taken.
+        """
+        if (adaptive := self.adaptive_deflection) is None:
+            return self.linear_deflection
+        views = [view]
+        if self.shape_dedup:
+            views += self.shape_dedup.followers(view)
+        bboxes = [adaptivedeflection.get_bound_box(v.Source) for v in views]
+        if any(b is None for b in bboxes):
+            return self.linear_deflection
+        deflection = min(adaptive.get_deflection(b) for b in bboxes)
+        message("Object", name, f"Adaptive deflection: {deflection:.4g}")
+        return deflection
+
+    def _can_reuse_viewport(self, view, linear_deflection):
+        """Check whether the viewport tessellation of an object can be reused.
+
+        The viewport tessellation is compatible if it is at least as fine as
+        the requested one (linear and angular deflections). The viewport
+        linear deflection is computed from the object bounding box and
+        'Deviation', as FreeCAD does. Hidden objects are not tessellated in
+        the viewport, and thus are not compatible.
+        This is a heuristic: actual triangulation is checked at meshing time
+        (see '_mesh_from_tessellation').
+        """
+        if not self.reuse_viewport:
+            return False
+        source = view.Source
+        try:
+            vobj = source.ViewObject
+            visible = bool(vobj.Visibility)
+            deviation = float(vobj.Deviation)
+            angular_deflection = math.radians(float(vobj.AngularDeflection))
+            bbox = source.Shape.BoundBox
+        except (AttributeError, TypeError, ValueError):
+            return False
+        if not visible or not bbox.isValid():
+            return False
+        sizes = bbox.XLength + bbox.YLength + bbox.ZLength
+        viewport_deflection = sizes / 300.0 * deviation
+        return (
+            viewport_deflection <= linear_deflection
+            and angular_deflection <= self.angular_deflection
+        )
+
     def _render_camera(self, name, view):
         """Provide a rendering string for a camera.
 
@@ -807,6 +1197,81 @@ class RendererHandler:
         return renderer_method(*args, **kwargs)
 
 
+def _group_instances(renderables):
+    """Group renderables sharing geometry, material and color.
+
+    Renderables of a same group are copies of a same mesh (arrays, links...)
+    and can be written as instances of this mesh. Groups are given in order
+    of first appearance.
+
+    Returns:
+        A list of lists of renderables
+    """
+    groups = {}
+    for renderable in renderables:
+        color = renderable.defcolor
+        key = (
+            renderable.mesh.geometry_id,
+            id(renderable.material),
+            tuple(color.to_srgb()) if color is not None else None,
+        )
+        groups.setdefault(key, []).append(renderable)
+    return list(groups.values())
+
+
+def _mesh_from_tessellation(shape, deflection):
+    """Build a mesh from the existing tessellation of a shape.
+
+    Shape.tessellate reuses the triangulation stored in the shape faces if it
+    is at least as fine as 'deflection' (which is the case for viewport
+    tessellation, see '_can_reuse_viewport'), instead of meshing again.
+    The mesh is given at null placement, the shape placement being stored in
+    the mesh placement (as for MeshPart meshing).
+
+    Tessellation is computed on a copy of the shape, which keeps the
+    triangulation: if the stored triangulation is not fine enough after all,
+    the copy is re-meshed, but never the document shape (which may be
+    displayed meanwhile). If a face has no triangulation, the shape is not
+    considered as tessellated.
+
+    Returns:
+        A Mesh.Mesh, or None if the shape has no tessellation
+    """
+    try:
+        shape = shape.copy(True, True)  # Copy geometry and triangulation
+    except (TypeError, RuntimeError):
+        # No triangulation copy (old FreeCAD versions)
+        return None
+    if not all(_has_triangulation(face) for face in shape.Faces):
+        return None
+    try:
+        points, facets = shape.tessellate(deflection)
+    except (AttributeError, RuntimeError, ValueError):
+        return None
+    if not facets:
+        return None
+    placement = App.Base.Placement(shape.Placement)
+    mesh = Mesh.Mesh((points, facets))
+    mesh.transform(placement.inverse().toMatrix())
+    mesh.Placement = placement
+    return mesh
+
+
+def _has_triangulation(face):
+    """Check whether a face holds a triangulation.
+
+    If it cannot be checked (old FreeCAD versions), the face is considered
+    as holding one.
+    """
+    try:
+        triangulation = face.getTriangulation()
+    except AttributeError:
+        return True
+    except (RuntimeError, ValueError):
+        return False
+    return bool(triangulation and triangulation[1])
+
+
 # ===========================================================================
 #                          Renderer Handler Exceptions
 # ===========================================================================
@@ -37,12 +37,15 @@ Renderables
 
 import itertools
 import collections
+import concurrent.futures
 import math
 import os.path
 import shutil
+import threading
 
 
 import FreeCAD as App
+import Part
 
 # Assembly3
 try:
@@ -117,6 +120,10 @@ def get_renderables(obj, name, upper_material, mesher, **kwargs):
             transparency in shape color
         uvprojection -- a string giving the type of uv projection (cubic,
             spherical...). See View object and rdrhandler for valid values.
+        memo -- an export-scoped memo for renderables of linked objects
+            (RenderablesMemo, optional)
+        memo_context -- the mesher settings which the renderables depend on
+            (hashable, optional). Part of memo keys.
 
     Returns:
         A list of renderables
@@ -265,6 +272,60 @@ class RenderableError(Exception):
         self.msg = msg
 
 
+class RenderablesMemo:
+    """An export-scoped memo of renderables of linked objects.
+
+    A linked object (link, link array element...) may be referenced many
+    times in a scene. The memo allows to compute its renderables (and thus
+    to mesh it) only once: each occurrence just adds its own placement on
+    top of the shared meshes.
+
+    This class is thread-safe: if several threads request the same key,
+    only one computes the renderables, the others wait for the result.
+    """
+
+    def __init__(self):
+        """Initialize memo."""
+        self.hits = 0
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, name, compute):
+        """Get renderables for a key, computing them if necessary.
+
+        Renderables computed for another name are renamed, so that naming
+        is the same as without memo.
+
+        Args:
+            key -- the memo key (hashable)
+            name -- the name of the renderables to get (str)
+            compute -- a callable computing the renderables for 'name'
+
+        Returns:
+            A list of renderables
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._futures[key] = future
+            else:
+                self.hits += 1
+
+        if owner:
+            try:
+                future.set_result((name, compute()))
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+        else:
+            debug("Object", name, "Reuse renderables (memo)")
+
+        base_name, renderables = future.result()
+        return [_rename(r, base_name, name) for r in renderables]
+
+
 def check_renderables(renderables):
     """Assert compliance of a list of renderables.
 
@@ -495,7 +556,7 @@ def _get_rends_from_elementlist(obj, name, material, mesher, **kwargs):
         elem_name = f"{name}_{element.Name}"
 
         # Compute rends and placements
-        base_rends = get_renderables(
+        base_rends = _get_linked_renderables(
             elem_object, elem_name, material, mesher, **kwargs
         )
         linkedobject_plc_inverse = elem_object.Placement.inverse()
@@ -529,7 +590,9 @@ def _get_rends_from_plainapplink(obj, name, material, mesher, **kwargs):
     A list of renderables for the object
     """
     linkedobj = obj.LinkedObject
-    base_rends = get_renderables(linkedobj, name, material, mesher, **kwargs)
+    base_rends = _get_linked_renderables(
+        linkedobj, name, material, mesher, **kwargs
+    )
     link_plc = obj.LinkPlacement
     linkedobj_plc_inverse = linkedobj.Placement.inverse()
 
@@ -919,23 +982,33 @@ def _get_rends_from_partfeature(obj, name, material, mesher, **kwargs):
             )
         ]
     else:
-        # Multicolor: Process face by face
-        faces = obj.Shape.Faces
-        nfaces = len(faces)
-        names = [f"{name}_face{i}" for i in range(nfaces)]
-        labels = [f"{obj.Label}_face{i}" for i in range(nfaces)]
+        # Multicolor: Process faces grouped by color, so that there is one
+        # mesh per color (and not per face)
+        shape = obj.Shape
+        faces = shape.Faces
+        groups = {}
+        for face, color in zip(faces, colors):
+            groups.setdefault(tuple(color), []).append(face)
+        if len(groups) == 1 and len(faces) == len(colors):
+            # Actually monocolor...
+            shapes = [shape]
+        else:
+            shapes = [Part.makeCompound(f) for f in groups.values()]
+        ncolors = len(groups)
+        names = [f"{name}_color{i}" for i in range(ncolors)]
+        labels = [f"{obj.Label}_color{i}" for i in range(ncolors)]
         meshes = [
             mesher(
-                shape=f,
+                shape=s,
                 compute_uvmap=_needs_uvmap(material),
                 uvmap_projection=uvprojection,
                 name=n,
                 label=l,
             )
-            for f, n, l in zip(faces, names, labels)
+            for s, n, l in zip(shapes, names, labels)
         ]
-        materials = [material] * nfaces
-        colors = map(RGB.from_fcd_rgba, colors)
+        materials = [material] * ncolors
+        colors = map(RGB.from_fcd_rgba, groups.keys())
         renderables = [
             Renderable(*i) for i in zip(names, meshes, materials, colors)
         ]
@@ -975,6 +1048,35 @@ def _get_rends_from_meshfeature(obj, name, material, mesher, **kwargs):
 # ===========================================================================
 
 
+def _get_linked_renderables(obj, name, material, mesher, **kwargs):
+    """Get renderables of a linked object, from memo if possible.
+
+    See get_renderables for parameters.
+    """
+    if (memo := kwargs.get("memo")) is None:
+        return get_renderables(obj, name, material, mesher, **kwargs)
+
+    key = (
+        obj.FullName,
+        getattr(material, "FullName", id(material)) if material else None,
+        kwargs.get("uvprojection"),
+        kwargs.get("memo_context"),
+    )
+
+    def compute():
+        return get_renderables(obj, name, material, mesher, **kwargs)
+
+    return memo.get(key, name, compute)
+
+
+def _rename(renderable, old_prefix, new_prefix):
+    """Rename a renderable, replacing a prefix in its name."""
+    if old_prefix == new_prefix or not renderable.name.startswith(old_prefix):
+        return renderable
+    new_name = new_prefix + renderable.name[len(old_prefix) :]
+    return renderable._replace(name=new_name)
+
+
 def _get_material(base_renderable, upper_material):
     """Get material from a base renderable and an upper material."""
     upper_mat_is_multimat = is_multimat(upper_material)
@@ -70,7 +70,59 @@ PLACEMENT = App.Placement(
 
 def write_mesh(name, mesh, material, **kwargs):
     """Compute a string in renderer SDL to represent a FreeCAD mesh."""
+    mat_name, snippet_mat, objfile = _write_mesh_data(
+        name, mesh, material, **kwargs
+    )
+
+    # Format output
+    shortfilename, _ = os.path.splitext(os.path.basename(objfile))
+    snippet_obj = _write_object(shortfilename, objfile)
+    snippet_inst = _write_object_instance(
+        f"{shortfilename}.instance",
+        f"{shortfilename}.{name}",
+        mesh.transformation,
+        mat_name,
+    )
+
+    snippet = snippet_mat + snippet_obj + snippet_inst
+
+    return snippet
+
+
+def write_instances(name, mesh, material, instances, **kwargs):
+    """Compute a string in renderer SDL to represent instances of a mesh.
+
+    The mesh is written once, as an object, and each instance is an object
+    instance with its own transformation.
+    """
+    mat_name, snippet_mat, objfile = _write_mesh_data(
+        name, mesh, material, **kwargs
+    )
+
+    # Format output
+    shortfilename, _ = os.path.splitext(os.path.basename(objfile))
+    snippet_obj = _write_object(shortfilename, objfile)
+    snippet_inst = "".join(
+        _write_object_instance(
+            f"{shortfilename}.{instance_name}.instance",
+            f"{shortfilename}.{name}",
+            transfo,
+            mat_name,
+        )
+        for instance_name, transfo in instances
+    )
 
+    snippet = snippet_mat + snippet_obj + snippet_inst
+
+    return snippet
+
+
+def _write_mesh_data(name, mesh, material, **kwargs):
+    """Compute material and mesh file of a mesh.
+
+    Returns:
+        material name, material snippet, mesh file name
+    """
     # Compute material values
     matval = material.get_material_values(
         name,
@@ -80,33 +132,46 @@ def write_mesh(name, mesh, material, **kwargs):
         kwargs["project_directory"],
     )
 
-    # Get OBJ file
-    objfile = mesh.write_file(name, mesh.ExportType.OBJ)
+    # Get mesh file (OBJ or native binarymesh)
+    filetype = (
+        mesh.ExportType.BINARYMESH
+        if PARAMS.GetBool("AppleseedBinaryMesh", False)
+        else mesh.ExportType.OBJ
+    )
+    objfile = mesh.write_file(name, filetype)
+
+    mat_name = matval.unique_matname  # Avoid duplicate materials
+    snippet_mat = _write_material(mat_name, matval)
+
+    return mat_name, snippet_mat, objfile
+
+
+def _write_object(shortfilename, objfile):
+    """Compute an object statement, for a mesh file (OBJ or binarymesh)."""
+    filename = objfile.encode("unicode_escape").decode("utf-8")
+    return f"""
+            <object name="{shortfilename}" model="mesh_object">
+                <parameter name="filename" value="{filename}" />
+            </object>"""
+
 
+def _write_object_instance(name, obj, transformation, mat_name):
+    """Compute an object instance statement."""
     # Compute OBJ transformation
     # including transfo from FCD coordinates to Appleseed ones
-    mesh.transformation.apply_placement(PLACEMENT, left=True)
+    transformation.apply_placement(PLACEMENT, left=True)
     transfo_rows = [
         (
             "<dummy>"
             f"{r[0]:+15.8f} {r[1]:+15.8f} {r[2]:+15.8f} {r[3]:+15.8f}"
             "</dummy>"
         )
-        for r in mesh.transformation.get_matrix_rows()
+        for r in transformation.get_matrix_rows()
     ]
 
-    # Format output
-    mat_name = matval.unique_matname  # Avoid duplicate materials
-    shortfilename, _ = os.path.splitext(os.path.basename(objfile))
-    filename = objfile.encode("unicode_escape").decode("utf-8")
-
-    snippet_mat = _write_material(mat_name, matval)
-    snippet_obj = f"""
-            <object name="{shortfilename}" model="mesh_object">
-                <parameter name="filename" value="{filename}" />
-            </object>
-            <object_instance name="{shortfilename}.instance"
-                             object="{shortfilename}.{name}" >
+    return f"""
+            <object_instance name="{name}"
+                             object="{obj}" >
                 <transform>
                     <matrix>
                         {transfo_rows[0]}
@@ -127,10 +192,6 @@ def write_mesh(name, mesh, material, **kwargs):
                 />
             </object_instance>"""
 
-    snippet = snippet_mat + snippet_obj
-
-    return snippet
-
 
 def write_camera(name, pos, updir, target, fov, resolution, **kwargs):
     """Compute a string in renderer SDL to represent a camera."""
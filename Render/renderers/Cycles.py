@@ -89,6 +89,17 @@ DISNEY_IOR = 1.5  # As defined in 's2012_pbs_disney_brdf_notes_v3.pdf'
 
 def write_mesh(name, mesh, material, **kwargs):
     """Compute a string in renderer SDL to represent a FreeCAD mesh."""
+    return write_instances(
+        name, mesh, material, [(name, mesh.transformation)], **kwargs
+    )
+
+
+def write_instances(name, mesh, material, instances, **kwargs):
+    """Compute a string in renderer SDL to represent instances of a mesh.
+
+    The mesh file is written once, and included under each instance
+    transformation.
+    """
     # Get specific parameters
     cast_caustics = kwargs.get("ObjectCastCaustics", False)
     receive_caustics = kwargs.get("ObjectReceiveCaustics", False)
@@ -107,13 +118,6 @@ def write_mesh(name, mesh, material, **kwargs):
     # Get mesh file
     cyclesfile = mesh.write_file(name, mesh.ExportType.CYCLES)
 
-    # Compute transformation
-    trans = [
-        " ".join(str(v) for v in col)
-        for col in mesh.transformation.get_matrix_columns()
-    ]
-    trans = "  ".join(trans)
-
     interpolation = "smooth" if mesh.has_vnormals() else "flat"
 
     # Caustics
@@ -129,10 +133,10 @@ def write_mesh(name, mesh, material, **kwargs):
         snippet_state = f"""
 <state interpolation="{interpolation}" shader="{name}">"""
 
-    snippet_obj = f"""
-    <transform matrix="{trans}">
-        <include src="{cyclesfile}" />
-    </transform>
+    snippet_obj = "".join(
+        _write_include(cyclesfile, transfo) for _, transfo in instances
+    )
+    snippet_obj += """
 </state>
 """
 
@@ -141,6 +145,20 @@ def write_mesh(name, mesh, material, **kwargs):
     return snippet
 
 
+def _write_include(cyclesfile, transformation):
+    """Compute an include statement of a mesh file, with transformation."""
+    trans = [
+        " ".join(str(v) for v in col)
+        for col in transformation.get_matrix_columns()
+    ]
+    trans = "  ".join(trans)
+
+    return f"""
+    <transform matrix="{trans}">
+        <include src="{cyclesfile}" />
+    </transform>"""
+
+
 def write_camera(name, pos, updir, target, fov, resolution, **kwargs):
     """Compute a string in renderer SDL to represent a camera."""
 
@@ -56,6 +56,17 @@ ENGINES = [
 
 def write_mesh(name, mesh, material, **kwargs):
     """Compute a string in renderer SDL to represent a FreeCAD mesh."""
+    return write_instances(
+        name, mesh, material, [(name, mesh.transformation)], **kwargs
+    )
+
+
+def write_instances(name, mesh, material, instances, **kwargs):
+    """Compute a string in renderer SDL to represent instances of a mesh.
+
+    The mesh shape is written once, and shared by one object per instance,
+    with its own transformation.
+    """
     # Material values
     matval = material.get_material_values(
         name,
@@ -112,19 +123,12 @@ scene.shapes.{name}_disp.map.channels = 0 2 1
     # Get PLY file
     plyfile = mesh.write_file(name, mesh.ExportType.PLY)
 
-    # Transformation matrix
-    trans = (
-        " ".join(str(v) for v in col)
-        for col in mesh.transformation.get_matrix_columns()
+    # Objects & Mesh
+    snippet_obj = "".join(
+        _write_object(instance_name, obj_shape, name, transfo)
+        for instance_name, transfo in instances
     )
-    trans = "  ".join(trans)
-
-    # Object & Mesh
-    snippet_obj = f"""
-# Object '{name}'
-scene.objects.{name}.shape = {obj_shape}
-scene.objects.{name}.material = {name}
-scene.objects.{name}.transformation = {trans}
+    snippet_obj += f"""\
 scene.shapes.{name}_mesh.type = mesh
 scene.shapes.{name}_mesh.ply = "{plyfile}"
 """
@@ -142,6 +146,23 @@ scene.shapes.{name}_mesh.ply = "{plyfile}"
     return snippet
 
 
+def _write_object(name, shape, material, transformation):
+    """Compute an object statement, for a shape and a transformation."""
+    # Transformation matrix
+    trans = (
+        " ".join(str(v) for v in col)
+        for col in transformation.get_matrix_columns()
+    )
+    trans = "  ".join(trans)
+
+    return f"""
+# Object '{name}'
+scene.objects.{name}.shape = {shape}
+scene.objects.{name}.material = {material}
+scene.objects.{name}.transformation = {trans}
+"""
+
+
 def write_camera(name, pos, updir, target, fov, resolution, **kwargs):
     """Compute a string in renderer SDL to represent a camera."""
     # The Luxcore fov is in the largest image dimension, so for the typical
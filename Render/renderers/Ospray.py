@@ -41,6 +41,7 @@
 #                             z
 #
 
+import copy
 import json
 import os
 import os.path
@@ -55,6 +56,8 @@ PLACEMENT = App.Placement(
 
 TEMPLATE_FILTER = "Ospray templates (ospray_*.sg)"
 
+PARAMS = App.ParamGet("User parameter:BaseApp/Preferences/Mod/Render")
+
 DISNEY_IOR = 1.5
 
 # ===========================================================================
@@ -64,6 +67,41 @@ DISNEY_IOR = 1.5
 
 def write_mesh(name, mesh, material, **kwargs):
     """Compute a string in renderer SDL to represent a FreeCAD mesh."""
+    objfile = _write_mesh_file(name, mesh, material, **kwargs)
+
+    # Node name
+    # Very important: keep it as is, as it is hard-coded in ospray...
+    basename = _file_basename(objfile)
+    nodename = f"{basename}_importer"
+
+    return _write_importer(objfile, nodename, mesh.transformation)
+
+
+def write_instances(name, mesh, material, instances, **kwargs):
+    """Compute a string in renderer SDL to represent instances of a mesh.
+
+    The mesh file is written once, and one importer per instance refers to
+    it, with the instance transformation. Importers get their own node
+    names, derived from the mesh file name.
+    """
+    objfile = _write_mesh_file(name, mesh, material, **kwargs)
+    basename = _file_basename(objfile)
+    snippets = (
+        _write_importer(objfile, f"{basename}_{index}_importer", transfo)
+        for index, (_, transfo) in enumerate(instances)
+    )
+    return "".join(snippets)
+
+
+def _write_mesh_file(name, mesh, material, **kwargs):
+    """Write a mesh file, with material.
+
+    The mesh is written as a GLB file (if material can be mapped to glTF)
+    or as an OBJ file.
+
+    Returns:
+        The mesh file path, as returned by RenderMesh.write_file
+    """
     # Material values
     matval = material.get_material_values(
         name,
@@ -74,29 +112,55 @@ def write_mesh(name, mesh, material, **kwargs):
         kwargs["object_directory"],
     )
 
-    # Write the mesh as an OBJ tempfile
-    objfile = mesh.write_file(
+    # Write the mesh as a GLB tempfile (if material can be mapped to glTF)
+    # or as an OBJ tempfile
+    gltfmaterial = (
+        _write_gltf_material(name, matval)
+        if PARAMS.GetBool("OsprayGlb", False)
+        else None
+    )
+    if gltfmaterial is not None:
+        return mesh.write_file(
+            name,
+            mesh.ExportType.GLB,
+            gltfmaterial=gltfmaterial,
+        )
+    return mesh.write_file(
         name,
         mesh.ExportType.OBJ,
         mtlcontent=_write_material(name, matval),
     )
 
-    # Compute OBJ transformation
-    # including transfo from FCD coordinates to ospray ones
-    osp_placement = PLACEMENT.copy()
-    mesh.transformation.apply_placement(osp_placement, left=True)
 
-    # Node and transform names
-    # Very important: keep them as is, as they are hard-coded in ospray...
+def _file_basename(objfile):
+    """Get the base name of a mesh file, without extension."""
     basename = os.path.basename(objfile)
     basename = basename.encode("unicode_escape").decode("utf-8")
-    nodename, _ = os.path.splitext(basename)
-    nodename = f"{nodename}_importer"
-    transform_name, _ = os.path.splitext(basename)
-    transform_name = f"{transform_name}_rootXfm"
+    basename, _ = os.path.splitext(basename)
+    return basename
+
+
+def _write_importer(objfile, nodename, transformation):
+    """Compute an importer node for a mesh file, with transformation.
+
+    Args:
+        objfile -- the mesh file path (str)
+        nodename -- the importer node name (str)
+        transformation -- the mesh transformation (_Transformation). It is
+            left unchanged.
+    """
+    # Compute OBJ transformation
+    # including transfo from FCD coordinates to ospray ones
+    transfo = copy.copy(transformation)
+    transfo.apply_placement(PLACEMENT.copy(), left=True)
+
+    # Transform name
+    # Very important: keep it as is, as it is hard-coded in ospray importers
+    # (transform is looked up among the importer node children, so it does
+    # not clash between importers of a same file)
+    transform_name = f"{_file_basename(objfile)}_rootXfm"
 
     # Compute transformation components
-    transfo = mesh.transformation
     translation = ", ".join(str(v) for v in transfo.get_translation())
     rotation = ", ".join(
         f'"{k}": {v}' for k, v in zip("ijkr", transfo.get_rotation_qtn())
@@ -762,6 +826,43 @@ transparency 0.0
     return snippet
 
 
+def _write_gltf_material(name, matval):
+    """Compute a glTF material (for GLB export), from material values.
+
+    Only untextured materials that can be mapped to glTF metallic-roughness
+    model are handled (Diffuse, Disney, Substance_PBR). For other materials,
+    None is returned and the caller should fall back to OBJ/MTL.
+    """
+    if matval.has_textures():
+        return None
+
+    props = matval.material.shaderproperties
+
+    def color(key):
+        lcol = props[key].to_linear()
+        return [float(lcol[0]), float(lcol[1]), float(lcol[2]), 1.0]
+
+    try:
+        if matval.shadertype == "Diffuse":
+            pbr = {
+                "baseColorFactor": color("color"),
+                "metallicFactor": 0.0,
+                "roughnessFactor": 1.0,
+            }
+        elif matval.shadertype in ("Disney", "Substance_PBR"):
+            pbr = {
+                "baseColorFactor": color("basecolor"),
+                "metallicFactor": float(props["metallic"]),
+                "roughnessFactor": float(props["roughness"]),
+            }
+        else:
+            return None
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return None
+
+    return {"name": name, "pbrMetallicRoughness": pbr, "doubleSided": True}
+
+
 MATERIALS = {
     "Passthrough": _write_material_passthrough,
     "Glass": _write_material_glass,
@@ -59,6 +59,57 @@ TEMPLATE_FILTER = "Pbrt templates (pbrt_*.pbrt)"
 
 def write_mesh(name, mesh, material, **kwargs):
     """Compute a string in renderer SDL to represent a FreeCAD mesh."""
+    matval, material, plyfile = _write_mesh_data(
+        name, mesh, material, **kwargs
+    )
+    transform = _write_transformation(mesh.transformation)
+
+    snippet = f"""\
+# Object '{name}'
+AttributeBegin
+
+{transform}
+
+{matval.write_textures()}
+{material}
+  Shape "plymesh"
+    "string filename" [ "{_pbrt_escape_string(plyfile)}" ]
+AttributeEnd
+# ~Object '{name}'
+"""
+    return snippet
+
+
+def write_instances(name, mesh, material, instances, **kwargs):
+    """Compute a string in renderer SDL to represent instances of a mesh.
+
+    The mesh is written once, as an object (ObjectBegin), and each instance
+    is an ObjectInstance with its own transformation.
+    """
+    matval, material, plyfile = _write_mesh_data(
+        name, mesh, material, **kwargs
+    )
+
+    snippet_instances = "".join(
+        _write_instance(name, instance_name, transfo)
+        for instance_name, transfo in instances
+    )
+
+    snippet = f"""\
+# Object '{name}' ({len(instances)} instances)
+{matval.write_textures()}
+ObjectBegin "{_pbrt_escape_string(name)}"
+{material}
+  Shape "plymesh"
+    "string filename" [ "{_pbrt_escape_string(plyfile)}" ]
+ObjectEnd
+{snippet_instances}# ~Object '{name}'
+"""
+    return snippet
+
+
+def _write_mesh_data(name, mesh, material, **kwargs):
+    """Compute material values, material statement and mesh file."""
     matval = material.get_material_values(
         name,
         _write_texture,
@@ -91,31 +142,32 @@ def write_mesh(name, mesh, material, **kwargs):
         uv_scale=scale,
     )
 
-    # Transformation
+    return matval, material, plyfile
+
+
+def _write_instance(name, instance_name, transfo):
+    """Compute an instance statement of an object."""
+    return f"""\
+AttributeBegin  # Instance '{instance_name}'
+{_write_transformation(transfo)}
+  ObjectInstance "{_pbrt_escape_string(name)}"
+AttributeEnd
+"""
+
+
+def _write_transformation(transfo):
+    """Compute transformation statements for a mesh transformation."""
     # (see https://www.povray.org/documentation/3.7.0/r3_3.html#r3_3_1_12_4)
-    transfo = mesh.transformation
     yaw, pitch, roll = transfo.get_rotation_ypr()
     scale = transfo.scale
     posx, posy, posz = transfo.get_translation()
 
-    snippet = f"""\
-# Object '{name}'
-AttributeBegin
-
+    return f"""\
   Translate {posx:+15.8f} {posy:+15.8f} {posz:+15.8f}
   Rotate    {yaw:+15.8f}  0 0 1
   Rotate    {pitch:+15.8f}  0 1 0
   Rotate    {roll:+15.8f}  1 0 0
-  Scale     {scale:+15.8f} {scale:+15.8f} {scale:+15.8f}
-
-{matval.write_textures()}
-{material}
-  Shape "plymesh"
-    "string filename" [ "{_pbrt_escape_string(plyfile)}" ]
-AttributeEnd
-# ~Object '{name}'
-"""
-    return snippet
+  Scale     {scale:+15.8f} {scale:+15.8f} {scale:+15.8f}"""
 
 
 def write_camera(name, pos, updir, target, fov, resolution, **kwargs):
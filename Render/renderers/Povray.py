@@ -63,6 +63,51 @@ mimetypes.init()
 
 def write_mesh(name, mesh, material, **kwargs):
     """Compute a string in renderer SDL to represent a FreeCAD mesh."""
+    name, material, textures, povfile = _write_mesh_data(
+        name, mesh, material, **kwargs
+    )
+
+    snippet = f"""
+#include "{povfile}"
+{textures}// Instance to render {name}
+object {{
+    {name}
+    {material}
+{_write_transformation(mesh.transformation)}
+}}  // {name}
+"""
+    return snippet
+
+
+def write_instances(name, mesh, material, instances, **kwargs):
+    """Compute a string in renderer SDL to represent instances of a mesh.
+
+    The mesh is declared once (with its material), and each instance is an
+    object referencing the declaration, with its own transformation.
+    """
+    name, material, textures, povfile = _write_mesh_data(
+        name, mesh, material, **kwargs
+    )
+
+    snippet_instances = "".join(
+        _write_instance(f"{name}instanced", instance_name, transfo)
+        for instance_name, transfo in instances
+    )
+
+    snippet = f"""
+#include "{povfile}"
+{textures}// Instances to render {name}
+#declare {name}instanced = object {{
+    {name}
+    {material}
+}}
+{snippet_instances}// ~{name}
+"""
+    return snippet
+
+
+def _write_mesh_data(name, mesh, material, **kwargs):
+    """Compute name, material, textures and mesh file of a mesh."""
     # POV-Ray has a lot of reserved keywords, so we suffix name with a '_' to
     # avoid any collision and we replace '#' with '_'
     name = name + "_"
@@ -87,28 +132,17 @@ def write_mesh(name, mesh, material, **kwargs):
     # Get mesh file
     povfile = mesh.write_file(name, mesh.ExportType.POVRAY)
 
-    # Transformation
-    # (see https://www.povray.org/documentation/3.7.0/r3_3.html#r3_3_1_12_4)
-    transfo = mesh.transformation
-    yaw, pitch, roll = transfo.get_rotation_ypr()
-    scale = transfo.scale
-    posx, posy, posz = transfo.get_translation()
+    return name, material, textures, povfile
 
-    snippet = f"""
-#include "{povfile}"
-{textures}// Instance to render {name}
-object {{
-    {name}
-    {material}
-    matrix <1,0,0, 0,0,1, 0,1,0, 0,0,0>
-    rotate <{-roll}, 0, 0>
-    rotate <0, 0, {-pitch}>
-    rotate <0, {-yaw}, 0>
-    scale {scale}
-    translate <{posx}, {posz}, {posy}>
-}}  // {name}
+
+def _write_instance(declaration, instance_name, transfo):
+    """Compute an object statement, instancing a declaration."""
+    return f"""\
+object {{  // {instance_name}
+    {declaration}
+{_write_transformation(transfo)}
+}}
 """
-    return snippet
 
 
 def write_camera(name, pos, updir, target, fov, resolution, **kwargs):
@@ -835,6 +869,22 @@ def _write_texref(**kwargs):
     return f"""{statement} {{ {texname} }}"""
 
 
+def _write_transformation(transfo):
+    """Compute transformation statements for a mesh transformation."""
+    # (see https://www.povray.org/documentation/3.7.0/r3_3.html#r3_3_1_12_4)
+    yaw, pitch, roll = transfo.get_rotation_ypr()
+    scale = transfo.scale
+    posx, posy, posz = transfo.get_translation()
+
+    return f"""\
+    matrix <1,0,0, 0,0,1, 0,1,0, 0,0,0>
+    rotate <{-roll}, 0, 0>
+    rotate <0, 0, {-pitch}>
+    rotate <0, {-yaw}, 0>
+    scale {scale}
+    translate <{posx}, {posz}, {posy}>"""
+
+
 def _safe_filepath(filepath):
     """Replaces antislashes by double antislashes where required.
 
@@ -31,15 +31,19 @@ rendering purpose.
 
 import enum
 import os
+import sys
 import tempfile
 import itertools as it
 import functools
 import time
 import collections
-from math import pi, atan2, asin, isclose, radians, cos, hypot
+from math import pi, atan2, asin, isclose, radians, cos, hypot, sqrt, inf
+from math import fsum
 import copy
 import cmath
 import uuid
+import array
+import struct
 from typing import NamedTuple
 
 import FreeCAD as App
@@ -48,12 +52,14 @@ import Mesh
 from Render.rendermesh_mixins import (
     RenderMeshMultiprocessingMixin,
     RenderMeshNumpyMixin,
+    RenderMeshRemoteMixin,
     multiprocessing_enabled,
     numpy_enabled,
 )
 from Render.constants import PARAMS, MAX_FILENAME_LEN
-from Render.rendermesh_mp import vector3d
+from Render.rendermesh_mp import vector3d, binarymesh, glb
 from Render.utils import debug
+from Render import meshcache
 
 
 RenderMeshDirs = collections.namedtuple(
@@ -61,6 +67,11 @@ RenderMeshDirs = collections.namedtuple(
     ("project_directory", "export_directory", "relative_path"),
 )
 
+# Decimation: maximum number of clustering passes to reach target facet
+# count, and tolerance on target
+_DECIMATION_PASSES = 4
+_DECIMATION_TOLERANCE = 1.1
+
 
 # ===========================================================================
 #                             RenderMesh factory
@@ -78,6 +89,10 @@ def create_rendermesh(
     relative_path=True,
     skip_meshing=False,
     name="",
+    cache_key=None,
+    cache_metadata=None,
+    decimation=None,
+    multiprocessing=True,
 ):
     """Create a RenderMesh object, adapted to context.
 
@@ -88,9 +103,20 @@ def create_rendermesh(
     - plain (no numpy, no multiprocessing)
 
     Capabilities are added as mixins.
+
+    If 'cache_key' is provided, written files are stored in (and fetched
+    from) the mesh cache. If 'cache_metadata' is provided too, the mesh is
+    considered as already computed in cache: meshing is skipped (like
+    'skip_meshing') and files are exclusively fetched from cache.
+
+    If 'decimation' is provided, as a (target facet count, maximum error)
+    tuple, the mesh is decimated (see RenderMeshBase.decimate).
+
+    If 'multiprocessing' is False, the multiprocessing capability is never
+    added (for instance in processes which are already workers).
     """
     # Construct class
-    if multiprocessing_enabled(mesh):
+    if multiprocessing and multiprocessing_enabled(mesh):
         base = (RenderMeshMultiprocessingMixin, RenderMeshBase)
     elif numpy_enabled():
         base = (RenderMeshNumpyMixin, RenderMeshBase)
@@ -115,11 +141,135 @@ def create_rendermesh(
         uvmap_projection,
         skip_meshing,
         dirs,
+        decimation,
     )
+    instance.cache_key = cache_key
+    instance.cache_metadata = cache_metadata
 
     return instance
 
 
+def create_remote_rendermesh(
+    remote,
+    placement,
+    name="",
+    project_directory=None,
+    export_directory=None,
+    relative_path=True,
+    cache_key=None,
+):
+    """Create a RenderMesh object whose geometry is held by an export worker.
+
+    See RenderMeshRemoteMixin and exportengine module.
+
+    Args:
+        remote -- the handle to the geometry in worker (exportengine.Remote)
+        placement -- the mesh placement (App.Placement)
+        See 'create_rendermesh' for other arguments.
+    """
+    RenderMesh = type(
+        "RenderMesh", (RenderMeshRemoteMixin, RenderMeshBase), {}
+    )
+    instance = _create_empty_rendermesh(
+        RenderMesh,
+        placement,
+        name,
+        project_directory,
+        export_directory,
+        relative_path,
+        cache_key,
+    )
+    instance.remote = remote
+    return instance
+
+
+def load_rendermesh(
+    filename,
+    placement,
+    name="",
+    project_directory=None,
+    export_directory=None,
+    relative_path=True,
+    cache_key=None,
+):
+    """Create a RenderMesh object from internals saved in a file.
+
+    Internals are expected to have been saved by an export worker, with
+    RenderMeshNumpyMixin.save_internals. Numpy must be enabled.
+
+    Args:
+        filename -- the file containing the internals (str)
+        placement -- the mesh placement (App.Placement)
+        See 'create_rendermesh' for other arguments.
+    """
+    RenderMesh = type("RenderMesh", (RenderMeshNumpyMixin, RenderMeshBase), {})
+    instance = _create_empty_rendermesh(
+        RenderMesh,
+        placement,
+        name,
+        project_directory,
+        export_directory,
+        relative_path,
+        cache_key,
+    )
+    instance.load_internals(filename)
+    return instance
+
+
+def _create_empty_rendermesh(
+    cls,
+    placement,
+    name,
+    project_directory,
+    export_directory,
+    relative_path,
+    cache_key,
+):
+    """Instantiate a RenderMesh class, with no geometry.
+
+    The instance is initialized like a skipped mesh (see 'skip_meshing'),
+    geometry being provided afterwards by the caller.
+    """
+    mesh = Mesh.Mesh()
+    mesh.Placement = placement
+    dirs = RenderMeshDirs(
+        _check_directory(project_directory),
+        _check_directory(export_directory),
+        bool(relative_path),
+    )
+    instance = cls(mesh, name, False, radians(30), False, None, True, dirs)
+    instance.skip_meshing = False
+    instance.cache_key = cache_key
+    return instance
+
+
+def merge_rendermeshes(meshes, name=""):
+    """Merge RenderMesh objects into a single one (static batching).
+
+    Mesh transformations are baked into the merged geometry, which gets an
+    identity transformation. Uv maps and vertex normals are kept.
+    Meshes must be numpy RenderMeshes (see RenderMeshNumpyMixin), with
+    consistent uv maps and vertex normals (either all or none).
+
+    Args:
+        meshes -- the meshes to merge (list of RenderMesh)
+        name -- the name of the merged mesh (str)
+
+    Returns:
+        The merged mesh (RenderMesh)
+    """
+    merged = meshes[0].copy()
+    merged.name = name
+    merged.geometry_id = uuid.uuid4().hex
+    merged.cache_key = None
+    merged.cache_metadata = None
+    # pylint: disable=protected-access
+    merged._originalmesh = Mesh.Mesh()  # Do not share source's one
+    merged.reset_transformation()
+    merged.merge_internals(meshes)
+    return merged
+
+
 # ===========================================================================
 #                               RenderMeshBase
 # ===========================================================================
@@ -145,6 +295,7 @@ class RenderMeshBase:
         uvmap_projection,
         skip_meshing,
         dirs,
+        decimation=None,
     ):
         """Initialize RenderMesh.
 
@@ -160,15 +311,24 @@ class RenderMeshBase:
             project_directory -- directory where the rendering project lays
             relative_path -- flag to control whether returned path is relative
                 or absolute to project_directory
+            decimation -- target facet count and maximum error for
+                decimation (2-uple, optional)
         """
         # Directories
         self.dirs = dirs
 
+        # Mesh cache (see create_rendermesh)
+        self.cache_key = None
+        self.cache_metadata = None
+
         # We initialize self transformation
         self.__transformation = _Transformation(mesh.Placement)
 
         self.name = name
 
+        # Geometry identifier, shared by copies (for instancing)
+        self.geometry_id = uuid.uuid4().hex
+
         # Skip meshing?
         self.skip_meshing = bool(skip_meshing)
         if self.skip_meshing:
@@ -199,6 +359,10 @@ class RenderMeshBase:
         if not self.count_facets:
             return
 
+        # Decimation (before uv map and autosmooth)
+        if decimation:
+            self.decimate(*decimation, split_angle)
+
         # Uvmap
         if compute_uvmap:
             msg = f"Uv map '{uvmap_projection}'"
@@ -255,6 +419,10 @@ class RenderMeshBase:
         new_mesh.__transformation = copy.copy(self.transformation)
         return new_mesh
 
+    def reset_transformation(self):
+        """Reset transformation to identity (geometry is left unchanged)."""
+        self.__transformation = _Transformation()
+
     ##########################################################################
     #                               Rescaling                                #
     ##########################################################################
@@ -374,10 +542,14 @@ class RenderMeshBase:
 
     def has_uvmap(self):
         """Check if object has a uv map."""
+        if self.cache_metadata is not None:
+            return self.cache_metadata.get("uvmap", False)
         return bool(self._uvmap)
 
     def has_vnormals(self):
         """Check if object has a vertex normals."""
+        if self.cache_metadata is not None:
+            return self.cache_metadata.get("vnormals", False)
         return bool(self._vnormals)
 
     ##########################################################################
@@ -391,6 +563,8 @@ class RenderMeshBase:
         PLY = enum.auto()
         CYCLES = enum.auto()
         POVRAY = enum.auto()
+        BINARYMESH = enum.auto()
+        GLB = enum.auto()
 
     def write_file(
         self,
@@ -419,6 +593,10 @@ class RenderMeshBase:
             mtlname -- Material name to reference in OBJ, must be defined in
               MTL file (optional) (str)
             mtlcontent -- MTL file content (optional) (str)
+            binary -- Write PLY file in binary format (optional) (bool).
+              Default to 'BinaryPly' preference.
+            gltfmaterial -- glTF material to embed in GLB file (optional)
+              (dict)
 
         Returns:
             The name of file that the function wrote.
@@ -428,6 +606,10 @@ class RenderMeshBase:
 
         # Normalize arguments
         filetype = RenderMeshBase.ExportType(filetype)
+        if filetype == RenderMeshBase.ExportType.PLY:
+            kwargs["binary"] = bool(
+                kwargs.get("binary", PARAMS.GetBool("BinaryPly", True))
+            )
 
         # Compute target file
         if filename is None:
@@ -457,6 +639,44 @@ class RenderMeshBase:
         # Escape characters
         res = res.encode("unicode_escape").decode("utf-8")
 
+        # Mesh cache?
+        if self.cache_key and (cache := meshcache.get_meshcache()):
+            # MTL file is rewritten on cache hit: its content is not part of
+            # the key (the OBJ file only references it by name)
+            key_kwargs = {
+                k: v for k, v in kwargs.items() if k not in _MTL_KWARGS
+            }
+            if kwargs.get("mtlcontent") is not None:
+                key_kwargs["mtlref"] = (
+                    os.path.basename(kwargs.get("mtlfile") or ""),
+                    kwargs.get("mtlname") or "material",
+                )
+            entry_key = meshcache.make_key(
+                self.cache_key,
+                filetype.name,
+                name,
+                os.path.basename(filename),
+                tuple(uv_translate),
+                uv_rotate,
+                uv_scale,
+                sorted(key_kwargs.items()),
+            )
+            if cache.fetch(entry_key, filename):
+                debug("Object", self.name, "Mesh file fetched from cache")
+                if filetype == RenderMeshBase.ExportType.OBJ:
+                    RenderMeshBase._write_objfile_mtl(
+                        filename,
+                        kwargs.get("mtlfile"),
+                        kwargs.get("mtlname"),
+                        kwargs.get("mtlcontent"),
+                    )
+                return res
+            if self.cache_metadata is not None:
+                # Mesh has not been computed: we cannot write the file
+                raise meshcache.MeshCacheMissError(filename)
+        else:
+            cache = None
+
         # Skip meshing?
         if self.skip_meshing:
             # Check whether file exists
@@ -464,7 +684,38 @@ class RenderMeshBase:
                 raise SkipMeshingError(filename)
             return res
 
-        # Switch to specialized write function
+        # Write
+        self._write_file_helper(
+            name, filetype, filename, uv_translate, uv_rotate, uv_scale, kwargs
+        )
+
+        # Store in cache
+        if cache:
+            metadata = {
+                "uvmap": self.has_uvmap(),
+                "vnormals": self.has_vnormals(),
+            }
+            cache.store(entry_key, filename, self.cache_key, metadata)
+
+        # Return
+        return res
+
+    def _write_file_helper(
+        self,
+        name,
+        filetype,
+        filename,
+        uv_translate,
+        uv_rotate,
+        uv_scale,
+        kwargs,
+    ):
+        """Write a mesh file (helper).
+
+        Switch to specialized write function. Arguments are the ones of
+        'write_file', normalized (target file is computed).
+        (can be overriden by mixins)
+        """
         if filetype == RenderMeshBase.ExportType.OBJ:
             mtlfile = kwargs.get("mtlfile")
             mtlname = kwargs.get("mtlname")
@@ -481,18 +732,33 @@ class RenderMeshBase:
             )
         elif filetype == RenderMeshBase.ExportType.PLY:
             self._write_plyfile(
-                name, filename, uv_translate, uv_rotate, uv_scale
+                name,
+                filename,
+                uv_translate,
+                uv_rotate,
+                uv_scale,
+                kwargs["binary"],
             )
         elif filetype == RenderMeshBase.ExportType.CYCLES:
             self._write_cyclesfile(name, filename)
         elif filetype == RenderMeshBase.ExportType.POVRAY:
             self._write_povfile(name, filename)
+        elif filetype == RenderMeshBase.ExportType.BINARYMESH:
+            self._write_binarymeshfile(
+                name, filename, uv_translate, uv_rotate, uv_scale
+            )
+        elif filetype == RenderMeshBase.ExportType.GLB:
+            self._write_glbfile(
+                name,
+                filename,
+                uv_translate,
+                uv_rotate,
+                uv_scale,
+                kwargs.get("gltfmaterial"),
+            )
         else:
             raise ValueError(f"Unknown mesh file type '{filetype}'")
 
-        # Return
-        return res
-
     def _write_objfile(
         self,
         name,
@@ -524,25 +790,9 @@ class RenderMeshBase:
         tm0 = time.time()
 
         # Mtl
-        if mtlcontent is not None:
-            # Material name
-            mtlname = mtlname if mtlname else "material"
-            # Target file
-            if mtlfile is None:
-                mtlfile, _ = os.path.splitext(objfile)
-                mtlfile += ".mtl"
-            # Write mtl file
-            mtlfilename = RenderMeshBase._write_mtl(
-                mtlname, mtlcontent, mtlfile
-            )
-            if os.path.dirname(mtlfilename) != os.path.dirname(objfile):
-                raise ValueError(
-                    "OBJ and MTL files shoud be in the same dir\n"
-                    f"('{objfile}' versus '{mtlfilename}')"
-                )
-            mtlfilename = os.path.basename(mtlfilename)
-        else:
-            mtlfilename, mtlname = None, None
+        mtlfilename, mtlname = RenderMeshBase._write_objfile_mtl(
+            objfile, mtlfile, mtlname, mtlcontent
+        )
 
         # Pack uv transformation
         uv_transformation = (uv_translate, uv_rotate, uv_scale)
@@ -559,6 +809,38 @@ class RenderMeshBase:
         tm1 = time.time() - tm0
         debug("Object", self.name, f"Write OBJ file: {tm1}")
 
+    @staticmethod
+    def _write_objfile_mtl(objfile, mtlfile, mtlname, mtlcontent):
+        """Write the MTL file companion of an OBJ file, if any.
+
+        Args:
+            objfile -- Name of the OBJ file (str)
+            mtlfile -- MTL file name (str). If None, MTL file name is derived
+              from OBJ file name.
+            mtlname -- Material name (str)
+            mtlcontent -- MTL file content (str). If None, nothing is written.
+
+        Returns: the MTL file base name and the material name (or None, None
+          if nothing was written)
+        """
+        if mtlcontent is None:
+            return None, None
+
+        # Material name
+        mtlname = mtlname if mtlname else "material"
+        # Target file
+        if mtlfile is None:
+            mtlfile, _ = os.path.splitext(objfile)
+            mtlfile += ".mtl"
+        # Write mtl file
+        mtlfilename = RenderMeshBase._write_mtl(mtlname, mtlcontent, mtlfile)
+        if os.path.dirname(mtlfilename) != os.path.dirname(objfile):
+            raise ValueError(
+                "OBJ and MTL files shoud be in the same dir\n"
+                f"('{objfile}' versus '{mtlfilename}')"
+            )
+        return os.path.basename(mtlfilename), mtlname
+
     def _write_objfile_helper(
         self,
         name,
@@ -664,6 +946,7 @@ class RenderMeshBase:
         uv_translate=(0.0, 0.0),
         uv_rotate=0.0,
         uv_scale=1.0,
+        binary=False,
     ):
         """Write an PLY file from a mesh.
 
@@ -675,13 +958,61 @@ class RenderMeshBase:
             uv_translate -- UV translation vector (2-uple)
             uv_rotate -- UV rotation angle in degrees (float)
             uv_scale -- UV scale factor (float)
+            binary -- Write in binary_little_endian format rather than in
+              ascii (bool)
 
         Returns: the name of file that the function wrote.
         """
+        tm0 = time.time()
+
+        if binary:
+            uv_transformation = (uv_translate, uv_rotate, uv_scale)
+            self._write_plyfile_binary(name, plyfile, uv_transformation)
+            tm1 = time.time() - tm0
+            debug("Object", self.name, f"Write binary PLY file: {tm1}")
+            return
+
+        # Header
+        header = self._write_plyfile_header(name, "ascii")
+
+        # Body - Vertices (and vertex normals and uv)
+        fmt3 = functools.partial(str.format, "{:#g} {:#g} {:#g}")
+        verts = [iter(fmt3(*v) for v in self.points)]
+        if self.has_vnormals():
+            verts += [iter(fmt3(*v) for v in self.vnormals)]
+        if self.has_uvmap():
+            # Translate, rotate, scale (optionally)
+            uvs = self.uvtransform(uv_translate, uv_rotate, uv_scale)
+            fmt2 = functools.partial(str.format, "{:#g} {:#g}")
+            verts += [iter(fmt2(v.real, v.imag) for v in uvs)]
+        verts += [it.repeat("\n")]
+        verts = (" ".join(v) for v in zip(*verts))
+
+        # Body - Faces
+        fmtf = functools.partial(str.format, "3 {} {} {}\n")
+        faces = (fmtf(*v) for v in iter(self.facets))
+
+        # Concat and write
+        res = it.chain(header, verts, faces)
+        with open(plyfile, "w", encoding="utf-8", newline="\n") as f:
+            f.writelines(res)
+
+        tm1 = time.time() - tm0
+        debug("Object", self.name, f"Write PLY file: {tm1}")
+
+    def _write_plyfile_header(self, name, fmt):
+        """Compute PLY file header.
+
+        Args:
+            name -- Name of the mesh (str)
+            fmt -- PLY format ("ascii", "binary_little_endian"...)
+
+        Returns: the header, as a list of lines
+        """
         # Header - Intro
         header = [
             "ply\n",
-            "format ascii 1.0\n",
+            f"format {fmt} 1.0\n",
             "comment Created by FreeCAD-Render\n",
             f"comment '{name}'\n",
         ]
@@ -712,27 +1043,201 @@ class RenderMeshBase:
             "end_header\n",
         ]
 
-        # Body - Vertices (and vertex normals and uv)
-        fmt3 = functools.partial(str.format, "{:#g} {:#g} {:#g}")
-        verts = [iter(fmt3(*v) for v in self.points)]
+        return header
+
+    def _write_plyfile_binary(self, name, plyfile, uv_transformation):
+        """Write a binary (little endian) PLY file from a mesh.
+
+        Single process version, based on 'array' and 'struct' modules.
+        (can be overriden by mixins)
+
+        Args:
+            name -- Name of the mesh (str)
+            plyfile -- Name of the PLY file (str)
+            uv_transformation -- UV transformation, as a (translate, rotate,
+              scale) tuple
+        """
+        # Header
+        header = self._write_plyfile_header(name, "binary_little_endian")
+
+        # Body - Vertices (and vertex normals and uv), as float32
+        verts = [self.points]
         if self.has_vnormals():
-            verts += [iter(fmt3(*v) for v in self.vnormals)]
+            verts.append(self.vnormals)
         if self.has_uvmap():
-            # Translate, rotate, scale (optionally)
-            uvs = self.uvtransform(uv_translate, uv_rotate, uv_scale)
-            fmt2 = functools.partial(str.format, "{:#g} {:#g}")
-            verts += [iter(fmt2(v.real, v.imag) for v in uvs)]
-        verts += [it.repeat("\n")]
-        verts = (" ".join(v) for v in zip(*verts))
+            uvs = self.uvtransform(*uv_transformation)
+            verts.append((t.real, t.imag) for t in uvs)
+        verts = it.chain.from_iterable(
+            it.chain.from_iterable(v) for v in zip(*verts)
+        )
+        verts = array.array("f", verts)
+        if sys.byteorder != "little":
+            verts.byteswap()
 
         # Body - Faces
-        fmtf = functools.partial(str.format, "3 {} {} {}\n")
-        faces = (fmtf(*v) for v in iter(self.facets))
+        fmtf = struct.Struct("<B3i")
+        faces = b"".join(fmtf.pack(3, *f) for f in self.facets)
 
-        # Concat and write
-        res = it.chain(header, verts, faces)
-        with open(plyfile, "w", encoding="utf-8", newline="\n") as f:
-            f.writelines(res)
+        # Write
+        with open(plyfile, "wb") as f:
+            f.write("".join(header).encode("utf-8"))
+            verts.tofile(f)
+            f.write(faces)
+
+    def _write_binarymeshfile(
+        self,
+        name,
+        binarymeshfile,
+        uv_translate=(0.0, 0.0),
+        uv_rotate=0.0,
+        uv_scale=1.0,
+    ):
+        """Write an appleseed binarymesh file from a mesh.
+
+        Args:
+            name -- Name of the mesh (str)
+            binarymeshfile -- Name of the binarymesh file (str)
+            uv_translate -- UV translation vector (2-uple)
+            uv_rotate -- UV rotation angle in degrees (float)
+            uv_scale -- UV scale factor (float)
+        """
+        tm0 = time.time()
+        uv_transformation = (uv_translate, uv_rotate, uv_scale)
+        self._write_binarymeshfile_helper(
+            name, binarymeshfile, uv_transformation
+        )
+        tm1 = time.time() - tm0
+        debug("Object", self.name, f"Write binarymesh file: {tm1}")
+
+    def _write_binarymeshfile_helper(
+        self, name, binarymeshfile, uv_transformation
+    ):
+        """Write an appleseed binarymesh file from a mesh.
+
+        Single process version, based on 'array' and 'struct' modules.
+        (can be overriden by mixins)
+
+        Args:
+            name -- Name of the mesh (str)
+            binarymeshfile -- Name of the binarymesh file (str)
+            uv_transformation -- UV transformation, as a (translate, rotate,
+              scale) tuple
+        """
+        has_vnormals, has_uvmap = self.has_vnormals(), self.has_uvmap()
+
+        def pack_values(count, values):
+            """Pack a section of values, as doubles."""
+            values = array.array("d", it.chain.from_iterable(values))
+            if sys.byteorder != "little":
+                values.byteswap()
+            return binarymesh.COUNT.pack(count) + values.tobytes()
+
+        # Vertices, vertex normals and texture coordinates
+        sections = [pack_values(self.count_points, self.points)]
+        if has_vnormals:
+            sections.append(pack_values(self.count_points, self.vnormals))
+        else:
+            sections.append(binarymesh.COUNT.pack(0))
+        if has_uvmap:
+            uvs = self.uvtransform(*uv_transformation)
+            uvs = ((t.real, t.imag) for t in uvs)
+            sections.append(pack_values(self.count_points, uvs))
+        else:
+            sections.append(binarymesh.COUNT.pack(0))
+
+        # Faces
+        no_index = (binarymesh.NO_INDEX,) * 3
+        pack_face = binarymesh.FACE.pack
+        faces = b"".join(
+            pack_face(
+                3,
+                *facet,
+                *(facet if has_vnormals else no_index),
+                *(facet if has_uvmap else no_index),
+                0,
+            )
+            for facet in self.facets
+        )
+
+        # Write
+        with open(binarymeshfile, "wb") as f:
+            f.write(binarymesh.header(name))
+            f.writelines(sections)
+            f.write(binarymesh.material_slots())
+            f.write(binarymesh.COUNT.pack(self.count_facets))
+            f.write(faces)
+
+    def _write_glbfile(
+        self,
+        name,
+        glbfile,
+        uv_translate=(0.0, 0.0),
+        uv_rotate=0.0,
+        uv_scale=1.0,
+        gltfmaterial=None,
+    ):
+        """Write a binary glTF (GLB) file from a mesh.
+
+        Args:
+            name -- Name of the mesh (str)
+            glbfile -- Name of the GLB file (str)
+            uv_translate -- UV translation vector (2-uple)
+            uv_rotate -- UV rotation angle in degrees (float)
+            uv_scale -- UV scale factor (float)
+            gltfmaterial -- glTF material to assign to the mesh (dict or
+              None)
+        """
+        tm0 = time.time()
+        uv_transformation = (uv_translate, uv_rotate, uv_scale)
+        sections, bounds = self._write_glbfile_sections(uv_transformation)
+        with open(glbfile, "wb") as f:
+            glb.write(f, name, sections, bounds, gltfmaterial)
+        tm1 = time.time() - tm0
+        debug("Object", self.name, f"Write GLB file: {tm1}")
+
+    def _write_glbfile_sections(self, uv_transformation):
+        """Compute the binary sections of a GLB file.
+
+        Single process version, based on 'array' module.
+        (can be overriden by mixins)
+
+        Args:
+            uv_transformation -- UV transformation, as a (translate, rotate,
+              scale) tuple
+
+        Returns:
+            A list of (semantic, count, data) tuples, and the bounds of the
+            points, as a (min, max) tuple (see glb.write)
+        """
+
+        def make_array(typecode, values):
+            """Make a little endian array from values."""
+            res = array.array(typecode, values)
+            if sys.byteorder != "little":
+                res.byteswap()
+            return res
+
+        count = self.count_points
+        points = array.array("f", it.chain.from_iterable(self.points))
+        bounds = (
+            tuple(min(points[i::3], default=0.0) for i in range(3)),
+            tuple(max(points[i::3], default=0.0) for i in range(3)),
+        )
+        if sys.byteorder != "little":
+            points.byteswap()
+        sections = [("POSITION", count, points)]
+        if self.has_vnormals():
+            vnormals = it.chain.from_iterable(self.vnormals)
+            sections.append(("NORMAL", count, make_array("f", vnormals)))
+        if self.has_uvmap():
+            # glTF uv origin is top left corner: flip v
+            uvs = self.uvtransform(*uv_transformation)
+            uvs = it.chain.from_iterable((t.real, 1.0 - t.imag) for t in uvs)
+            sections.append(("TEXCOORD_0", count, make_array("f", uvs)))
+        indices = it.chain.from_iterable(self.facets)
+        indices = make_array("I", indices)
+        sections.append(("indices", len(indices), indices))
+        return sections, bounds
 
     def _write_cyclesfile(
         self,
@@ -883,6 +1388,164 @@ class RenderMeshBase:
         with open(povfile, "w", encoding="utf-8") as f:
             f.write(snippet)
 
+    ##########################################################################
+    #                               Decimation                               #
+    ##########################################################################
+
+    def decimate(
+        self, target_facets=0, max_error=0.0, split_angle=radians(30)
+    ):
+        """Decimate mesh, by vertex clustering (level of detail).
+
+        Decimation is driven by a target facet count and/or a maximum
+        geometric error. If both are provided, the error bound prevails.
+        Vertices on sharp edges (according to 'split_angle') and on boundaries
+        are clustered apart from the others, so that sharp edges and
+        boundaries are kept.
+
+        Decimation is to be run before uv map and vertex normals computation,
+        so that it does not break uv seams.
+
+        Args:
+            target_facets -- the facet count to reach (int, 0 for no target)
+            max_error -- the maximum geometric error (float, 0 for no bound)
+            split_angle -- the angle that defines sharp edges (in radians)
+        """
+        count_facets = self.count_facets
+        target_facets = int(target_facets)
+        max_error = float(max_error)
+        if target_facets <= 0 and max_error <= 0.0:
+            return
+        if 0 < count_facets <= target_facets:
+            return
+
+        # Clustering error is bounded by cell diagonal
+        max_cell = max_error / sqrt(3) if max_error > 0.0 else inf
+        if target_facets > 0:
+            # A cell holds about 2 facets
+            cell = sqrt(2 * self._total_area() / target_facets)
+        else:
+            cell = max_cell
+
+        result = None
+        for _ in range(_DECIMATION_PASSES):
+            cell = min(cell, max_cell)
+            if not cell > 0.0:
+                break
+            candidate = self._decimation_pass(cell, split_angle)
+            if candidate is None:
+                break
+            result = candidate
+            count = len(candidate[1])
+            if (
+                target_facets <= 0
+                or count <= target_facets * _DECIMATION_TOLERANCE
+                or cell >= max_cell
+            ):
+                break
+            cell *= sqrt(count / target_facets)
+
+        if result is None or not 0 < len(result[1]) < count_facets:
+            return
+        self._points, self._facets, self._normals, self._areas = result
+        self._update_originalmesh()
+        msg = f"Decimation: {count_facets} -> {self.count_facets} facets"
+        debug("Object", self.name, msg)
+
+    def _update_originalmesh(self):
+        """Update original mesh after a change of internal geometry.
+
+        Single process computations (uv map etc.) rely on original mesh.
+        To be overridden by mixins if necessary.
+        """
+        points = [tuple(p) for p in self._points]
+        facets = [tuple(f) for f in self._facets]
+        self._originalmesh = Mesh.Mesh((points, facets))
+
+    def _total_area(self):
+        """Compute mesh total area."""
+        return fsum(self.areas)
+
+    def _decimation_pass(self, cell_size, split_angle):
+        """Run a vertex clustering pass (see 'decimate').
+
+        Plain version: clusters are replaced by their centroids (no quadric
+        error minimization).
+
+        Args:
+            cell_size -- the size of clustering grid cells
+            split_angle -- the angle that defines sharp edges (in radians)
+
+        Returns:
+            The new points, facets, normals and areas, in the internal format
+            of the mesh (or None if failed)
+        """
+        points = list(self.points)
+        facets = [tuple(f) for f in self.facets]
+        normals = list(self.normals)
+
+        # Feature points (on sharp edges and boundaries)
+        edges = collections.defaultdict(list)
+        for index, (i, j, k) in enumerate(facets):
+            for edge in ((i, j), (j, k), (k, i)):
+                edges[tuple(sorted(edge))].append(index)
+        split_cos = cos(split_angle)
+        feature = set()
+        for edge, adjacents in edges.items():
+            if (
+                len(adjacents) != 2
+                or vector3d.dot(normals[adjacents[0]], normals[adjacents[1]])
+                < split_cos
+            ):
+                feature.update(edge)
+
+        # Clusters
+        origin = [min(c) for c in zip(*points)]
+        keys = {}
+        clusters = [
+            keys.setdefault(
+                (
+                    *((c - o) // cell_size for c, o in zip(point, origin)),
+                    index in feature,
+                ),
+                len(keys),
+            )
+            for index, point in enumerate(points)
+        ]
+        sums = [[0.0, 0.0, 0.0, 0] for _ in keys]
+        for point, cluster in zip(points, clusters):
+            acc = sums[cluster]
+            acc[0] += point[0]
+            acc[1] += point[1]
+            acc[2] += point[2]
+            acc[3] += 1
+        positions = [(x / n, y / n, z / n) for x, y, z, n in sums]
+
+        # Facets (removing degenerated and duplicated ones)
+        new_facets = {}
+        for facet in facets:
+            facet = tuple(clusters[i] for i in facet)
+            if len(set(facet)) == 3:
+                new_facets.setdefault(frozenset(facet), facet)
+
+        # Renumber used points, and compute normals and areas
+        renumber = {}
+        new_facets = [
+            tuple(renumber.setdefault(c, len(renumber)) for c in facet)
+            for facet in new_facets.values()
+        ]
+        new_points = [positions[c] for c in renumber]
+        result_facets, result_normals, result_areas = [], [], []
+        for facet in new_facets:
+            cross = vector3d.normal([new_points[i] for i in facet])
+            if not (length := hypot(*cross)):
+                continue
+            result_facets.append(facet)
+            result_normals.append(vector3d.fdiv(cross, length))
+            result_areas.append(length / 2)
+
+        return new_points, result_facets, result_normals, result_areas
+
     ##########################################################################
     #                               UV manipulations                         #
     ##########################################################################
@@ -1782,8 +2445,14 @@ _EXPORT_EXTENSIONS = {
     RenderMeshBase.ExportType.PLY: ".ply",
     RenderMeshBase.ExportType.CYCLES: ".xml",
     RenderMeshBase.ExportType.POVRAY: ".inc",
+    RenderMeshBase.ExportType.BINARYMESH: ".binarymesh",
+    RenderMeshBase.ExportType.GLB: ".glb",
 }
 
+# Keyword arguments of write_file which do not affect the written mesh file
+# (but only its MTL companion)
+_MTL_KWARGS = {"mtlfile", "mtlname", "mtlcontent"}
+
 
 def _check_directory(directory):
     """Check if directory is consistent (or None)."""
@@ -26,17 +26,23 @@ Capabilities are added by overloading base class methods.
 """
 
 import runpy
+import atexit
+import ctypes
+import threading
+import weakref
 import multiprocessing as mp
 from multiprocessing import connection, shared_memory
+from multiprocessing.sharedctypes import typecode_to_type
 import shutil
 import os
+import io
+import tempfile
 import time
 import itertools
 import operator
 import functools
 from math import radians, cos
-import copy
-import concurrent.futures
+import cmath
 import copy
 import concurrent.futures
 
@@ -45,9 +51,15 @@ try:
 except ModuleNotFoundError:
     pass
 
+try:
+    from scipy.sparse import csgraph, coo_matrix
+except ModuleNotFoundError:
+    pass
+
 
 from Render.constants import PKGDIR, PARAMS
-from Render.utils import warn, debug, grouper
+from Render.utils import warn, debug
+from Render.rendermesh_mp import clustering, binarymesh
 
 try:
     mp.set_start_method("spawn")
@@ -74,21 +86,52 @@ class RenderMeshMultiprocessingMixin:
         To be overidden by mixins if necessary.
         """
         mesh = self._originalmesh
-        points, facets = mesh.Topology
-        facets2 = mesh.Facets
-        count_points = mesh.CountPoints
-        count_facets = mesh.CountFacets
+
+        if numpy_enabled():
+            # Bulk ingestion (see _topology_np)
+            points, facets = _topology_np(mesh, self.name)
+            count_points = len(points)
+            count_facets = len(facets)
+        else:
+            points, facets = mesh.Topology
+            count_points = mesh.CountPoints
+            count_facets = mesh.CountFacets
 
         if PARAMS.GetBool("Debug"):
             print(f"{count_points} points, {count_facets} facets")
 
-        self._points = SharedArray("f", count_points, 3, points)
-        self._facets = SharedArray("l", count_facets, 3, facets)
-        self._normals = SharedArray(
-            "f", count_facets, 3, [f.Normal for f in facets2]
-        )
-        self._areas = mp.RawArray("f", count_facets)
-        self._areas[:] = [f.Area for f in facets2]
+        self._points = SharedArray("f", count_points, 3)
+        self._facets = SharedArray("l", count_facets, 3)
+        self._normals = SharedArray("f", count_facets, 3)
+        self._areas = _new_shared_array("f", count_facets)
+
+        if numpy_enabled():
+            # Fill shared memory directly, without intermediate lists
+            self._points.ndarray[...] = points
+            self._facets.ndarray[...] = facets
+
+            # Compute normals and areas from points and facets, rather than
+            # iterating over (slow) `mesh.Facets`
+            points = self._points.ndarray.astype(np.float64)
+            facets = self._facets.ndarray
+            vec1 = points[facets[..., 1]] - points[facets[..., 0]]
+            vec2 = points[facets[..., 2]] - points[facets[..., 0]]
+            cross = np.cross(vec1, vec2)
+            cross_norms = np.linalg.norm(cross, axis=1)
+            np.divide(
+                cross,
+                cross_norms[:, np.newaxis],
+                out=self._normals.ndarray,
+                where=cross_norms[:, np.newaxis] != 0.0,
+                casting="unsafe",
+            )
+            np.ctypeslib.as_array(self._areas)[:] = cross_norms / 2
+        else:
+            self._points[:] = points
+            self._facets[:] = facets
+            facets2 = mesh.Facets
+            self._normals[:] = [f.Normal for f in facets2]
+            self._areas[:] = [f.Area for f in facets2]
 
         self._uvmap = SharedArray("f", 0, 2)
 
@@ -142,7 +185,7 @@ class RenderMeshMultiprocessingMixin:
     @areas.setter
     def areas(self, value):
         """Set facet areas."""
-        self._areas = mp.RawArray("f", len(value))
+        self._areas = _new_shared_array("f", len(value))
         self._areas[:] = value
 
     @property
@@ -165,6 +208,17 @@ class RenderMeshMultiprocessingMixin:
         """Set vertex normals."""
         self._vnormals = SharedArray("f", len(value), 3, value)
 
+    def _compute_uvmap_cylinder(self):
+        """Compute UV map for cylindric case - multiprocessing version.
+
+        Cylinder axis is supposed to be z.
+        """
+        self._compute_uvmap_mp("uvmap_cylinder.py", color_count=3)
+
+    def _compute_uvmap_sphere(self):
+        """Compute UV map for spherical case - multiprocessing version."""
+        self._compute_uvmap_mp("uvmap_sphere.py", color_count=2)
+
     def _compute_uvmap_cube(self):
         """Compute UV map for cubic case - multiprocessing version.
 
@@ -172,19 +226,28 @@ class RenderMeshMultiprocessingMixin:
         one edge belongs to several cube faces (cf. simple cube case, for
         instance)
         """
+        self._compute_uvmap_mp("uvmap_cube.py", color_count=6)
+
+    def _compute_uvmap_mp(self, script, color_count):
+        """Compute UV map with a multiprocessing script.
+
+        Args:
+            script -- the name of the script in rendermesh_mp (str)
+            color_count -- the maximum number of submeshes the script may
+              split the mesh into (int)
+        """
         debug("Object", self.name, "Compute uvmap (mp)")
 
         # Init variables
-        path = os.path.join(PKGDIR, "rendermesh_mp", "uvmap_cube.py")
+        path = os.path.join(PKGDIR, "rendermesh_mp", script)
 
         # Init output buffers
-        color_count = 6
         points_per_facet = 3
         maxpoints = self.count_facets * color_count * points_per_facet
 
-        points_buf = mp.RawArray("f", maxpoints * 3)
-        facets_buf = mp.RawArray("l", self.count_facets * 3)
-        uvmap_buf = mp.RawArray("f", maxpoints * 2)
+        points_buf = _new_shared_array("f", maxpoints * 3)
+        facets_buf = _new_shared_array("l", self.count_facets * 3)
+        uvmap_buf = _new_shared_array("f", maxpoints * 2)
         point_count = mp.RawValue("l")
 
         # Init script globals
@@ -207,9 +270,11 @@ class RenderMeshMultiprocessingMixin:
         # Get outputs
         point_count = point_count.value
 
-        self._points.array = points_buf[: point_count * 3]
+        # Buffers are oversized: we just keep the useful part
+        self._points.array = _shared_array_prefix(points_buf, point_count * 3)
         self._facets.array = facets_buf
-        self.uvmap = list(grouper(uvmap_buf[: point_count * 2], 2))
+        self._uvmap = SharedArray("f", 0, 2)
+        self._uvmap.array = _shared_array_prefix(uvmap_buf, point_count * 2)
 
         points_buf = None
         facets_buf = None
@@ -275,6 +340,69 @@ class RenderMeshMultiprocessingMixin:
                 self.has_uvmap(),
             )
 
+    def _update_originalmesh(self):
+        """Update original mesh after a change of internal geometry.
+
+        Original mesh is not used by this mixin after setup.
+        """
+
+    def _total_area(self):
+        """Compute mesh total area - multiprocessing version."""
+        if numpy_enabled():
+            return float(np.ctypeslib.as_array(self._areas).sum())
+        return super()._total_area()
+
+    def _decimation_pass(self, cell_size, split_angle):
+        """Run a vertex clustering pass - multiprocessing version.
+
+        Multiprocessing script requires Numpy. Otherwise, the plain version
+        is used.
+        """
+        if not numpy_enabled():
+            result = super()._decimation_pass(cell_size, split_angle)
+            if result is None:
+                return None
+            points, facets, normals, areas = result
+            shared_areas = _new_shared_array("f", len(areas))
+            shared_areas[:] = areas
+            return (
+                SharedArray("f", len(points), 3, points),
+                SharedArray("l", len(facets), 3, facets),
+                SharedArray("f", len(normals), 3, normals),
+                shared_areas,
+            )
+
+        debug("Object", self.name, "Decimation pass (mp)")
+
+        # Init variables
+        path = os.path.join(PKGDIR, "rendermesh_mp", "decimate.py")
+
+        # Init script globals
+        init_globals = {
+            "PYTHON": self.python,
+            "POINTS": self._points.array,
+            "FACETS": self._facets.array,
+            "NORMALS": self._normals.array,
+            "AREAS": self._areas,
+            "CELL_SIZE": float(cell_size),
+            "SPLIT_ANGLE": float(split_angle),
+            "SHOWTIME": PARAMS.GetBool("Debug"),
+        }
+
+        # Run script (return points, facets, normals, areas)
+        result = self._run_path_in_process(
+            path, init_globals, return_types="flff"
+        )
+        if not result:
+            warn("Object", self.name, "Multiprocessed decimation failed")
+            return None
+
+        points = SharedArray("f", 0, 3)
+        facets = SharedArray("l", 0, 3)
+        normals = SharedArray("f", 0, 3)
+        points.array, facets.array, normals.array, areas = result
+        return points, facets, normals, areas
+
     def _write_objfile_helper(
         self,
         name,
@@ -299,14 +427,14 @@ class RenderMeshMultiprocessingMixin:
             uvmap = ((c.real, c.imag) for c in uvmap)
             uvmap = SharedArray("f", self.count_points, 2, uvmap)
         else:
-            uvmap = None
+            uvmap = self._uvmap
 
         # Init script globals
         init_globals = {
             "POINTS": self._points.array,
             "FACETS": self._facets.array,
             "VNORMALS": self._vnormals.array,
-            "UVMAP": self._uvmap.array,
+            "UVMAP": uvmap.array,
             "HAS_VNORMALS": self.has_vnormals(),
             "HAS_UVMAP": self.has_uvmap(),
             "MTLFILENAME": mtlfilename,
@@ -324,6 +452,134 @@ class RenderMeshMultiprocessingMixin:
             tm1 = time.time() - tm0
             print(f"end writing obj file ({tm1})")
 
+    def _write_binarymeshfile_helper(
+        self, name, binarymeshfile, uv_transformation
+    ):
+        """Write an appleseed binarymesh file - multi process version.
+
+        Writing binary data is I/O bound: rather than spawning a script, the
+        shared arrays are viewed as Numpy arrays and written in-process,
+        without copy. Falls back to base version if Numpy is not available.
+
+        See _write_binarymeshfile for more details.
+        """
+        if not numpy_enabled():
+            super()._write_binarymeshfile_helper(
+                name, binarymeshfile, uv_transformation
+            )
+            return
+
+        vnormals = self._vnormals.ndarray if self.has_vnormals() else None
+        uvs = (
+            self._uvtransform_np(*uv_transformation)
+            if self.has_uvmap()
+            else None
+        )
+
+        with open(binarymeshfile, "wb") as f:
+            binarymesh.write_np(
+                f,
+                name,
+                self._points.ndarray,
+                self._facets.ndarray,
+                vnormals,
+                uvs,
+            )
+
+    def _write_glbfile_sections(self, uv_transformation):
+        """Compute the binary sections of a GLB file - multi process version.
+
+        Like binarymesh, GLB sections are computed in-process from Numpy
+        views on shared arrays. Falls back to base version if Numpy is not
+        available.
+
+        See _write_glbfile_sections for more details.
+        """
+        if not numpy_enabled():
+            return super()._write_glbfile_sections(uv_transformation)
+
+        vnormals = self._vnormals.ndarray if self.has_vnormals() else None
+        uvs = (
+            self._uvtransform_np(*uv_transformation)
+            if self.has_uvmap()
+            else None
+        )
+        return _glb_sections_np(
+            self._points.ndarray, self._facets.ndarray, vnormals, uvs
+        )
+
+    def _write_cyclesfile(self, name, cyclesfile=None):
+        """Write a Cycles file from a mesh - multi process version.
+
+        Like binarymesh, the file is written in-process from Numpy views on
+        shared arrays. Falls back to base version if Numpy is not available.
+
+        See _write_cyclesfile for more details.
+        """
+        if not numpy_enabled():
+            super()._write_cyclesfile(name, cyclesfile)
+            return
+
+        has_vnormals, has_uvmap = self.has_vnormals(), self.has_uvmap()
+        vnormals = self._vnormals.ndarray if has_vnormals else None
+        uvs = self._uvmap.ndarray if has_uvmap else None
+        if has_vnormals and has_uvmap:
+            self.compute_tspaces()
+            tspaces = (
+                np.asarray(self.tangents, dtype=np.float64),
+                np.asarray(self.tangent_signs, dtype=np.float64),
+            )
+        else:
+            tspaces = None
+
+        with open(cyclesfile, "w", encoding="utf-8") as f:
+            _write_cycles_np(
+                f,
+                name,
+                self._points.ndarray,
+                self._facets.ndarray,
+                vnormals,
+                uvs,
+                tspaces,
+            )
+
+    def _write_povfile(self, name, povfile=None):
+        """Write a Povray file from a mesh - multi process version.
+
+        See _write_cyclesfile for more details.
+        """
+        if not numpy_enabled():
+            super()._write_povfile(name, povfile)
+            return
+
+        vnormals = self._vnormals.ndarray if self.has_vnormals() else None
+        uvs = self._uvmap.ndarray if self.has_uvmap() else None
+
+        with open(povfile, "w", encoding="utf-8") as f:
+            _write_pov_np(
+                f,
+                name,
+                self._points.ndarray,
+                self._facets.ndarray,
+                vnormals,
+                uvs,
+            )
+
+    def _uvtransform_np(self, translate, rotate, scale):
+        """Compute a uv transformation, as a Numpy (n, 2) array.
+
+        Args:
+            translate -- Translation vector (Vector2d)
+            rotate -- Rotation angle in degrees (float)
+            scale -- Scale factor (float)
+        """
+        trans_x, trans_y = translate
+        factor = cmath.rect(1.0, radians(float(rotate))) * float(scale)
+        uvs = self._uvmap.ndarray
+        uvs = (uvs[:, 0] + 1j * uvs[:, 1]) * factor
+        uvs += complex(trans_x, trans_y)
+        return np.column_stack((uvs.real, uvs.imag))
+
     def _run_path_in_process(self, path, init_globals, return_types=None):
         """Run a path in a dedicated process.
 
@@ -332,15 +588,42 @@ class RenderMeshMultiprocessingMixin:
         'runpy.run_path', by embedding run_path in a dedicated process.
         Please note 'self.python' must have been set. After
         being started, the process is awaited (joined).
+
+        If possible, the script is run by the worker service (see
+        WorkerService), rather than in a new process.
         """
+        init_globals["ENABLE_NUMPY"] = not PARAMS.GetBool("DisableNumpy")
+
+        # Try worker service first
+        try:
+            service = get_worker_service(self.python)
+            return service.run(path, init_globals, return_types)
+        except WorkerServiceError as err:
+            warn("Object", self.name, f"Worker service failed ({err})")
+        except WorkerScriptError as err:
+            warn("Object", self.name, f"Script failed:\n{err}")
+            return None
+
+        # Shared memory blocks cannot be passed by inheritance: we copy them
+        copies = {
+            key: _copy_shared_array(value)
+            for key, value in init_globals.items()
+            if hasattr(value, "shm")
+        }
+
         # Synchro objects
 
         main_conn, sub_conn = connection.Pipe()
 
         args = (path,)
-        init_globals["CONNECTION"] = sub_conn
-        init_globals["ENABLE_NUMPY"] = not PARAMS.GetBool("DisableNumpy")
-        kwargs = {"init_globals": init_globals, "run_name": "__main__"}
+        kwargs = {
+            "init_globals": {
+                **init_globals,
+                **copies,
+                "CONNECTION": sub_conn,
+            },
+            "run_name": "__main__",
+        }
 
         mp.set_executable(self.python)
 
@@ -353,44 +636,53 @@ class RenderMeshMultiprocessingMixin:
         # Retrieve outputs (into arrays)
         arrays = None
         if result and sentinel not in result:
-            msg = main_conn.recv()
-            shms = [
-                (shared_memory.SharedMemory(name), size) for name, size in msg
-            ]
-            buffers = [shm.buf[0:size] for shm, size in shms]
-            arrays = [
-                mp.RawArray(t, b.cast(t))
-                for b, t in zip(buffers, return_types)
-            ]
-            buffers = None  # Otherwise we cannot close shared memory...
-            for shm, _ in shms:
-                shm.close()
+            arrays = _retrieve_outputs(main_conn.recv(), return_types)
             main_conn.send("terminate")
         elif return_types is not None:
             warn("Object", self.name, "No return from mp module")
 
         process.join()
 
+        # Copy back (scripts may modify their inputs)
+        for key, value in copies.items():
+            target = init_globals[key]
+            size = ctypes.sizeof(target)
+            ctypes.memmove(ctypes.addressof(target), value, size)
+
         return arrays
 
 
 class SharedArray:
-    """An 2-dimensions array to be shared across multiple processes."""
+    """An 2-dimensions array to be shared across multiple processes.
+
+    The array is stored in a named shared memory block, so that it can be
+    passed to other processes by name, without copy (see WorkerService).
+    If Numpy is available, the array can also be viewed as a Numpy array
+    (see 'ndarray').
+    """
 
     def __init__(self, typecode, length, width, initializer=None):
-        self._rawarray = mp.RawArray(typecode, length * width)
+        self._rawarray = _new_shared_array(typecode, length * width)
         self._width = width
-        if initializer:
-            try:
-                self._rawarray[:] = list(
-                    itertools.chain.from_iterable(initializer)
+        if initializer is None:
+            return
+        if "np" in globals() and isinstance(initializer, np.ndarray):
+            if np.iscomplexobj(initializer):
+                initializer = np.column_stack(
+                    (initializer.real, initializer.imag)
                 )
-            except TypeError:
-                self._rawarray[:] = list(
-                    itertools.chain.from_iterable(
-                        (c.real, c.imag) for c in initializer
-                    )
+            self.ndarray[...] = initializer.reshape(-1, width)
+            return
+        try:
+            self._rawarray[:] = list(
+                itertools.chain.from_iterable(initializer)
+            )
+        except TypeError:
+            self._rawarray[:] = list(
+                itertools.chain.from_iterable(
+                    (c.real, c.imag) for c in initializer
                 )
+            )
 
     def __iter__(self):
         iters = [iter(self._rawarray)] * self.width
@@ -428,8 +720,339 @@ class SharedArray:
 
     @array.setter
     def array(self, value):
+        if not hasattr(value, "shm"):
+            # Not in shared memory: copy
+            typecode = self._rawarray._type_._type_
+            array = _new_shared_array(typecode, len(value))
+            array[:] = value
+            value = array
         self._rawarray = value
 
+    @property
+    def ndarray(self):
+        """Numpy view on the array (no copy)."""
+        array = np.ctypeslib.as_array(self._rawarray)
+        return array.reshape(-1, self.width)
+
+
+def _new_shared_array(typecode, length):
+    """Create a ctypes array in a new named shared memory block.
+
+    The block is unlinked when it is no longer used.
+    """
+    size = ctypes.sizeof(typecode_to_type[typecode]) * length
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    weakref.finalize(shm, _unlink_shared_memory, shm.name)
+    return _view_shared_memory(shm, typecode, length)
+
+
+def _adopt_shared_array(name, typecode, size):
+    """Adopt an array in a shared memory block created by another process.
+
+    The block is unlinked when it is no longer used.
+    """
+    shm = shared_memory.SharedMemory(name)
+    weakref.finalize(shm, _unlink_shared_memory, shm.name)
+    length = size // ctypes.sizeof(typecode_to_type[typecode])
+    return _view_shared_memory(shm, typecode, length)
+
+
+def _shared_array_prefix(array, length):
+    """Get a view on the first items of a shared array (no copy)."""
+    return _view_shared_memory(array.shm, array._type_._type_, length)
+
+
+def _view_shared_memory(shm, typecode, length):
+    """View a shared memory block as a ctypes array.
+
+    The array keeps a reference to the shared memory block, so that the
+    block lives as long as the array.
+    """
+    ctype = typecode_to_type[typecode] * length
+    array = ctype.from_address(_shm_address(shm))
+    array.shm = shm
+    return array
+
+
+def _copy_shared_array(array):
+    """Copy a shared memory array into a RawArray."""
+    result = mp.RawArray(array._type_, len(array))
+    ctypes.memmove(result, ctypes.addressof(array), ctypes.sizeof(array))
+    return result
+
+
+def _unlink_shared_memory(name):
+    """Unlink a shared memory block, by name."""
+    try:
+        shm = shared_memory.SharedMemory(name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _shm_address(shm):
+    """Get the address of a shared memory block.
+
+    The temporary ctypes object is released immediately, so that the shared
+    memory buffer is not kept exported (otherwise it could not be closed).
+    """
+    anchor = ctypes.c_char.from_buffer(shm.buf)
+    address = ctypes.addressof(anchor)
+    del anchor
+    return address
+
+
+# ===========================================================================
+#                           Worker service
+# ===========================================================================
+
+
+class WorkerServiceError(Exception):
+    """Exception raised when the worker service cannot run a script."""
+
+
+class WorkerScriptError(Exception):
+    """Exception raised when a script run by the worker service failed."""
+
+
+class WorkerService:
+    """A long-lived process running multiprocessing scripts.
+
+    The service (rendermesh_mp/service.py) owns a persistent pool of workers,
+    which is reused from one mesh to another, thus saving process startup
+    costs. It is started lazily, restarted if it is found unhealthy, and it
+    stops by itself after a period of inactivity.
+
+    A living service is trusted: its health is only checked after a script
+    failure, or when it may have stopped by itself (idle timeout), so that
+    running a script does not cost an extra round trip.
+
+    Script arguments are copied into named shared memory, so that they can be
+    sent to the running service, and copied back once the script is done.
+
+    This class is thread-safe: scripts are run one at a time.
+    """
+
+    IDLE_TIMEOUT = 300  # Seconds
+    START_TIMEOUT = 60  # Seconds
+    HEALTH_TIMEOUT = 10  # Seconds
+
+    def __init__(self, python, processes):
+        """Initialize service.
+
+        Args:
+            python -- the Python executable to use (str)
+            processes -- the number of workers in the pool (int)
+        """
+        self.python = python
+        self.processes = processes
+        self._process = None
+        self._connection = None
+        self._lock = threading.Lock()
+        self._suspect = False  # Service health should be checked
+        self._last_request = 0.0  # Time of last request (monotonic)
+
+    def run(self, path, init_globals, return_types=None):
+        """Run a multiprocessing script in the service.
+
+        See RenderMeshMultiprocessingMixin._run_path_in_process for the
+        arguments.
+
+        Raises:
+            WorkerServiceError if the service is not able to run the script
+        """
+        script, _ = os.path.splitext(os.path.basename(path))
+        with self._lock:
+            self._ensure_healthy()
+            shms = []
+            try:
+                arguments = {
+                    key: _encode_argument(value, shms)
+                    for key, value in init_globals.items()
+                }
+                self._connection.send(("run", script, arguments))
+                arrays = None
+                while True:
+                    reply, content = self._recv()
+                    if reply == "output":
+                        arrays = _retrieve_outputs(content, return_types)
+                        self._connection.send("terminate")
+                    elif reply == "error":
+                        # Script may have failed because of a broken pool
+                        self._suspect = True
+                        raise WorkerScriptError(content)
+                    else:
+                        break
+                # Copy outputs back into arguments
+                for obj, shm in shms:
+                    size = ctypes.sizeof(obj)
+                    ctypes.memmove(
+                        ctypes.addressof(obj), _shm_address(shm), size
+                    )
+                return arrays
+            except (OSError, ValueError) as err:
+                # Broken pipe, closed connection...
+                self._kill()
+                raise WorkerServiceError(str(err)) from err
+            finally:
+                self._last_request = time.monotonic()
+                for _, shm in shms:
+                    shm.close()
+                    shm.unlink()
+
+    def stop(self):
+        """Stop the service."""
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._connection.send(("stop",))
+            except OSError:
+                pass
+            self._process.join(self.HEALTH_TIMEOUT)
+            self._kill()
+
+    def _recv(self, timeout=None):
+        """Receive a reply from service, watching for service death."""
+        sentinel = self._process.sentinel
+        ready = connection.wait([self._connection, sentinel], timeout)
+        if self._connection not in ready:
+            self._kill()
+            raise WorkerServiceError("service is not responding")
+        return self._connection.recv()
+
+    def _ensure_healthy(self):
+        """Check service health, (re)starting it if necessary.
+
+        Health is checked (ping) only if service is suspect (last script
+        failed) or if it may be about to stop by itself (idle timeout).
+        """
+        if self._process is not None and self._process.is_alive():
+            idle = time.monotonic() - self._last_request
+            if not self._suspect and idle < self.IDLE_TIMEOUT / 2:
+                return
+            try:
+                self._connection.send(("ping", self.HEALTH_TIMEOUT))
+                reply, healthy = self._recv(self.HEALTH_TIMEOUT * 2)
+            except (OSError, EOFError, WorkerServiceError):
+                reply, healthy = None, False
+            if reply == "pong" and healthy:
+                self._suspect = False
+                self._last_request = time.monotonic()
+                return
+            debug("Mesh", "Worker service", "Unhealthy - restarting")
+            self._kill()
+        self._start()
+
+    def _start(self):
+        """Start the service process."""
+        debug("Mesh", "Worker service", f"Start ({self.processes} workers)")
+        path = os.path.join(PKGDIR, "rendermesh_mp", "service.py")
+        main_conn, sub_conn = connection.Pipe()
+        init_globals = {
+            "PYTHON": self.python,
+            "CONNECTION": sub_conn,
+            "PROCESSES": self.processes,
+            "IDLE_TIMEOUT": self.IDLE_TIMEOUT,
+        }
+        kwargs = {"init_globals": init_globals, "run_name": "__main__"}
+        mp.set_executable(self.python)
+        self._process = mp.Process(
+            target=runpy.run_path,
+            args=(path,),
+            kwargs=kwargs,
+            name="render-service",
+        )
+        self._connection = main_conn
+        self._process.start()
+        sub_conn.close()
+
+        # Wait for the pool to be up
+        try:
+            self._connection.send(("ping", self.START_TIMEOUT))
+            reply, healthy = self._recv(self.START_TIMEOUT * 2)
+        except (OSError, EOFError) as err:
+            self._kill()
+            raise WorkerServiceError(str(err)) from err
+        if reply != "pong" or not healthy:
+            self._kill()
+            raise WorkerServiceError("service failed to start")
+        self._suspect = False
+        self._last_request = time.monotonic()
+
+    def _kill(self):
+        """Kill the service process, if any."""
+        if self._process is not None and self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        if self._connection is not None:
+            self._connection.close()
+        self._process = None
+        self._connection = None
+
+
+_WORKER_SERVICE = None
+_WORKER_SERVICE_LOCK = threading.Lock()
+
+
+def get_worker_service(python):
+    """Get the session worker service.
+
+    The number of workers is given by 'MultiprocessingWorkers' parameter
+    (0 means number of CPUs).
+    """
+    global _WORKER_SERVICE  # pylint: disable=global-statement
+    processes = PARAMS.GetInt("MultiprocessingWorkers") or os.cpu_count()
+    with _WORKER_SERVICE_LOCK:
+        service = _WORKER_SERVICE
+        if service is None or (service.python, service.processes) != (
+            python,
+            processes,
+        ):
+            if service is not None:
+                service.stop()
+            service = _WORKER_SERVICE = WorkerService(python, processes)
+            atexit.register(service.stop)
+    return service
+
+
+def _encode_argument(value, shms):
+    """Encode a script argument, to be sent to worker service.
+
+    Shared memory arrays (see SharedArray) are replaced by descriptors (see
+    rendermesh_mp/service.py), without copy.
+    Other shared ctypes objects (RawArray, RawValue) are copied into named
+    shared memory. Created shared memory blocks are appended to 'shms', along
+    with the encoded object.
+    """
+    if hasattr(value, "shm"):
+        return ("array", value.shm.name, value._type_._type_, len(value))
+    if isinstance(value, (ctypes.Array, ctypes._SimpleCData)):
+        size = ctypes.sizeof(value)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shms.append((value, shm))
+        ctypes.memmove(_shm_address(shm), ctypes.addressof(value), size)
+        if isinstance(value, ctypes.Array):
+            return ("array", shm.name, value._type_._type_, len(value))
+        return ("value", shm.name, value._type_)
+    return value
+
+
+def _retrieve_outputs(message, return_types):
+    """Retrieve outputs sent by a script, as shared memory names.
+
+    The script hands the shared memory blocks over: they are adopted, without
+    copy.
+
+    Returns:
+        A list of shared memory arrays, with 'return_types' typecodes
+    """
+    return [
+        _adopt_shared_array(name, typecode, size)
+        for (name, size), typecode in zip(message, return_types)
+    ]
+
 
 # ===========================================================================
 #                           Numpy mixin
@@ -437,7 +1060,97 @@ class SharedArray:
 
 
 class RenderMeshNumpyMixin:
-    """A mixin class to add Numpy use capabilities to RenderMesh."""
+    """A mixin class to add Numpy use capabilities to RenderMesh.
+
+    If 'CompactMeshStorage' preference is set, internals are stored in
+    compact form (see _compact_internals).
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize mixin."""
+        tm0 = time.time()
+        self._compact = PARAMS.GetBool("CompactMeshStorage", False)
+        super().__init__(*args, **kwargs)
+        if not self.count_facets:
+            return
+        if self._compact:
+            # Computation steps may have upcast some internals
+            self._compact_internals()
+        storage = "compact" if self._compact else "standard"
+        tm1 = time.time() - tm0
+        msg = (
+            f"Internals ({storage} storage): "
+            f"{self._internals_nbytes()} bytes, built in {tm1}"
+        )
+        debug("Object", self.name, msg)
+
+    def _compact_internals(self):
+        """Convert internals to compact storage.
+
+        Coordinates, normals and areas are converted to float32, uv map to
+        complex64 (same layout as a (n, 2) float32 array) and facets to int32
+        (if point count allows it). Numerically sensitive computations
+        upcast their inputs locally.
+        """
+
+        def cast(array, dtype):
+            return None if array is None else array.astype(dtype, copy=False)
+
+        self._points = cast(self._points, np.float32)
+        self._normals = cast(self._normals, np.float32)
+        self._areas = cast(self._areas, np.float32)
+        self._vnormals = cast(self._vnormals, np.float32)
+        self._uvmap = cast(self._uvmap, np.complex64)
+        self._tangents = cast(self._tangents, np.float32)
+        self._tangent_signs = cast(self._tangent_signs, np.float32)
+        if self.count_points <= np.iinfo(np.int32).max:
+            self._facets = cast(self._facets, np.int32)
+
+    def _internals_nbytes(self):
+        """Get the memory size of internals, in bytes."""
+        internals = (
+            self._points,
+            self._facets,
+            self._normals,
+            self._areas,
+            self._uvmap,
+            self._vnormals,
+            self._tangents,
+            self._tangent_signs,
+        )
+        return sum(a.nbytes for a in internals if a is not None)
+
+    _INTERNALS = (
+        "points",
+        "facets",
+        "normals",
+        "areas",
+        "uvmap",
+        "vnormals",
+        "tangents",
+        "tangent_signs",
+    )
+
+    def save_internals(self, filename):
+        """Save internals to a file (numpy '.npz' format).
+
+        This allows to transfer a computed mesh between processes (see
+        exportengine module and 'load_internals').
+        """
+        internals = {
+            k: v
+            for k in self._INTERNALS
+            if (v := getattr(self, f"_{k}")) is not None
+        }
+        with open(filename, "wb") as file:
+            np.savez(file, **internals)
+
+    def load_internals(self, filename):
+        """Load internals from a file written by 'save_internals'."""
+        with np.load(filename) as internals:
+            for key in self._INTERNALS:
+                value = internals[key] if key in internals else None
+                setattr(self, f"_{key}", value)
 
     def _setup_internals(self):
         """Set up internal variables.
@@ -447,29 +1160,16 @@ class RenderMeshNumpyMixin:
         if PARAMS.GetBool("Debug"):
             tm0 = time.time()
         mesh = self._originalmesh
-        points, facets = mesh.Topology
-        count_facets = len(facets)
-        count_points = len(points)
-
-        if not count_facets:
+        if not mesh.CountFacets:
             # Empty mesh...
             return
 
-        if PARAMS.GetBool("Debug"):
-            print(f"{count_points} points, {count_facets} facets")
+        # Bulk ingestion (see _topology_np)
+        points, facets = _topology_np(mesh, self.name)
+        points = points.astype(np.float64)
 
-        points = np.fromiter(
-            (x for p in points for x in p),
-            dtype=np.float64,
-            count=count_points * 3,
-        )
-        points = points.reshape((-1, 3))
-        facets = np.fromiter(
-            (x for f in facets for x in f),
-            dtype=np.int64,
-            count=count_facets * 3,
-        )
-        facets = facets.reshape((-1, 3))
+        if PARAMS.GetBool("Debug"):
+            print(f"{len(points)} points, {len(facets)} facets")
 
         if PARAMS.GetBool("Debug"):
             tm1 = time.time() - tm0
@@ -502,41 +1202,136 @@ class RenderMeshNumpyMixin:
         self._uvmap = None
         self._vnormals = None
 
+        if self._compact:
+            self._compact_internals()
+
         if PARAMS.GetBool("Debug"):
             tm1 = time.time() - tm0
             print(f"Setup internals {tm1}")
-        print(self._points)  # TODO
 
     def has_uvmap(self):
         """Check if object has a uv map."""
+        if self.cache_metadata is not None:
+            return self.cache_metadata.get("uvmap", False)
         return self._uvmap is not None
 
     def has_vnormals(self):
         """Check if object has a vertex normals."""
+        if self.cache_metadata is not None:
+            return self.cache_metadata.get("vnormals", False)
         return self._vnormals is not None
 
-    # TODO uvmap cylinder and sphere
-
     def _compute_uvmap_cylinder(self):
-        """Compute UV map for cylindric case.
+        """Compute UV map for cylindric case - numpy version.
 
         Cylinder axis is supposed to be z.
+        Facets are split into 3 submeshes:
+        - non z-normal facets, not on seam (regular)
+        - non z-normal facets, on seam (seam)
+        - z-normal facets
         """
-        super()._compute_uvmap_cylinder()
-        self._points = np.asarray(self._points)
-        self._facets = np.asarray(self._facets)
-        self._normals = np.asarray(self._normals)
-        self._areas = np.asarray(self._areas)
-        self._uvmap = np.asarray(self._uvmap)
+        debug("Object", self.name, "Compute uvmap (np)")
+        time0 = time.time()
+
+        # Compute facet colors (0: regular, 1: seam, 2: z-normal)
+        triangles = np.take(self._points, self._facets, axis=0)
+        facet_colors = _facets_overlap_seam_np(triangles).astype(np.int64)
+        facet_colors[_facets_normal_to_z_np(triangles)] = 2
+
+        # Split points by color
+        point_colors = self._split_points_by_facet_color(facet_colors)
+        points = self._points
+
+        # Compute uvmap
+        xcoords, ycoords, zcoords = points.T
+        radii = np.hypot(xcoords, ycoords)
+        phis = np.arctan2(xcoords, ycoords)
+        seam = (point_colors == 1) & (phis < 0)
+        phis = np.where(seam, phis + 2 * np.pi, phis)
+        avg_radii = np.zeros(3)
+        for color in (0, 1):
+            if np.any(mask := point_colors == color):
+                avg_radii[color] = np.mean(radii[mask])
+        uvs = np.where(
+            point_colors == 2,
+            xcoords + 1j * ycoords,
+            phis * avg_radii[point_colors] + 1j * zcoords,
+        )
+        self._uvmap = uvs / 1000.0
+
+        if PARAMS.GetBool("Debug"):
+            print("numpy", time.time() - time0)
 
     def _compute_uvmap_sphere(self):
-        """Compute UV map for spherical case."""
-        super()._compute_uvmap_sphere()
-        self._points = np.asarray(self._points)
-        self._facets = np.asarray(self._facets)
-        self._normals = np.asarray(self._normals)
-        self._areas = np.asarray(self._areas)
-        self._uvmap = np.asarray(self._uvmap)
+        """Compute UV map for spherical case - numpy version.
+
+        Facets are split into 2 submeshes:
+        - facets not on seam (regular)
+        - facets on seam (seam)
+        """
+        debug("Object", self.name, "Compute uvmap (np)")
+        time0 = time.time()
+
+        # Compute facet colors (0: regular, 1: seam) and center of gravity
+        triangles = np.take(self._points, self._facets, axis=0)
+        facet_colors = _facets_overlap_seam_np(triangles).astype(np.int64)
+        origin = _center_of_gravity_np(triangles, self._areas)
+
+        # Split points by color
+        point_colors = self._split_points_by_facet_color(facet_colors)
+
+        # Compute uvmap
+        vectors = self._points - origin
+        lengths = np.linalg.norm(vectors, axis=1)
+        phis = np.arctan2(vectors[..., 0], vectors[..., 1])
+        seam = (point_colors == 1) & (phis < 0)
+        phis = np.where(seam, phis + 2 * np.pi, phis)
+        sines = np.divide(
+            vectors[..., 2],
+            lengths,
+            out=np.zeros_like(lengths),
+            where=lengths != 0.0,
+        )
+        uvs = (0.5 + phis / (2 * np.pi)) + 1j * (
+            0.5 + np.arcsin(np.clip(sines, -1.0, 1.0)) / np.pi
+        )
+        uvs *= lengths / 1000.0 * np.pi
+        self._uvmap = uvs
+
+        if PARAMS.GetBool("Debug"):
+            print("numpy", time.time() - time0)
+
+    def _split_points_by_facet_color(self, facet_colors):
+        """Split points shared by facets of different colors.
+
+        Facets are given a color (an integer), and points are duplicated so
+        that each point belongs to facets of a single color. Points and
+        facets are updated accordingly.
+
+        Args:
+            facet_colors -- the colors of the facets (numpy 1D array)
+
+        Returns:
+            The colors of the new points (numpy 1D array)
+        """
+        count_facets = self.count_facets
+
+        # Unfold facet points, joining with facet colors
+        # Make them unique --> colored points
+        unfolded_points = self._facets.ravel()
+        unfolded_colors = facet_colors.repeat(3)
+        unfolded_colored_points = np.column_stack(
+            (unfolded_points, unfolded_colors)
+        )
+        colored_points, new_facets = np.unique(
+            unfolded_colored_points, return_inverse=True, axis=0
+        )
+
+        # Update attributes
+        self._facets = new_facets.reshape(count_facets, 3)
+        self._points = self._points[colored_points[..., 0]]
+
+        return colored_points[..., 1]
 
     def _compute_uvmap_cube(self):
         """Compute UV map for cubic case - numpy version."""
@@ -567,10 +1362,7 @@ class RenderMeshNumpyMixin:
         facet_colors = facet_colors.ravel()
 
         # Compute center of gravity (triangle cogs weighted by triangle areas)
-        weighted_triangle_cogs = (
-            np.add.reduce(triangles, 1) * areas[:, np.newaxis] / 3
-        )
-        cog = np.sum(weighted_triangle_cogs, axis=0) / np.sum(areas)
+        cog = _center_of_gravity_np(triangles, areas)
 
         # Update point list
         # Unfold facet points, joining with facet colors
@@ -643,7 +1435,13 @@ class RenderMeshNumpyMixin:
         # TODO Use linalg (multithreaded...)
         magnitudes = np.sqrt((vect_array**2).sum(-1))
         magnitudes = np.expand_dims(magnitudes, axis=1)
-        return np.divide(vect_array, magnitudes, where=magnitudes != 0.0)
+        # Null vectors are kept as is (like in base version)
+        return np.divide(
+            vect_array,
+            magnitudes,
+            out=np.zeros_like(vect_array),
+            where=magnitudes != 0.0,
+        )
 
     def compute_vnormals(self):
         """Compute vertex normals (numpy version).
@@ -827,8 +1625,9 @@ class RenderMeshNumpyMixin:
     def _connected_components(self, split_angle=radians(30)):
         """Get all connected components of facets in the mesh.
 
-        Numpy version: this method uses a union-find algorithm, with path
-        compression
+        Numpy version: components are computed on the whole edge array,
+        either by SciPy (if available) or by pointer jumping. Union-find is
+        used as a fallback.
 
         Args:
             split_angle -- the angle that breaks adjacency
@@ -836,7 +1635,6 @@ class RenderMeshNumpyMixin:
         Returns:
             a list of tags. Each tag gives the component of the corresponding
                 facet
-            the number of components
         """
         debug("Object", self.name, "Compute connected components (np)")
 
@@ -847,9 +1645,35 @@ class RenderMeshNumpyMixin:
             np.set_printoptions(edgeitems=600)
 
         edges = self._adjacent_facets(split_angle)
-        if debug_flag := PARAMS.GetBool("Debug"):
+        if debug_flag:
             print("Adjacent facets", time.time() - tm0)
 
+        nfacets = len(self.facets)
+        if "csgraph" in globals():
+            tags = _connected_components_scipy(edges, nfacets)
+        else:
+            tags = _connected_components_np(edges, nfacets)
+        if tags is None:
+            debug("Object", self.name, "Fall back to union-find")
+            tags = self._connected_components_union_find(edges)
+
+        if debug_flag:
+            print("tags", time.time() - tm0)
+
+        return tags
+
+    def _connected_components_union_find(self, edges):
+        """Get all connected components of facets in the mesh - union-find.
+
+        This method uses a union-find algorithm, with path compression.
+
+        Args:
+            edges -- the pairs of adjacent facets (numpy array)
+
+        Returns:
+            a list of tags. Each tag gives the component of the corresponding
+                facet
+        """
         nfacets = len(self.facets)
         # Numpy array is slightly slower than list, but it releases GIL...
         fathers = np.full((nfacets,), -1, dtype=np.int64)
@@ -909,9 +1733,6 @@ class RenderMeshNumpyMixin:
         else:
             tags = np.empty(shape=[0], dtype=np.int64)
 
-        if debug_flag:
-            print("tags", time.time() - tm0)
-
         return tags
 
     def separate_connected_components(self, split_angle=radians(30)):
@@ -956,6 +1777,72 @@ class RenderMeshNumpyMixin:
         if debug_flag:
             print("separate", time.time() - tm0)
 
+    def _update_originalmesh(self):
+        """Update original mesh after a change of internal geometry.
+
+        Original mesh is not used by this mixin after setup.
+        """
+
+    def _total_area(self):
+        """Compute mesh total area - numpy version."""
+        return float(np.sum(self._areas))
+
+    def _decimation_pass(self, cell_size, split_angle):
+        """Run a vertex clustering pass - numpy version.
+
+        Clusters are replaced by the points which minimize their quadric
+        errors (see rendermesh_mp/clustering.py).
+        """
+        return clustering.decimate(
+            self._points,
+            self._facets,
+            self._normals,
+            self._areas,
+            cell_size,
+            split_angle,
+        )
+
+    def merge_internals(self, meshes):
+        """Set internals to the concatenation of meshes - numpy version.
+
+        Mesh transformations are baked into points and normals. Meshes must
+        be numpy RenderMeshes, and either all or none of them must have uv
+        map (resp. vertex normals).
+
+        Args:
+            meshes -- the meshes to merge (list of RenderMesh)
+        """
+        points, facets, normals, areas, uvmaps, vnormals = (
+            [] for _ in range(6)
+        )
+        offset = 0
+        for mesh in meshes:
+            transformation = mesh.transformation
+            rows = np.array(transformation.get_matrix_rows(), dtype="f8")
+            scale = transformation.scale
+            linear, translation = rows[:3, :3], rows[:3, 3]
+            rotation = linear / scale
+            # pylint: disable=protected-access
+            points.append(mesh._points @ linear.T + translation)
+            facets.append(mesh._facets + offset)
+            normals.append(mesh._normals @ rotation.T)
+            areas.append(mesh._areas * scale * scale)
+            if mesh._uvmap is not None:
+                uvmaps.append(mesh._uvmap)
+            if mesh._vnormals is not None:
+                vnormals.append(mesh._vnormals @ rotation.T)
+            offset += len(mesh._points)
+
+        self._points = np.concatenate(points).astype(meshes[0]._points.dtype)
+        self._facets = np.concatenate(facets)
+        self._normals = np.concatenate(normals)
+        self._areas = np.concatenate(areas)
+        self._uvmap = np.concatenate(uvmaps) if uvmaps else None
+        self._vnormals = np.concatenate(vnormals) if vnormals else None
+        self._tangents = self._tangent_signs = None
+        if self._compact:
+            self._compact_internals()
+
     def _scale_points(self, ratio):
         """Scale points with ratio (can be overriden by mixins).
 
@@ -966,6 +1853,194 @@ class RenderMeshNumpyMixin:
         self._points = copy.deepcopy(self._points)
         self._points *= ratio
 
+    def uvtransform(self, translate, rotate, scale):
+        """Compute a uv transformation.
+
+        Numpy version: returns an array rather than an iterator.
+
+        Args:
+            translate -- Translation vector (Vector2d)
+            rotate -- Rotation angle in degrees (float)
+            scale -- Scale factor (float)
+        """
+        trans_x, trans_y = translate
+        factor = cmath.rect(1.0, radians(float(rotate))) * float(scale)
+        trans = complex(trans_x, trans_y)
+        return self._uvmap * factor + trans
+
+    def _write_objfile_helper(
+        self,
+        name,
+        objfile,
+        uv_transformation,
+        mtlfilename=None,
+        mtlname=None,
+    ):
+        """Write an OBJ file from a mesh - numpy version.
+
+        Each section is formatted by blocks of rows, with a single
+        printf-style formatting per block. Output is identical to base
+        version.
+
+        See write_objfile for more details.
+        """
+        has_uvmap, has_vnormals = self.has_uvmap(), self.has_vnormals()
+
+        with open(objfile, "w", encoding="utf-8") as f:
+            # Header
+            f.write("# Written by FreeCAD-Render\n")
+
+            # Mtl
+            if mtlfilename:
+                f.write(f"mtllib {mtlfilename}\n\n")
+
+            # Vertices
+            f.write("# Vertices\n")
+            _write_rows(f, "v %g %g %g\n", self._points)
+            f.write("\n")
+
+            # UV
+            if has_uvmap:
+                # Translate, rotate, scale (optionally)
+                uvs = self.uvtransform(*uv_transformation)
+                uvs = np.column_stack((uvs.real, uvs.imag))
+                f.write("# Texture coordinates\n")
+                _write_rows(f, "vt %g %g\n", uvs)
+                f.write("\n")
+
+            # Vertex normals
+            if has_vnormals:
+                f.write("# Vertex normals\n")
+                _write_rows(f, "vn %g %g %g\n", self._vnormals)
+                f.write("\n")
+
+            # Object name
+            f.write(f"o {name}\n")
+            if mtlname is not None:
+                f.write(f"usemtl {mtlname}\n")
+            f.write("\n")
+
+            # Faces
+            if has_vnormals and has_uvmap:
+                mask, repeat = " %d/%d/%d", 3
+            elif not has_vnormals and has_uvmap:
+                mask, repeat = " %d/%d", 2
+            elif has_vnormals and not has_uvmap:
+                mask, repeat = " %d//%d", 2
+            else:
+                mask, repeat = " %d", 1
+            faces = np.repeat(self._facets + 1, repeat, axis=1)
+            f.write("# Faces\n")
+            _write_rows(f, "f" + mask * 3 + "\n", faces)
+
+    def _write_plyfile_binary(self, name, plyfile, uv_transformation):
+        """Write a binary (little endian) PLY file from a mesh.
+
+        Numpy version: vertices and faces are packed into structured arrays
+        and written in one shot.
+        """
+        # Header
+        header = self._write_plyfile_header(name, "binary_little_endian")
+
+        # Vertices (and vertex normals and uv)
+        fields = [(("x", "y", "z"), self._points)]
+        if self.has_vnormals():
+            fields.append((("nx", "ny", "nz"), self._vnormals))
+        if self.has_uvmap():
+            uvs = self.uvtransform(*uv_transformation)
+            fields.append((("s", "t"), np.column_stack((uvs.real, uvs.imag))))
+        dtype = [(n, "<f4") for names, _ in fields for n in names]
+        verts = np.empty(self.count_points, dtype=dtype)
+        for names, values in fields:
+            for index, field in enumerate(names):
+                verts[field] = values[..., index]
+
+        # Faces
+        dtype = [("count", "u1"), ("indices", "<i4", (3,))]
+        faces = np.empty(self.count_facets, dtype=dtype)
+        faces["count"] = 3
+        faces["indices"] = self._facets
+
+        # Write
+        with open(plyfile, "wb") as f:
+            f.write("".join(header).encode("utf-8"))
+            verts.tofile(f)
+            faces.tofile(f)
+
+    def _write_binarymeshfile_helper(
+        self, name, binarymeshfile, uv_transformation
+    ):
+        """Write an appleseed binarymesh file - numpy version.
+
+        See _write_binarymeshfile for more details.
+        """
+        vnormals = self._vnormals if self.has_vnormals() else None
+        if self.has_uvmap():
+            uvs = self.uvtransform(*uv_transformation)
+            uvs = np.column_stack((uvs.real, uvs.imag))
+        else:
+            uvs = None
+
+        with open(binarymeshfile, "wb") as f:
+            binarymesh.write_np(
+                f, name, self._points, self._facets, vnormals, uvs
+            )
+
+    def _write_glbfile_sections(self, uv_transformation):
+        """Compute the binary sections of a GLB file - numpy version.
+
+        See _write_glbfile_sections for more details.
+        """
+        vnormals = self._vnormals if self.has_vnormals() else None
+        if self.has_uvmap():
+            uvs = self.uvtransform(*uv_transformation)
+            uvs = np.column_stack((uvs.real, uvs.imag))
+        else:
+            uvs = None
+        return _glb_sections_np(self._points, self._facets, vnormals, uvs)
+
+    def _write_cyclesfile(self, name, cyclesfile=None):
+        """Write a Cycles file from a mesh - numpy version.
+
+        Attributes are streamed to file by chunks of rows, and tangent
+        spaces arrays are used directly. Output is identical to base version.
+
+        See _write_cyclesfile for more details.
+        """
+        has_vnormals, has_uvmap = self.has_vnormals(), self.has_uvmap()
+        vnormals = self._vnormals if has_vnormals else None
+        if has_uvmap:
+            uvs = np.column_stack((self._uvmap.real, self._uvmap.imag))
+        else:
+            uvs = None
+        if has_vnormals and has_uvmap:
+            self.compute_tspaces()
+            tspaces = (self._tangents, self._tangent_signs)
+        else:
+            tspaces = None
+
+        with open(cyclesfile, "w", encoding="utf-8") as f:
+            _write_cycles_np(
+                f, name, self._points, self._facets, vnormals, uvs, tspaces
+            )
+
+    def _write_povfile(self, name, povfile=None):
+        """Write a Povray file from a mesh - numpy version.
+
+        Sections are streamed to file by chunks of rows. Output is identical
+        to base version.
+
+        See _write_povfile for more details.
+        """
+        vnormals = self._vnormals if self.has_vnormals() else None
+        if self.has_uvmap():
+            uvs = np.column_stack((self._uvmap.real, self._uvmap.imag))
+        else:
+            uvs = None
+
+        with open(povfile, "w", encoding="utf-8") as f:
+            _write_pov_np(f, name, self._points, self._facets, vnormals, uvs)
+
     def compute_tspaces(self):
         """Compute tangent spaces using NumPy."""
         debug("Object", self.name, "Compute tangent spaces 2 (np)")
@@ -973,19 +2048,21 @@ class RenderMeshNumpyMixin:
         if debug_flag := PARAMS.GetBool("Debug"):
             print("Start compute_tspaces")
 
+        # Inputs are upcast to float64 (compact storage)
         facets = self._facets  # Shape: (num_facets, 3)
-        normals = self._vnormals
+        normals = self._vnormals.astype(np.float64, copy=False)
 
         # Compute edge vectors
-        points = self._points
+        points = self._points.astype(np.float64, copy=False)
         v = (
             points[facets].reshape(-1, 3, 3).transpose(1, 0, 2)
         )  # Shape: (3, num_facets, 3)
         e = np.array([v[1] - v[0], v[2] - v[0]])  # Shape: (2, num_facets, 3)
 
         # Compute the UV differences
+        uvmap = self._uvmap.astype(np.complex128, copy=False)
         uvmap = np.column_stack(
-            (self._uvmap.real, self._uvmap.imag)
+            (uvmap.real, uvmap.imag)
         )  # Shape: (num_facets, 2)
         w = (
             uvmap[facets].reshape(-1, 3, 2).transpose(1, 0, 2)
@@ -1065,16 +2142,447 @@ class RenderMeshNumpyMixin:
 
         self._tangents = tangents
         self._tangent_signs = tangent_signs
+        if self._compact:
+            self._compact_internals()
 
         if debug_flag:
             print(f"End compute_tspaces: {time.time() - tm0:.6f} seconds")
 
 
+# ===========================================================================
+#                           Remote mixin
+# ===========================================================================
+
+
+class RenderMeshRemoteMixin:
+    """A mixin class to delegate RenderMesh geometry to an export worker.
+
+    Geometry is computed and held by a worker of the export engine (see
+    exportengine module), which also writes the mesh files. The mesh itself
+    just holds its transformation and a handle to the remote geometry
+    ('remote', see exportengine.Remote). Operations on geometry other than
+    scaling and writing are not supported.
+    """
+
+    remote = None
+
+    # Scale to apply to remote points before writing (see _scale_points)
+    _remote_ratio = 1.0
+
+    @property
+    def count_points(self):
+        """Get the number of points - remote version."""
+        return self.remote.count_points
+
+    @property
+    def count_facets(self):
+        """Get the number of facets - remote version."""
+        return self.remote.count_facets
+
+    def has_uvmap(self):
+        """Check if object has a uv map - remote version."""
+        if self.cache_metadata is not None:
+            return self.cache_metadata.get("uvmap", False)
+        return self.remote.uvmap
+
+    def has_vnormals(self):
+        """Check if object has a vertex normals - remote version."""
+        if self.cache_metadata is not None:
+            return self.cache_metadata.get("vnormals", False)
+        return self.remote.vnormals
+
+    def _scale_points(self, ratio):
+        """Scale points with ratio - remote version.
+
+        Scaling is deferred to writing (remote geometry is shared by
+        copies).
+        """
+        self._remote_ratio *= ratio
+
+    def _write_file_helper(
+        self,
+        name,
+        filetype,
+        filename,
+        uv_translate,
+        uv_rotate,
+        uv_scale,
+        kwargs,
+    ):
+        """Write a mesh file (helper) - remote version."""
+        args = (name, filetype, filename, uv_translate, uv_rotate, uv_scale)
+        self.remote.write(self._remote_ratio, args, kwargs)
+
+
 # ===========================================================================
 #                               Helpers
 # ===========================================================================
 
 
+def _connected_components_scipy(edges, count):
+    """Compute connected components of a graph, with SciPy.
+
+    Args:
+        edges -- the edges of the graph, as pairs of vertex indices (numpy
+          array)
+        count -- the number of vertices in the graph
+
+    Returns:
+        The tags of the vertices: each tag is the smallest vertex index in
+        the component (numpy 1D array)
+    """
+    graph = coo_matrix(
+        (np.ones(len(edges), dtype=np.int8), (edges[..., 0], edges[..., 1])),
+        shape=(count, count),
+    )
+    _, labels = csgraph.connected_components(graph, directed=False)
+
+    # Convert labels to smallest vertex index
+    roots = np.full(labels.max(initial=-1) + 1, count, dtype=np.int64)
+    np.minimum.at(roots, labels, np.arange(count))
+    return roots[labels]
+
+
+def _connected_components_np(edges, count, max_rounds=64):
+    """Compute connected components of a graph, by pointer jumping.
+
+    Each vertex points to a parent with a smaller index. At each round,
+    the roots of the trees joined by an edge are hooked to the smallest
+    one, then trees are flattened by pointer jumping, until no edge joins
+    two trees.
+
+    Args:
+        edges -- the edges of the graph, as pairs of vertex indices (numpy
+          array)
+        count -- the number of vertices in the graph
+        max_rounds -- the maximum number of hooking rounds
+
+    Returns:
+        The tags of the vertices: each tag is the smallest vertex index in
+        the component (numpy 1D array), or None if the computation did not
+        converge within max_rounds.
+    """
+    parents = np.arange(count, dtype=np.int64)
+    left, right = edges[..., 0], edges[..., 1]
+
+    for _ in range(max_rounds):
+        # Hook
+        roots_left, roots_right = parents[left], parents[right]
+        unjoined = roots_left != roots_right
+        if not np.any(unjoined):
+            return parents
+        roots_left, roots_right = roots_left[unjoined], roots_right[unjoined]
+        np.minimum.at(
+            parents,
+            np.maximum(roots_left, roots_right),
+            np.minimum(roots_left, roots_right),
+        )
+
+        # Jump
+        while True:
+            grandparents = parents[parents]
+            if np.array_equal(grandparents, parents):
+                break
+            parents = grandparents
+
+    return None
+
+
+def _facets_overlap_seam_np(triangles):
+    """Test whether facets overlap the seam - numpy version.
+
+    Args:
+        triangles -- the facets, as an array of shape (n, 3, 3)
+
+    Returns:
+        An array of booleans, of shape (n,)
+    """
+    phis = np.arctan2(triangles[..., 0], triangles[..., 1])
+    minphis, maxphis = np.min(phis, axis=1), np.max(phis, axis=1)
+    # Seam is at -pi, +pi (due to atan2 behavior)
+    return (
+        (minphis * maxphis < 0)
+        & (minphis <= -np.pi / 2)
+        & (maxphis >= np.pi / 2)
+    )
+
+
+def _facets_normal_to_z_np(triangles):
+    """Test whether facets are normal to z axis - numpy version.
+
+    Args:
+        triangles -- the facets, as an array of shape (n, 3, 3)
+
+    Returns:
+        An array of booleans, of shape (n,)
+    """
+    edges = triangles[:, 1:, :] - triangles[:, :1, :]
+    lengths = np.linalg.norm(edges, axis=2)
+    zcoords = np.divide(
+        edges[..., 2],
+        lengths,
+        out=np.zeros_like(lengths),
+        where=lengths != 0.0,
+    )
+    tolerance = 1e-5
+    return np.all(np.abs(zcoords) <= tolerance, axis=1)
+
+
+def _topology_np(mesh, name=""):
+    """Get the points and facets of a Mesh.Mesh, as Numpy arrays.
+
+    Points and facets are read in bulk from a binary STL serialization of
+    the mesh (see _read_stl_np), so that no Python object is created per
+    point or facet. If serialization fails, falls back to 'mesh.Topology'.
+
+    Args:
+        mesh -- the mesh (Mesh.Mesh)
+        name -- the name of the mesh, for logging purpose (str)
+
+    Returns:
+        The points (float32 numpy array, shape (n, 3)) and the facets
+        (int64 numpy array, shape (m, 3))
+    """
+    try:
+        return _read_stl_np(mesh)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        debug("Object", name, f"Bulk ingestion failed ({exc})")
+
+    points, facets = mesh.Topology
+    points = np.fromiter(
+        (x for p in points for x in p),
+        dtype=np.float32,
+        count=len(points) * 3,
+    )
+    facets = np.fromiter(
+        (x for f in facets for x in f),
+        dtype=np.int64,
+        count=len(facets) * 3,
+    )
+    return points.reshape((-1, 3)), facets.reshape((-1, 3))
+
+
+def _read_stl_np(mesh):
+    """Read the points and facets of a Mesh.Mesh, via binary STL.
+
+    The mesh is written in binary STL, in memory if FreeCAD allows it (or
+    else in a temporary file), and read back with 'np.frombuffer'. As
+    FreeCAD stores mesh points in single precision, this is lossless.
+
+    Shared points are recovered from facet corners, in order of first
+    appearance: unused points are dropped, and coincident points are merged.
+
+    Args:
+        mesh -- the mesh (Mesh.Mesh)
+
+    Returns:
+        The points (float32 numpy array, shape (n, 3)) and the facets
+        (int64 numpy array, shape (m, 3))
+    """
+    # Serialize
+    try:
+        stream = io.BytesIO()
+        mesh.write(Stream=stream, Format="STL")
+        data = stream.getvalue()
+    except Exception:  # pylint: disable=broad-exception-caught
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "mesh.stl")
+            mesh.write(path)
+            with open(path, "rb") as f:
+                data = f.read()
+
+    # Read facet records (normal, 3 corners, attribute)
+    dtype = np.dtype(
+        [("normal", "<f4", (3,)), ("corners", "<f4", (3, 3)), ("attr", "<u2")]
+    )
+    count = int.from_bytes(data[80:84], "little")
+    if len(data) != 84 + count * dtype.itemsize:
+        raise ValueError("Not a binary STL")
+    corners = np.frombuffer(data, dtype=dtype, count=count, offset=84)
+    corners = corners["corners"].reshape(-1, 3)
+
+    # Recover shared points (in order of first appearance)
+    keys = np.ascontiguousarray(corners).view(np.dtype((np.void, 12)))
+    _, first, inverse = np.unique(
+        keys.ravel(), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first)
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    points = corners[first[order]]
+    facets = ranks[inverse.ravel()].reshape(-1, 3).astype(np.int64)
+
+    return points, facets
+
+
+def _center_of_gravity_np(triangles, areas):
+    """Compute center of gravity of facets, weighted by their areas.
+
+    Computation is done in float64, whatever the storage of inputs.
+    """
+    triangles = triangles.astype(np.float64, copy=False)
+    areas = areas.astype(np.float64, copy=False)
+    weighted_triangle_cogs = (
+        np.add.reduce(triangles, 1) * areas[:, np.newaxis] / 3
+    )
+    return np.sum(weighted_triangle_cogs, axis=0) / np.sum(areas)
+
+
+def _glb_sections_np(points, facets, vnormals=None, uvs=None):
+    """Compute the binary sections of a GLB file from Numpy arrays.
+
+    Args:
+        points -- the points (numpy array, shape (n, 3))
+        facets -- the facets (numpy array, shape (m, 3))
+        vnormals -- the vertex normals (numpy array, shape (n, 3)) or None
+        uvs -- the texture coordinates (numpy array, shape (n, 2)) or None
+
+    Returns:
+        A list of (semantic, count, data) tuples, and the bounds of the
+        points, as a (min, max) tuple (see glb.write)
+    """
+    count = len(points)
+    points = np.ascontiguousarray(points, dtype="<f4")
+    if count:
+        bounds = (points.min(axis=0).tolist(), points.max(axis=0).tolist())
+    else:
+        bounds = ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+    sections = [("POSITION", count, points)]
+    if vnormals is not None:
+        vnormals = np.ascontiguousarray(vnormals, dtype="<f4")
+        sections.append(("NORMAL", count, vnormals))
+    if uvs is not None:
+        # glTF uv origin is top left corner: flip v
+        uvs = np.column_stack((uvs[:, 0], 1.0 - uvs[:, 1])).astype("<f4")
+        sections.append(("TEXCOORD_0", count, uvs))
+    indices = np.ascontiguousarray(facets, dtype="<u4").ravel()
+    sections.append(("indices", len(indices), indices))
+    return sections, bounds
+
+
+def _write_rows(file, fmt, array, chunk_size=50000):
+    """Write a 2D array to a text file, row by row, in a printf-style format.
+
+    Formatting is done by chunks of rows: for each chunk, the row format is
+    repeated and applied once to the whole chunk, which is far faster than
+    formatting rows one by one.
+
+    Args:
+        file -- the file to write to (text file object)
+        fmt -- the printf-style format of a row (str)
+        array -- the array to write (numpy 2D array)
+        chunk_size -- the number of rows per chunk (int)
+    """
+    for start in range(0, len(array), chunk_size):
+        chunk = array[start : start + chunk_size]
+        file.write((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def _write_joined_rows(file, fmt, array, sep, index=None, chunk_size=50000):
+    """Write a 2D array to a text file, as formatted rows joined by 'sep'.
+
+    Like '_write_rows', formatting is done by chunks of rows, so that output
+    is streamed to file with bounded transient strings. No separator is
+    written after last row.
+
+    Args:
+        file -- the file to write to (text file object)
+        fmt -- the printf-style format of a row (str)
+        array -- the array to write (numpy 2D array)
+        sep -- the separator between rows (str)
+        index -- the indices of the rows to write, if not all rows in order
+          (numpy 1D array or None)
+        chunk_size -- the number of rows per chunk (int)
+    """
+    count = len(array) if index is None else len(index)
+    for start in range(0, count, chunk_size):
+        stop = start + chunk_size
+        chunk = (
+            array[start:stop] if index is None else array[index[start:stop]]
+        )
+        mask = sep.join([fmt] * len(chunk))
+        if stop < count:
+            mask += sep
+        file.write(mask % tuple(chunk.ravel().tolist()))
+
+
+def _write_cycles_np(
+    file, name, points, facets, vnormals=None, uvs=None, tspaces=None
+):
+    """Write a mesh to a Cycles file - numpy version.
+
+    Args:
+        file -- the file to write to (text file object)
+        name -- the mesh name (str)
+        points -- the points (numpy array, shape (n, 3))
+        facets -- the facets (numpy array, shape (m, 3))
+        vnormals -- the vertex normals (numpy array, shape (n, 3)) or None
+        uvs -- the uv, by point (numpy array, shape (n, 2)) or None
+        tspaces -- the tangents and tangent signs, by point, as a tuple of
+          numpy arrays (shapes (n, 3) and (n,)) or None
+    """
+    corners = np.ravel(facets)
+
+    def write_attribute(attribute, fmt, array, sep="  ", index=None):
+        """Write a mesh attribute."""
+        file.write(f'    {attribute}="')
+        _write_joined_rows(file, fmt, array, sep, index)
+        file.write('"\n')
+
+    file.write(f'<?xml version="1.0" ?>\n<!-- {name} -->\n<cycles>\n<mesh\n')
+    write_attribute("P", "%g %g %g", points)
+    write_attribute("verts", "%d %d %d", facets)
+    write_attribute("nverts", "%d", np.full((len(facets), 1), 3))
+    if vnormals is not None:
+        write_attribute("N", "%g %g %g", vnormals)
+    if uvs is not None:
+        write_attribute("UV", "%g %g", uvs, index=corners)
+    if tspaces is not None:
+        tangents, signs = tspaces
+        write_attribute("tangent", "%g %g %g", tangents, index=corners)
+        signs = np.reshape(signs, (-1, 1))
+        write_attribute("tangent_sign", "%g", signs, sep=" ", index=corners)
+    file.write("/>\n</cycles>\n")
+
+
+def _write_pov_np(file, name, points, facets, vnormals=None, uvs=None):
+    """Write a mesh to a Povray file (mesh2 statement) - numpy version.
+
+    Args:
+        file -- the file to write to (text file object)
+        name -- the mesh name (str)
+        points -- the points (numpy array, shape (n, 3))
+        facets -- the facets (numpy array, shape (m, 3))
+        vnormals -- the vertex normals (numpy array, shape (n, 3)) or None
+        uvs -- the uv, by point (numpy array, shape (n, 2)) or None
+    """
+    sep = "\n        "
+
+    def write_vectors(statement, fmt, array):
+        """Write a list of vectors, in an optional mesh2 statement."""
+        file.write(f"        {statement} {{\n            {len(array)},")
+        file.write("\n            ")
+        _write_joined_rows(file, fmt, array, sep)
+        file.write("\n        }")
+
+    file.write(
+        "// Generated by FreeCAD-Render\n"
+        f"// Declares object '{name}'\n"
+        f"#declare {name} = mesh2 {{\n"
+        f"    vertex_vectors {{\n        {len(points)},\n        "
+    )
+    _write_joined_rows(file, "<%g,%g,%g>", points, sep)
+    file.write("\n    }\n")
+    if vnormals is not None:
+        write_vectors("normal_vectors", "<%g,%g,%g>", vnormals)
+    file.write("\n")
+    if uvs is not None:
+        write_vectors("uv_vectors", "<%g,%g>", uvs)
+    file.write(f"\n    face_indices {{\n        {len(facets)},\n        ")
+    _write_joined_rows(file, "<%d,%d,%d>", facets, sep)
+    file.write(f"\n    }}\n}}  // {name}\n")
+
+
 def multiprocessing_enabled(mesh):
     """Check if multiprocessing can be enabled."""
     conditions = (
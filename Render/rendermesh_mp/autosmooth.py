@@ -50,6 +50,7 @@ except ModuleNotFoundError:
 sys.path.insert(0, os.path.dirname(__file__))
 # pylint: disable=wrong-import-position
 import vector3d
+import workerpool
 from vector3d import (
     fmul,
     angles,
@@ -585,6 +586,7 @@ def normalize_np(chunk):
 def init(shared):
     """Initialize pool of processes."""
     gc.disable()
+    getnormal.cache_clear()  # Workers may be reused from a previous job
 
     # pylint: disable=global-variable-undefined
     global SHARED_POINTS
@@ -799,23 +801,27 @@ def main(
             "areas": areas,
             "split_angle": split_angle,
             # max 3 adjacents/facet
-            "adjacency": ctx.RawArray("l", count_facets * 3),
-            "adjacency2": ctx.RawArray("l", count_facets * 3 * 2),  # 2nd pass
-            "tags": ctx.RawArray("l", count_facets),
-            "current_tag": ctx.Value("l", 0),
-            "current_adj": ctx.Value("l", 0),
+            "adjacency": workerpool.RawArray("l", count_facets * 3),
+            # 2nd pass
+            "adjacency2": workerpool.RawArray("l", count_facets * 3 * 2),
+            "tags": workerpool.RawArray("l", count_facets),
+            "current_tag": workerpool.Value("l", 0),
+            "current_adj": workerpool.Value("l", 0),
             "enable_numpy": enable_numpy,
-            "points_shm_name": ctx.RawArray("b", 256),
-            "points_shm_size": ctx.RawValue("l", 0),
-            "vnormals_shm_name": ctx.RawArray("b", 256),
-            "vnormals_shm_size": ctx.RawValue("l", 0),
+            "points_shm_name": workerpool.RawArray("b", 256),
+            "points_shm_size": workerpool.RawValue("l", 0),
+            "vnormals_shm_name": workerpool.RawArray("b", 256),
+            "vnormals_shm_size": workerpool.RawValue("l", 0),
         }
         if use_numpy:
-            shared["hashes"] = ctx.RawArray("q", count_facets * 3)
-            shared["hashes_indices"] = ctx.RawArray("q", count_facets * 3)
-            shared["pairs_shm_name"] = ctx.RawArray("b", 256)
+            shared["hashes"] = workerpool.RawArray("q", count_facets * 3)
+            shared["hashes_indices"] = workerpool.RawArray(
+                "q", count_facets * 3
+            )
+            shared["pairs_shm_name"] = workerpool.RawArray("b", 256)
         del points, facets, normals, areas
         facets_shm = points_shm = vnormals_shm = uvmap_shm = None
+        handed_over = ()
         tick("prepare shared")
 
         def shm_set_name(key, name):
@@ -826,7 +832,7 @@ def main(
         def shm_set_size(key, size):
             shared[key].value = size
 
-        with ctx.Pool(nproc, init, (shared,)) as pool:
+        with workerpool.open_pool(ctx, nproc, init, (shared,)) as pool:
             tick("start pool")
 
             # Compute adjacency
@@ -1063,6 +1069,8 @@ def main(
             connection.send(output)
             connection.recv()
             output = None
+            # Output buffers now belong to the client, which will unlink them
+            handed_over = (points_shm, facets_shm, vnormals_shm, uvmap_shm)
             tick("exchange data")
 
             # input("Press Enter to continue...")  # Debug
@@ -1074,7 +1082,10 @@ def main(
         raise exc
     finally:
         for shm in (facets_shm, points_shm, vnormals_shm, uvmap_shm):
-            close_shm(shm)
+            if shm and shm in handed_over:
+                shm.close()
+            else:
+                close_shm(shm)
         tick("close output buffers")
         os.chdir(save_dir)
         sys.stdin = save_stdin
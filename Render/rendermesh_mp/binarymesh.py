@@ -0,0 +1,107 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Helpers to write appleseed 'binarymesh' files.
+
+A binarymesh file is made of a signature, a format version and a sequence
+of meshes. Each mesh holds a name, vertices, vertex normals, texture
+coordinates, material slots and faces. All values are little endian;
+coordinates are stored as doubles, indices as 32-bit unsigned integers.
+
+Here, only the uncompressed flavour of the format (version 1) is written,
+with one mesh per file and one material slot ('default').
+"""
+
+import struct
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    pass
+
+SIGNATURE = b"BINARYMESH"
+VERSION = 1  # Uncompressed
+SLOT = "default"
+NO_INDEX = 0xFFFFFFFF  # Index for missing normal/texture coordinates
+
+COUNT = struct.Struct("<I")
+FACE = struct.Struct("<H3I3I3IH")
+
+
+def pack_string(string):
+    """Pack a string (length-prefixed utf-8)."""
+    string = string.encode("utf-8")
+    return struct.pack("<H", len(string)) + string
+
+
+def header(name):
+    """Compute file header, up to the mesh name (included)."""
+    return SIGNATURE + struct.pack("<H", VERSION) + pack_string(name)
+
+
+def material_slots():
+    """Compute material slots section."""
+    return struct.pack("<H", 1) + pack_string(SLOT)
+
+
+def write_np(file, name, points, facets, vnormals=None, uvs=None):
+    """Write a mesh to a binarymesh file - numpy version.
+
+    Args:
+        file -- the file to write to (binary file object)
+        name -- the mesh name (str)
+        points -- the points (numpy array, shape (n, 3))
+        facets -- the facets (numpy array, shape (m, 3))
+        vnormals -- the vertex normals, one per point (numpy array, shape
+          (n, 3)) or None
+        uvs -- the texture coordinates, one per point (numpy array, shape
+          (n, 2)) or None
+    """
+    file.write(header(name))
+
+    # Vertices, vertex normals and texture coordinates
+    for values in (points, vnormals, uvs):
+        if values is None:
+            file.write(COUNT.pack(0))
+            continue
+        file.write(COUNT.pack(len(values)))
+        np.ascontiguousarray(values, dtype="<f8").tofile(file)
+
+    # Material slots
+    file.write(material_slots())
+
+    # Faces
+    dtype = [
+        ("count", "<u2"),
+        ("vertices", "<u4", (3,)),
+        ("normals", "<u4", (3,)),
+        ("uvs", "<u4", (3,)),
+        ("material", "<u2"),
+    ]
+    faces = np.empty(len(facets), dtype=dtype)
+    faces["count"] = 3
+    faces["vertices"] = facets
+    faces["normals"] = facets if vnormals is not None else NO_INDEX
+    faces["uvs"] = facets if uvs is not None else NO_INDEX
+    faces["material"] = 0
+    file.write(COUNT.pack(len(faces)))
+    faces.tofile(file)
@@ -0,0 +1,251 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Vertex clustering helpers, for mesh decimation (Numpy).
+
+Vertices are clustered in a regular grid, and each cluster is replaced by a
+single vertex, which minimizes the quadric error of the facets around
+(Lindstrom, "Out-of-core simplification of large polygonal models", 2000).
+Vertices lying on sharp edges or on boundaries are clustered apart from the
+others, so that sharp edges and boundaries are kept.
+
+These helpers are used both by RenderMesh Numpy mixin and by multiprocessing
+script (decimate.py).
+"""
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    pass
+
+
+# Eigenvalues below this ratio of the largest one are ignored when solving
+# quadrics (flat or straight clusters)
+EIGEN_THRESHOLD = 1e-3
+
+
+def feature_points(facets, normals, split_angle, count_points):
+    """Find points lying on sharp edges or on boundaries.
+
+    Args:
+        facets -- the facets (n, 3) int array
+        normals -- the facet normals (n, 3) float array
+        split_angle -- the angle that defines sharp edges (radians)
+        count_points -- the number of points
+
+    Returns:
+        A boolean array, True for feature points
+    """
+    edges = np.sort(facets[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    keys = edges[:, 0] * count_points + edges[:, 1]
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    facet_indices = order // 3
+
+    # Edges shared by exactly 2 facets with small dihedral angle are smooth.
+    # Other edges (boundaries, sharp, non-manifold) are features
+    _, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    pair_starts = starts[counts == 2]
+    dots = np.einsum(
+        "ij,ij->i",
+        normals[facet_indices[pair_starts]],
+        normals[facet_indices[pair_starts + 1]],
+    )
+    sharp_starts = pair_starts[dots < np.cos(split_angle)]
+    feature_edges = np.concatenate((starts[counts != 2], sharp_starts))
+
+    feature = np.zeros(count_points, dtype=bool)
+    feature[edges[order[feature_edges]].ravel()] = True
+    return feature
+
+
+def cluster_points(points, cell_size, feature):
+    """Cluster points in a regular grid.
+
+    Feature points are clustered apart from the others.
+
+    Returns:
+        Cluster indices of points (int array), cluster count
+    """
+    cells = np.floor((points - points.min(axis=0)) / cell_size)
+    keys = np.column_stack((cells.astype(np.int64), feature))
+    _, clusters = np.unique(keys, axis=0, return_inverse=True)
+    clusters = clusters.reshape(-1)
+    return clusters, int(clusters.max()) + 1 if len(clusters) else 0
+
+
+def facet_quadrics(points, facets, normals, areas):
+    """Compute area-weighted plane quadrics of facets.
+
+    The quadric of plane n.x + d = 0 is (A, b, c) = (n.nT, d.n, d^2). It is
+    stored as 10 coefficients: A (6, upper triangle), b (3), c (1).
+
+    Returns:
+        The quadrics, as a (n, 10) float array
+    """
+    normals = normals.astype(np.float64)
+    origins = points[facets[:, 0]].astype(np.float64)
+    dist = -np.einsum("ij,ij->i", normals, origins)
+    n_x, n_y, n_z = normals.T
+    quadrics = np.column_stack(
+        (
+            n_x * n_x,
+            n_x * n_y,
+            n_x * n_z,
+            n_y * n_y,
+            n_y * n_z,
+            n_z * n_z,
+            dist * n_x,
+            dist * n_y,
+            dist * n_z,
+            dist * dist,
+        )
+    )
+    return quadrics * np.asarray(areas)[:, np.newaxis]
+
+
+def sum_quadrics(clusters, count, facets, quadrics):
+    """Sum facet quadrics by cluster.
+
+    Each facet quadric is added to the clusters of its 3 vertices.
+
+    Returns:
+        The quadrics of clusters, as a (count, 10) float array
+    """
+    indices = clusters[facets].ravel()
+    return np.column_stack(
+        [
+            np.bincount(indices, np.repeat(quadrics[:, k], 3), count)
+            for k in range(10)
+        ]
+    )
+
+
+def cluster_positions(points, clusters, count, quadrics, max_offset):
+    """Compute cluster positions, minimizing quadric errors.
+
+    Quadrics are solved around cluster centroids, ignoring small
+    eigenvalues. If the solution is further than 'max_offset' from the
+    centroid, the centroid is kept.
+
+    Args:
+        points -- the points (n, 3) float array
+        clusters -- the cluster indices of points (n) int array
+        count -- the cluster count
+        quadrics -- the quadrics of clusters (see sum_quadrics)
+        max_offset -- the maximum distance from centroid
+
+    Returns:
+        The positions, as a (count, 3) float array
+    """
+    weights = np.bincount(clusters, minlength=count)
+    centroids = np.column_stack(
+        [np.bincount(clusters, points[:, i], count) for i in range(3)]
+    )
+    centroids /= weights[:, np.newaxis]
+
+    # x = c + V.diag(1/eigvals).VT.(-b - A.c)
+    mat_a = quadrics[:, [0, 1, 2, 1, 3, 4, 2, 4, 5]].reshape(-1, 3, 3)
+    vec_b = quadrics[:, 6:9]
+    eigvals, eigvecs = np.linalg.eigh(mat_a)
+    threshold = eigvals[:, 2:3] * EIGEN_THRESHOLD
+    valid = (eigvals > threshold) & (eigvals > 0.0)
+    inverses = np.divide(1.0, eigvals, out=np.zeros_like(eigvals), where=valid)
+    rhs = -vec_b - np.einsum("nij,nj->ni", mat_a, centroids)
+    proj = np.einsum("nji,nj->ni", eigvecs, rhs) * inverses
+    offsets = np.einsum("nij,nj->ni", eigvecs, proj)
+
+    too_far = np.linalg.norm(offsets, axis=1) > max_offset
+    offsets[too_far] = 0.0
+    return centroids + offsets
+
+
+def rebuild_facets(clusters, facets):
+    """Rebuild facets on clusters.
+
+    Degenerated and duplicated facets are removed, and so are unused
+    clusters.
+
+    Returns:
+        The indices of used clusters, the new facets
+    """
+    facets = clusters[facets]
+    valid = (
+        (facets[:, 0] != facets[:, 1])
+        & (facets[:, 1] != facets[:, 2])
+        & (facets[:, 2] != facets[:, 0])
+    )
+    facets = facets[valid]
+    _, index = np.unique(np.sort(facets, axis=1), axis=0, return_index=True)
+    facets = facets[np.sort(index)]
+    used, facets = np.unique(facets, return_inverse=True)
+    return used, facets.reshape(-1, 3)
+
+
+def normals_and_areas(points, facets):
+    """Compute facet normals and areas.
+
+    Facets with null area are removed.
+
+    Returns:
+        The facets, the normals, the areas
+    """
+    vec1 = points[facets[..., 1]] - points[facets[..., 0]]
+    vec2 = points[facets[..., 2]] - points[facets[..., 0]]
+    cross = np.cross(vec1, vec2)
+    cross_norms = np.linalg.norm(cross, axis=1)
+    notnull = cross_norms != 0.0
+    facets = facets[notnull]
+    cross = cross[notnull]
+    cross_norms = cross_norms[notnull]
+    normals = cross / cross_norms[:, np.newaxis]
+    return facets, normals, cross_norms / 2
+
+
+def decimate(points, facets, normals, areas, cell_size, split_angle):
+    """Decimate a mesh, by vertex clustering.
+
+    Args:
+        points -- the points (n, 3) float array
+        facets -- the facets (m, 3) int array
+        normals -- the facet normals (m, 3) float array
+        areas -- the facet areas (m) float array
+        cell_size -- the size of clustering grid cells
+        split_angle -- the angle that defines sharp edges (radians)
+
+    Returns:
+        The new points, facets, normals and areas
+    """
+    points = np.asarray(points, dtype=np.float64)
+    feature = feature_points(facets, normals, split_angle, len(points))
+    clusters, count = cluster_points(points, cell_size, feature)
+    quadrics = facet_quadrics(points, facets, normals, areas)
+    quadrics = sum_quadrics(clusters, count, facets, quadrics)
+    positions = cluster_positions(
+        points, clusters, count, quadrics, cell_size * np.sqrt(3)
+    )
+    used, new_facets = rebuild_facets(clusters, facets)
+    new_points = positions[used]
+    new_facets, new_normals, new_areas = normals_and_areas(
+        new_points, new_facets
+    )
+    return new_points, new_facets, new_normals, new_areas
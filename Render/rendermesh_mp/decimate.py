@@ -0,0 +1,269 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Script for mesh decimation (vertex clustering) in multiprocessing mode.
+
+Facet quadrics are computed and summed by chunks, in the pool of processes.
+Other steps are vectorized in main process. See clustering.py for the
+algorithm.
+
+This script requires Numpy.
+"""
+
+import sys
+import os
+from multiprocessing import shared_memory
+import multiprocessing as mp
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+# pylint: disable=wrong-import-position
+import workerpool
+import clustering
+
+NSHM = 0  # Counter on shared_memory objects, for naming purpose
+
+
+def create_shm(obj):
+    """Create a SharedMemory object, initialized with the argument.
+
+    The argument must support buffer protocol.
+    """
+    global NSHM  # pylint: disable=global-statement
+    memv = memoryview(obj).cast("B")
+    name = f"rdr{mp.current_process().pid}_decimate{NSHM}"
+    NSHM += 1
+    size = memv.nbytes
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    shm.buf[:size] = memv
+    return shm
+
+
+# *****************************************************************************
+
+
+def init(shared):
+    """Initialize pool of processes."""
+    # pylint: disable=global-variable-undefined
+    global SHARED_POINTS
+    SHARED_POINTS = np.ctypeslib.as_array(shared["points"]).reshape(-1, 3)
+
+    global SHARED_FACETS
+    SHARED_FACETS = np.ctypeslib.as_array(shared["facets"]).reshape(-1, 3)
+
+    global SHARED_NORMALS
+    SHARED_NORMALS = np.ctypeslib.as_array(shared["normals"]).reshape(-1, 3)
+
+    global SHARED_AREAS
+    SHARED_AREAS = np.ctypeslib.as_array(shared["areas"])
+
+    global SHARED_CLUSTERS
+    SHARED_CLUSTERS = np.ctypeslib.as_array(shared["clusters"])
+
+
+def compute_quadrics(chunk):
+    """Compute quadrics of a chunk of facets, summed by cluster.
+
+    Returns:
+        The indices of the clusters of the chunk, and their quadrics
+    """
+    start, stop = chunk
+    facets = SHARED_FACETS[start:stop]
+    quadrics = clustering.facet_quadrics(
+        SHARED_POINTS,
+        facets,
+        SHARED_NORMALS[start:stop],
+        SHARED_AREAS[start:stop],
+    )
+    used, local_facets = np.unique(
+        SHARED_CLUSTERS[facets], return_inverse=True
+    )
+    local_facets = local_facets.reshape(-1, 3)
+    count = len(used)
+    sums = clustering.sum_quadrics(
+        np.arange(count), count, local_facets, quadrics
+    )
+    return used, sums
+
+
+# *****************************************************************************
+
+
+# pylint: disable=too-many-arguments
+def main(
+    python,
+    points,
+    facets,
+    normals,
+    areas,
+    cell_size,
+    split_angle,
+    showtime,
+    connection,
+):
+    """Entry point for __main__.
+
+    This code executes in main process.
+    Keeping this code out of global scope makes all local objects to be freed
+    at the end of the function and thus avoid memory leaks.
+    """
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=too-many-locals
+    import time
+
+    tm0 = time.time()
+    if showtime:
+        msg = (
+            "\nDECIMATE\n"
+            f"{len(points) // 3} points, {len(facets) // 3} facets, "
+            f"cell size {cell_size}"
+        )
+        print(msg)
+
+    def tick(msg=""):
+        """Print the time (debug purpose)."""
+        if showtime:
+            print(msg, time.time() - tm0)
+
+    def make_chunks(chunk_size, length):
+        return (
+            (i, min(i + chunk_size, length))
+            for i in range(0, length, chunk_size)
+        )
+
+    # Set working directory
+    save_dir = os.getcwd()
+    os.chdir(os.path.dirname(__file__))
+
+    # Set stdin
+    save_stdin = sys.stdin
+    sys.stdin = sys.__stdin__
+
+    # Set executable
+    ctx = mp.get_context("spawn")
+    ctx.set_executable(python)
+
+    chunk_size = 20000
+    nproc = os.cpu_count()
+
+    outputs = []
+    handed_over = False
+
+    try:
+        np_points = np.ctypeslib.as_array(points).reshape(-1, 3)
+        np_points = np_points.astype(np.float64)
+        np_facets = np.ctypeslib.as_array(facets).reshape(-1, 3)
+        np_normals = np.ctypeslib.as_array(normals).reshape(-1, 3)
+        count_points = len(np_points)
+        count_facets = len(np_facets)
+
+        # Clusters
+        feature = clustering.feature_points(
+            np_facets, np_normals, split_angle, count_points
+        )
+        clusters, count = clustering.cluster_points(
+            np_points, cell_size, feature
+        )
+        tick(f"clusters ({count})")
+
+        # Quadrics (mp)
+        shared = {
+            "points": points,
+            "facets": facets,
+            "normals": normals,
+            "areas": areas,
+            "clusters": workerpool.RawArray("l", count_points),
+        }
+        np.ctypeslib.as_array(shared["clusters"])[:] = clusters
+        quadrics = np.zeros((count, 10))
+        with workerpool.open_pool(ctx, nproc, init, (shared,)) as pool:
+            tick("start pool")
+            chunks = make_chunks(chunk_size, count_facets)
+            for used, sums in pool.imap_unordered(compute_quadrics, chunks):
+                quadrics[used] += sums
+        tick("quadrics (mp)")
+
+        # Positions and facets
+        positions = clustering.cluster_positions(
+            np_points, clusters, count, quadrics, cell_size * np.sqrt(3)
+        )
+        used, new_facets = clustering.rebuild_facets(clusters, np_facets)
+        new_points = positions[used]
+        new_facets, new_normals, new_areas = clustering.normals_and_areas(
+            new_points, new_facets
+        )
+        tick(f"rebuild ({len(new_facets)} facets)")
+
+        # We build the output
+        # We have to pass the requested size, as the OS may round
+        # the shared memory block to whole pages
+        outputs = [
+            create_shm(np.ascontiguousarray(array, dtype=typecode))
+            for array, typecode in (
+                (new_points, "f"),
+                (new_facets, "l"),
+                (new_normals, "f"),
+                (new_areas, "f"),
+            )
+        ]
+        connection.send([(shm.name, shm.size) for shm in outputs])
+        connection.recv()
+        # Output buffers now belong to the client, which will unlink them
+        handed_over = True
+        tick("exchange data")
+
+    finally:
+        for shm in outputs:
+            shm.close()
+            if not handed_over:
+                shm.unlink()
+        os.chdir(save_dir)
+        sys.stdin = save_stdin
+
+
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # pylint: disable=used-before-assignment
+    main(
+        PYTHON,
+        POINTS,
+        FACETS,
+        NORMALS,
+        AREAS,
+        CELL_SIZE,
+        SPLIT_ANGLE,
+        SHOWTIME,
+        CONNECTION,
+    )
+
+    # Clean (remove references to foreign objects)
+    PYTHON = None
+    POINTS = None
+    FACETS = None
+    NORMALS = None
+    AREAS = None
+    CELL_SIZE = None
+    SPLIT_ANGLE = None
+    SHOWTIME = None
+    CONNECTION = None
@@ -0,0 +1,127 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Helpers to write binary glTF (GLB) files.
+
+A GLB file is made of a 12-byte header, followed by a JSON chunk (the glTF
+document) and a BIN chunk (the binary buffer). Here, a single mesh is
+written, with a single primitive: each attribute (points, normals, uv) and
+the indices are stored as a separate buffer view of the binary buffer.
+
+All data are expected in little endian 32-bit components (float or unsigned
+int), so that buffer views are naturally aligned.
+"""
+
+import json
+import struct
+
+MAGIC = 0x46546C67  # 'glTF'
+VERSION = 2
+CHUNK_JSON = 0x4E4F534A  # 'JSON'
+CHUNK_BIN = 0x004E4942  # 'BIN'
+
+COMPONENT_FLOAT = 5126
+COMPONENT_UINT = 5125
+TARGET_ARRAY_BUFFER = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+MODE_TRIANGLES = 4
+
+# Semantic: (component type, accessor type, buffer view target)
+ACCESSORS = {
+    "POSITION": (COMPONENT_FLOAT, "VEC3", TARGET_ARRAY_BUFFER),
+    "NORMAL": (COMPONENT_FLOAT, "VEC3", TARGET_ARRAY_BUFFER),
+    "TEXCOORD_0": (COMPONENT_FLOAT, "VEC2", TARGET_ARRAY_BUFFER),
+    "indices": (COMPONENT_UINT, "SCALAR", TARGET_ELEMENT_ARRAY_BUFFER),
+}
+
+
+def write(file, name, sections, bounds, material=None):
+    """Write a mesh to a GLB file.
+
+    Args:
+        file -- the file to write to (binary file object)
+        name -- the mesh name (str)
+        sections -- the data to write, as a list of (semantic, count, data)
+          tuples, where semantic is a key of ACCESSORS, count is the number
+          of elements and data is a bytes-like object
+        bounds -- the bounds of the points, as a (min, max) tuple of
+          3-uples (required by glTF for POSITION)
+        material -- a glTF material (dict) to assign to the mesh, or None
+    """
+    views, accessors = [], []
+    primitive = {"attributes": {}, "mode": MODE_TRIANGLES}
+    offset = 0
+    for index, (semantic, count, data) in enumerate(sections):
+        length = memoryview(data).nbytes
+        component, accessor_type, target = ACCESSORS[semantic]
+        views.append(
+            {
+                "buffer": 0,
+                "byteOffset": offset,
+                "byteLength": length,
+                "target": target,
+            }
+        )
+        accessor = {
+            "bufferView": index,
+            "componentType": component,
+            "count": count,
+            "type": accessor_type,
+        }
+        if semantic == "POSITION":
+            accessor["min"], accessor["max"] = (list(b) for b in bounds)
+        accessors.append(accessor)
+        if semantic == "indices":
+            primitive["indices"] = index
+        else:
+            primitive["attributes"][semantic] = index
+        offset += length
+
+    # Document
+    document = {
+        "asset": {"version": "2.0", "generator": "FreeCAD-Render"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"name": name, "mesh": 0}],
+        "meshes": [{"name": name, "primitives": [primitive]}],
+        "accessors": accessors,
+        "bufferViews": views,
+        "buffers": [{"byteLength": offset}],
+    }
+    if material is not None:
+        document["materials"] = [material]
+        primitive["material"] = 0
+
+    # Chunks (JSON chunk is padded with spaces, BIN chunk with zeros)
+    document = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    document += b" " * (-len(document) % 4)
+    padding = b"\x00" * (-offset % 4)
+    total = 12 + 8 + len(document) + 8 + offset + len(padding)
+
+    # Write
+    file.write(struct.pack("<3I", MAGIC, VERSION, total))
+    file.write(struct.pack("<2I", len(document), CHUNK_JSON))
+    file.write(document)
+    file.write(struct.pack("<2I", offset + len(padding), CHUNK_BIN))
+    for _, _, data in sections:
+        file.write(data)
+    file.write(padding)
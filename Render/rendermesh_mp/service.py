@@ -0,0 +1,149 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Long-lived service running multiprocessing scripts.
+
+This script is run once in a dedicated process, and then executes
+multiprocessing scripts (autosmooth, uvmap_cube, writeobj...) on request,
+with a persistent pool of workers. It thus saves the cost of starting a new
+process, and a new pool of processes, for each mesh.
+
+Requests are received on CONNECTION:
+- ("ping",): health check. Answer: ("pong", worker pool status)
+- ("run", script, arguments): run 'script' main function with 'arguments'.
+  Shared memory arguments are given as descriptors (see 'decode').
+  Answer: ("done", None) or ("error", traceback)
+- ("stop",): stop the service
+
+The service stops by itself after IDLE_TIMEOUT seconds without request.
+"""
+
+import sys
+import os
+import importlib
+import inspect
+import traceback
+
+sys.path.insert(0, os.path.dirname(__file__))
+# pylint: disable=wrong-import-position
+import workerpool
+
+
+class ScriptConnection:
+    """A connection for scripts, tunneled into service connection."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def send(self, obj):
+        """Send an output message to client."""
+        self._connection.send(("output", obj))
+
+    def recv(self):
+        """Receive a message from client."""
+        return self._connection.recv()
+
+
+def decode(argument):
+    """Decode an argument received from client.
+
+    Shared memory objects are given as descriptors:
+    - ("array", name, typecode, length)
+    - ("value", name, typecode)
+    """
+    if isinstance(argument, tuple) and argument:
+        if argument[0] == "array":
+            return workerpool.attach_array(*argument[1:])
+        if argument[0] == "value":
+            return workerpool.attach_value(*argument[1:])
+    return argument
+
+
+def run(connection, script, arguments):
+    """Run a script main function."""
+    module = importlib.import_module(script)
+    parameters = inspect.signature(module.main).parameters
+    kwargs = {
+        key.lower(): decode(value)
+        for key, value in arguments.items()
+        if key.lower() in parameters
+    }
+    if "connection" in parameters:
+        kwargs["connection"] = ScriptConnection(connection)
+    try:
+        module.main(**kwargs)
+    finally:
+        kwargs = None
+
+
+def main(python, connection, processes, idle_timeout):
+    """Entry point for __main__.
+
+    This code executes in service process.
+    """
+    # pylint: disable=import-outside-toplevel
+    import multiprocessing as mp
+
+    os.chdir(os.path.dirname(__file__))
+    sys.stdin = sys.__stdin__
+
+    ctx = mp.get_context("spawn")
+    ctx.set_executable(python)
+    workerpool.start(ctx, processes)
+
+    try:
+        while connection.poll(idle_timeout):
+            try:
+                command, *args = connection.recv()
+            except EOFError:
+                # Client is gone
+                break
+
+            if command == "stop":
+                break
+
+            if command == "ping":
+                connection.send(("pong", workerpool.check(*args)))
+                continue
+
+            if command == "run":
+                try:
+                    run(connection, *args)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    connection.send(("error", traceback.format_exc()))
+                else:
+                    connection.send(("done", None))
+    finally:
+        workerpool.stop()
+
+
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # pylint: disable=used-before-assignment
+    main(PYTHON, CONNECTION, PROCESSES, IDLE_TIMEOUT)
+
+    # Clean
+    PYTHON = None
+    CONNECTION = None
+    PROCESSES = None
+    IDLE_TIMEOUT = None
@@ -0,0 +1,171 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Headless FreeCAD worker meshing shapes for scene export.
+
+This script is run in a dedicated process (see Render/exportengine.py). It
+imports FreeCAD in console mode, and then meshes shapes on request.
+
+Requests are received on CONNECTION:
+- ("mesh", brep, linear_deflection, angular_deflection, path): mesh the shape
+  serialized in 'brep' (BREP string) and write the mesh to 'path' (FreeCAD
+  binary mesh format). Answer: ("done", None) or ("error", traceback)
+- ("render", key, source, options, path, inline_below): build a RenderMesh
+  (post-processing included: decimation, uv map, autosmooth...) from
+  'source', which is either ("brep", brep, linear_deflection,
+  angular_deflection) or ("mesh", mesh_path). 'options' are passed to
+  'create_rendermesh'. If the mesh has less than 'inline_below' facets, its
+  internals are written to 'path' and the mesh is dropped; otherwise the mesh
+  is kept under 'key', for subsequent writes. Answer: ("done", summary) or
+  ("error", traceback), where summary is a dict with 'inline',
+  'count_points', 'count_facets', 'uvmap' and 'vnormals' keys
+- ("write", key, ratio, args, kwargs): write a file from the mesh kept under
+  'key', with points scaled by 'ratio' (see RenderMesh._write_file_helper
+  for 'args' and 'kwargs'). Answer: ("done", None) or ("error", traceback)
+- ("release", keys): drop the meshes kept under 'keys'. No answer
+- ("stop",): stop the worker
+
+Startup is acknowledged by ("ready", render), where 'render' tells whether
+"render" requests are supported (Render modules can be imported), or
+("error", traceback) if FreeCAD cannot be imported.
+"""
+
+import os
+import sys
+import types
+import traceback
+
+
+def import_rendermesh():
+    """Import Render.rendermesh module, without workbench initialization.
+
+    Render package '__init__' initializes the whole workbench (documents
+    objects, commands...), which is neither needed nor desirable here: a
+    bare package is registered instead.
+
+    Returns:
+        the module, or None if it cannot be imported
+    """
+    # pylint: disable=import-outside-toplevel
+    if "Render" not in sys.modules:
+        package = types.ModuleType("Render")
+        package.__path__ = [os.path.dirname(os.path.dirname(__file__))]
+        sys.modules["Render"] = package
+    try:
+        from Render import rendermesh
+    except Exception:  # pylint: disable=broad-exception-caught
+        return None
+    return rendermesh
+
+
+def main(connection, syspath):
+    """Entry point."""
+    # Import FreeCAD (console mode)
+    try:
+        sys.path.extend(p for p in syspath if p not in sys.path)
+        # pylint: disable=import-outside-toplevel
+        import FreeCAD  # noqa: F401
+        import Part
+        import Mesh
+        import MeshPart
+    except Exception:  # pylint: disable=broad-exception-caught
+        connection.send(("error", traceback.format_exc()))
+        return
+    rendermesh = import_rendermesh()
+    connection.send(("ready", rendermesh is not None))
+
+    def mesh_shape(brep, linear_deflection, angular_deflection):
+        shape = Part.Shape()
+        shape.importBrepFromString(brep)
+        return MeshPart.meshFromShape(
+            Shape=shape,
+            LinearDeflection=linear_deflection,
+            AngularDeflection=angular_deflection,
+            Relative=False,
+        )
+
+    def mesh(brep, linear_deflection, angular_deflection, path):
+        mesh_shape(brep, linear_deflection, angular_deflection).write(path)
+
+    meshes = {}  # Meshes kept for writing (key: (mesh, ratio))
+
+    def render(key, source, options, path, inline_below):
+        if source[0] == "brep":
+            mesh = mesh_shape(*source[1:])
+        else:
+            mesh = Mesh.Mesh(source[1])
+        rmesh = rendermesh.create_rendermesh(
+            mesh, **options, multiprocessing=False
+        )
+        summary = {
+            "inline": False,
+            "count_points": rmesh.count_points,
+            "count_facets": rmesh.count_facets,
+            "uvmap": rmesh.has_uvmap(),
+            "vnormals": rmesh.has_vnormals(),
+        }
+        if rmesh.count_facets < inline_below and hasattr(
+            rmesh, "save_internals"
+        ):
+            rmesh.save_internals(path)
+            summary["inline"] = True
+        elif rmesh.count_facets:
+            meshes[key] = (rmesh, 1.0)
+        return summary
+
+    def write(key, ratio, args, kwargs):
+        rmesh, current_ratio = meshes[key]
+        if ratio != current_ratio:
+            # pylint: disable=protected-access
+            rmesh._scale_points(ratio / current_ratio)
+            meshes[key] = (rmesh, ratio)
+        rmesh._write_file_helper(*args, kwargs)
+
+    # Process requests
+    functions = {"mesh": mesh, "render": render, "write": write}
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        command, *args = request
+        if command == "release":
+            for key in args[0]:
+                meshes.pop(key, None)
+            continue
+        if (function := functions.get(command)) is None:
+            break
+        try:
+            result = function(*args)
+        except Exception:  # pylint: disable=broad-exception-caught
+            connection.send(("error", traceback.format_exc()))
+        else:
+            connection.send(("done", result))
+
+
+if __name__ == "__main__":
+    # pylint: disable=used-before-assignment
+    main(CONNECTION, SYSPATH)
+
+    # Clean (remove references to foreign objects)
+    CONNECTION.close()
+    CONNECTION = None
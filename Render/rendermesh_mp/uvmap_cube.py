@@ -37,6 +37,7 @@ except ModuleNotFoundError:
 
 sys.path.insert(0, os.path.dirname(__file__))
 # pylint: disable=wrong-import-position
+import workerpool
 from vector3d import (
     sub,
     add_n,
@@ -538,15 +539,15 @@ def main(
             "facets": facets,
             "normals": normals,
             "areas": areas,
-            "cog": ctx.RawArray("f", 3),
-            "facet_colors": ctx.RawArray("B", count_facets),
-            "colored_points": ctx.RawArray("L", count_points * 2 * 6),
-            "colored_points_len": ctx.RawValue("l"),
-            "uvmap": ctx.RawArray("f", count_points * 2 * 6),
+            "cog": workerpool.RawArray("f", 3),
+            "facet_colors": workerpool.RawArray("B", count_facets),
+            "colored_points": workerpool.RawArray("L", count_points * 2 * 6),
+            "colored_points_len": workerpool.RawValue("l"),
+            "uvmap": workerpool.RawArray("f", count_points * 2 * 6),
             "enable_numpy": enable_numpy,
         }
         tick("prepare shared")
-        with ctx.Pool(nproc, init, (shared,)) as pool:
+        with workerpool.open_pool(ctx, nproc, init, (shared,)) as pool:
             tick("start pool")
             chunks = make_chunks(chunk_size, count_facets)
             data = pool.imap_unordered(colorize, chunks)
@@ -594,7 +595,8 @@ def main(
             tick("new point list")
     except Exception as exc:
         print(traceback.format_exc())
-        input("Press Enter to continue...")
+        if not sys.stdin.closed:
+            input("Press Enter to continue...")
         raise exc
     finally:
         os.chdir(save_dir)
@@ -0,0 +1,514 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Script for spherical uvmap computation in multiprocessing mode."""
+
+# pylint: disable=possibly-used-before-assignment
+
+import sys
+import os
+import traceback
+from math import atan2, asin, hypot, pi
+
+try:
+    import numpy as np
+
+    USE_NUMPY = True
+except ModuleNotFoundError:
+    USE_NUMPY = False
+
+sys.path.insert(0, os.path.dirname(__file__))
+# pylint: disable=wrong-import-position
+import workerpool
+from vector3d import (
+    add_n,
+    barycenter,
+    fdiv,
+    fmul,
+    sub,
+)
+
+# Vocabulary:
+# Point: a 3-tuple of float designing a point in 3D
+# Facet: a 3-tuple of indices (integer) pointing to 3 points in a point list
+# Triangle: a 3-tuple of points (see above)
+# Mesh: a pair (point list, facet list)
+# Color: an integer associated to a facet/triangle, in order to separate
+#   submeshes:
+#   0: facets not on seam (regular)
+#   1: facets on seam (seam)
+# Chunk: a sliced sublist, to be processed in parallel way
+
+COLOR_COUNT = 2
+
+
+# *****************************************************************************
+
+
+def getpoint(idx):
+    """Get a point from its index in the shared memory."""
+    idx *= 3
+    return SHARED_POINTS[idx], SHARED_POINTS[idx + 1], SHARED_POINTS[idx + 2]
+
+
+def getfacet(idx):
+    """Get a facet from its index in the shared memory."""
+    idx *= 3
+    return SHARED_FACETS[idx], SHARED_FACETS[idx + 1], SHARED_FACETS[idx + 2]
+
+
+def getarea(idx):
+    """Get a facet area from its index in the shared memory."""
+    return SHARED_AREAS[idx]
+
+
+# *****************************************************************************
+
+
+def _facet_overlap_seam(triangle):
+    """Test whether facet overlaps the seam."""
+    phis = [atan2(x, y) for x, y, _ in triangle]
+    minphi, maxphi = min(phis), max(phis)
+    if minphi * maxphi >= 0:
+        return False
+
+    # We must also check we're not on the wrong side of the circle
+    # Seam is at -pi, +pi (due to atan2 behavior)
+    return minphi <= -pi / 2 and maxphi >= pi / 2
+
+
+def colorize(chunk):
+    """Attribute color to facets in chunk."""
+    if USE_NUMPY:
+        return colorize_np(chunk)
+
+    return colorize_std(chunk)
+
+
+def colorize_std(chunk):
+    """Attribute "colors" to facets, depending on their positions.
+
+    This method also computes partial sums for center of gravity.
+    The colors are directly set in shared memory.
+
+    Args:
+        chunk -- a pair of facet indices (start, stop)
+
+    Returns
+        Centroid of facets (point: 3-float tuple)
+        Area sum of facets (float)
+    """
+    start, stop = chunk
+    facets = (getfacet(i) for i in range(start, stop))
+    areas = [getarea(i) for i in range(start, stop)]
+    triangles = [tuple(getpoint(i) for i in facet) for facet in facets]
+
+    colors = [int(_facet_overlap_seam(t)) for t in triangles]
+    barys = (fmul(barycenter(t), a) for t, a in zip(triangles, areas))
+
+    centroid = add_n(*barys)
+    area = sum(areas)
+
+    SHARED_FACET_COLORS[start:stop] = colors
+
+    return centroid, area
+
+
+def colorize_np(chunk):
+    """Attribute color to facets in chunk - numpy version."""
+    start, stop = chunk
+    facets = SHARED_FACETS_NP[start:stop,]
+    areas = SHARED_AREAS_NP[start:stop]
+    triangles = np.take(SHARED_POINTS_NP, facets, axis=0)
+
+    # Compute facet colors (seam)
+    phis = np.arctan2(triangles[..., 0], triangles[..., 1])
+    minphis, maxphis = np.min(phis, axis=1), np.max(phis, axis=1)
+    facet_colors = (
+        (minphis * maxphis < 0)
+        & (minphis <= -np.pi / 2)
+        & (maxphis >= np.pi / 2)
+    )
+    np.copyto(
+        SHARED_FACET_COLORS_NP[start:stop], facet_colors, casting="unsafe"
+    )
+
+    # Compute center of gravity (triangle cogs weighted by triangle areas)
+    weighted_triangle_cogs = (
+        np.add.reduce(triangles, 1) * areas[:, np.newaxis] / 3
+    )
+    centroid = np.sum(weighted_triangle_cogs, axis=0).tolist()
+    area = float(np.sum(areas))
+
+    return centroid, area
+
+
+# *****************************************************************************
+
+
+def update_facets(chunk):
+    """Update point indices in facets.
+
+    To be run once points have been split by color.
+    """
+    # Inputs
+    start, stop = chunk
+
+    # Point map
+    # pylint: disable=global-variable-undefined
+    global SHARED_POINT_MAP
+    if SHARED_POINT_MAP is None:
+        length = SHARED_COLORED_POINTS_LEN.value
+        iterator = [iter(SHARED_COLORED_POINTS[0:length])] * 2
+        iterator = zip(*iterator)
+        SHARED_POINT_MAP = {
+            colored_point: index
+            for index, colored_point in enumerate(iterator)
+        }
+
+    # Aliases
+    point_map = SHARED_POINT_MAP
+    facets = SHARED_FACETS
+    colors = SHARED_FACET_COLORS
+
+    for ifacet in range(start, stop):
+        color = colors[ifacet]
+        index = ifacet * 3
+        facets[index] = point_map[facets[index], color]
+        facets[index + 1] = point_map[facets[index + 1], color]
+        facets[index + 2] = point_map[facets[index + 2], color]
+
+
+# *****************************************************************************
+
+
+# *****************************************************************************
+
+
+def compute_uvmap(chunk):
+    """Compute uvmap.
+
+    Args:
+        chunk -- a pair of colored point indices (start, stop)
+    """
+    if USE_NUMPY:
+        return compute_uvmap_np(chunk)
+
+    return compute_uvmap_std(chunk)
+
+
+def compute_uvmap_std(chunk):
+    """Compute uvmap.
+
+    Args:
+        chunk -- a pair of colored point indices (start, stop)
+    """
+    start, stop = chunk
+    colored_points = SHARED_COLORED_POINTS[start * 2 : stop * 2]
+    colored_points = [iter(colored_points)] * 2
+    colored_points = zip(*colored_points)
+    cog = tuple(SHARED_COG)
+
+    for index, (point, color) in zip(range(start, stop), colored_points):
+        vec_x, vec_y, vec_z = sub(getpoint(point), cog)
+        length = hypot(vec_x, vec_y, vec_z)
+        phi = atan2(vec_x, vec_y)
+        if color == 1 and phi < 0:
+            phi += 2 * pi
+        theta = asin(max(-1.0, min(1.0, vec_z / length))) if length else 0.0
+        uv_ = complex(0.5 + phi / (2 * pi), 0.5 + theta / pi)
+        uv_ *= length / 1000.0 * pi
+        SHARED_UVMAP[index * 2] = uv_.real
+        SHARED_UVMAP[index * 2 + 1] = uv_.imag
+
+
+def compute_uvmap_np(chunk):
+    """Compute uvmap (numpy).
+
+    Args:
+        chunk -- a pair of colored point indices (start, stop)
+    """
+    # Unpack args
+    start, stop = chunk
+
+    # Prepare chunk
+    point_indices = SHARED_COLORED_POINTS_NP[start:stop, 0].astype(np.int64)
+    points = np.take(SHARED_POINTS_NP, point_indices, axis=0)
+    point_colors = SHARED_COLORED_POINTS_NP[start:stop, 1]
+    cog = np.ctypeslib.as_array(SHARED_COG)
+
+    # Compute uvmap
+    vectors = points - cog
+    lengths = np.linalg.norm(vectors, axis=1)
+    phis = np.arctan2(vectors[..., 0], vectors[..., 1])
+    seam = (point_colors == 1) & (phis < 0)
+    phis = np.where(seam, phis + 2 * np.pi, phis)
+    sines = np.divide(
+        vectors[..., 2],
+        lengths,
+        out=np.zeros_like(lengths),
+        where=lengths != 0.0,
+    )
+    uvs = np.column_stack(
+        (
+            0.5 + phis / (2 * np.pi),
+            0.5 + np.arcsin(np.clip(sines, -1.0, 1.0)) / np.pi,
+        )
+    )
+    uvs *= (lengths / 1000.0 * np.pi)[:, np.newaxis]
+
+    np.copyto(SHARED_UVMAP_NP[start:stop], uvs, casting="unsafe")
+
+
+# *****************************************************************************
+
+
+def init(shared):
+    """Initialize pool of processes."""
+
+    # pylint: disable=global-variable-undefined
+    global SHARED_POINTS
+    SHARED_POINTS = shared["points"]
+
+    global SHARED_FACETS
+    SHARED_FACETS = shared["facets"]
+
+    global SHARED_AREAS
+    SHARED_AREAS = shared["areas"]
+
+    global SHARED_COG
+    SHARED_COG = shared["cog"]
+
+    global SHARED_FACET_COLORS
+    SHARED_FACET_COLORS = shared["facet_colors"]
+
+    global SHARED_COLORED_POINTS
+    SHARED_COLORED_POINTS = shared["colored_points"]
+
+    global SHARED_COLORED_POINTS_LEN
+    SHARED_COLORED_POINTS_LEN = shared["colored_points_len"]
+
+    global SHARED_POINT_MAP
+    SHARED_POINT_MAP = None
+
+    global SHARED_UVMAP
+    SHARED_UVMAP = shared["uvmap"]
+
+    # pylint: disable=global-statement
+    global USE_NUMPY
+
+    if USE_NUMPY := USE_NUMPY and shared["enable_numpy"]:
+        global SHARED_FACETS_NP
+        SHARED_FACETS_NP = np.ctypeslib.as_array(SHARED_FACETS)
+        SHARED_FACETS_NP.shape = (-1, 3)
+
+        global SHARED_POINTS_NP
+        SHARED_POINTS_NP = np.ctypeslib.as_array(SHARED_POINTS)
+        SHARED_POINTS_NP.shape = (len(SHARED_POINTS) // 3, 3)
+
+        global SHARED_AREAS_NP
+        SHARED_AREAS_NP = np.ctypeslib.as_array(SHARED_AREAS)
+
+        global SHARED_FACET_COLORS_NP
+        SHARED_FACET_COLORS_NP = np.ctypeslib.as_array(SHARED_FACET_COLORS)
+
+        global SHARED_COLORED_POINTS_NP
+        SHARED_COLORED_POINTS_NP = np.ctypeslib.as_array(SHARED_COLORED_POINTS)
+        SHARED_COLORED_POINTS_NP.shape = (len(SHARED_COLORED_POINTS) // 2, 2)
+
+        global SHARED_UVMAP_NP
+        SHARED_UVMAP_NP = np.ctypeslib.as_array(SHARED_UVMAP)
+        SHARED_UVMAP_NP.shape = (len(SHARED_UVMAP) // 2, 2)
+
+
+# *****************************************************************************
+
+
+# pylint: disable=too-many-arguments
+def main(
+    python,
+    points,
+    facets,
+    areas,
+    showtime,
+    enable_numpy,
+    out_points,
+    out_point_count,
+    out_facets,
+    out_uvmap,
+):
+    """Entry point for __main__.
+
+    This code executes in main process.
+    Keeping this code out of global scope makes all local objects to be freed
+    at the end of the function and thus avoid memory leaks.
+    """
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=too-many-locals
+    import multiprocessing as mp
+    import itertools
+    import time
+
+    count_facets = len(facets) // 3
+    count_points = len(points) // 3
+
+    tm0 = time.time()
+    if showtime:
+        msg = (
+            f"start uv computation: {count_points} points, "
+            f"{count_facets} facets"
+        )
+        print(msg)
+
+    def tick(msg=""):
+        """Print the time (debug purpose)."""
+        if showtime:
+            print(msg, time.time() - tm0)
+
+    def make_chunks(chunk_size, length):
+        return (
+            (i, min(i + chunk_size, length))
+            for i in range(0, length, chunk_size)
+        )
+
+    def run_unordered(pool, function, iterable):
+        imap = pool.imap_unordered(function, iterable)
+        for _ in imap:
+            pass
+
+    # Set working directory
+    save_dir = os.getcwd()
+    os.chdir(os.path.dirname(__file__))
+
+    # Set stdin
+    save_stdin = sys.stdin
+    sys.stdin = sys.__stdin__
+
+    # Set executable
+    ctx = mp.get_context("spawn")
+    ctx.set_executable(python)
+
+    chunk_size = 20000
+    nproc = os.cpu_count()
+
+    try:
+        # Compute facets colors
+        shared = {
+            "points": points,
+            "facets": facets,
+            "areas": areas,
+            "cog": workerpool.RawArray("f", 3),
+            "facet_colors": workerpool.RawArray("B", count_facets),
+            "colored_points": workerpool.RawArray(
+                "L", count_points * 2 * COLOR_COUNT
+            ),
+            "colored_points_len": workerpool.RawValue("l"),
+            "uvmap": workerpool.RawArray("f", count_points * 2 * COLOR_COUNT),
+            "enable_numpy": enable_numpy,
+        }
+        tick("prepare shared")
+        with workerpool.open_pool(ctx, nproc, init, (shared,)) as pool:
+            tick("start pool")
+            chunks = make_chunks(chunk_size, count_facets)
+            data = pool.imap_unordered(colorize, chunks)
+
+            centroids, area_sums = zip(*data)
+            centroid = add_n(*centroids)
+            area_sum = sum(area_sums)
+
+            # Compute center of gravity
+            cog = fdiv(centroid, area_sum)
+            shared["cog"][:] = cog
+            tick("colorize")
+
+            # Update points
+            fcol = shared["facet_colors"]
+            tiled_fcol = itertools.chain.from_iterable(zip(fcol, fcol, fcol))
+            colored_points = set(zip(facets, tiled_fcol))
+            colored_points_len = len(colored_points)
+            tick(f"new points ({colored_points_len} pts)")
+
+            # Update facets points
+            flat = list(itertools.chain.from_iterable(colored_points))
+            shared["colored_points"][0 : len(flat)] = flat
+            shared["colored_points_len"].value = len(flat)
+
+            # Update facets
+            chunks = make_chunks(chunk_size, count_facets)
+            run_unordered(pool, update_facets, chunks)
+            out_facets[::] = shared["facets"]
+            tick("update facets")
+
+            # Compute uvmap
+            chunks = make_chunks(chunk_size, colored_points_len)
+            run_unordered(pool, compute_uvmap, chunks)
+            out_uvmap[: len(shared["uvmap"])] = shared["uvmap"]
+            tick("uv map")
+
+            # Recompute point list
+            newpoints = [
+                coord
+                for i, _ in colored_points
+                for coord in points[3 * i : 3 * i + 3]
+            ]
+            out_points[: colored_points_len * 3] = newpoints
+            tick("new point list")
+    except Exception as exc:
+        print(traceback.format_exc())
+        if not sys.stdin.closed:
+            input("Press Enter to continue...")
+        raise exc
+    finally:
+        os.chdir(save_dir)
+        sys.stdin = save_stdin
+
+    out_point_count.value = colored_points_len
+
+
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # pylint: disable=used-before-assignment
+    main(
+        PYTHON,
+        POINTS,
+        FACETS,
+        AREAS,
+        SHOWTIME,
+        ENABLE_NUMPY,
+        OUT_POINTS,
+        OUT_POINT_COUNT,
+        OUT_FACETS,
+        OUT_UVMAP,
+    )
+
+    # Clean
+    PYTHON = None
+    POINTS = None
+    FACETS = None
+    AREAS = None
+    SHOWTIME = None
+    ENABLE_NUMPY = None
+    OUT_POINTS = None
+    OUT_POINT_COUNT = None
+    OUT_FACETS = None
+    OUT_UVMAP = None
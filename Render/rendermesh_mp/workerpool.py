@@ -0,0 +1,299 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""Shared objects and worker pool for multiprocessing scripts.
+
+In standalone mode (script run in a dedicated process), this module is a thin
+layer over multiprocessing: shared objects are passed to a fresh pool of
+processes by inheritance.
+
+In service mode (script run by service.py), a persistent pool of workers is
+reused from one script execution to another. Shared objects are then backed by
+named shared memory, so that they can be sent to running workers, and each
+worker initializes itself lazily, the first time it receives a task of a new
+job.
+"""
+
+import ctypes
+import functools
+import gc
+import itertools
+import os
+import pickle
+import sys
+import weakref
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.sharedctypes import typecode_to_type
+
+# Persistent pool (service mode only)
+_POOL = None
+
+# Lock for shared values (service mode only)
+_LOCK = None
+
+# Current job in worker
+_JOB = None
+
+_JOB_IDS = itertools.count()
+
+
+# *****************************************************************************
+
+
+def is_service():
+    """Check whether we are running in service mode."""
+    return _POOL is not None
+
+
+def _address(shm):
+    """Get the address of a shared memory block.
+
+    The temporary ctypes object is released immediately, so that the shared
+    memory buffer is not kept exported.
+    """
+    anchor = ctypes.c_char.from_buffer(shm.buf)
+    address = ctypes.addressof(anchor)
+    del anchor
+    return address
+
+
+@functools.lru_cache(256)
+def _array_type(typecode, length):
+    """Get a picklable ctypes array type, backed by shared memory."""
+    base = typecode_to_type[typecode] * length
+    return type(
+        f"SharedArray_{typecode}",
+        (base,),
+        {"__reduce__": _reduce_array, "typecode": typecode},
+    )
+
+
+@functools.lru_cache(32)
+def _value_type(typecode):
+    """Get a picklable ctypes value type, backed by shared memory."""
+    return type(
+        f"SharedValue_{typecode}",
+        (typecode_to_type[typecode],),
+        {
+            "__reduce__": _reduce_value,
+            "__enter__": _enter_value,
+            "__exit__": _exit_value,
+            "typecode": typecode,
+        },
+    )
+
+
+def _reduce_array(self):
+    return (attach_array, (self.shm.name, self.typecode, len(self)))
+
+
+def _reduce_value(self):
+    return (attach_value, (self.shm.name, self.typecode))
+
+
+def _enter_value(self):
+    _LOCK.acquire()
+    return self
+
+
+def _exit_value(self, *_):
+    _LOCK.release()
+
+
+def _new_shared(ctype, size, name=None):
+    """Create or attach a shared ctypes object."""
+    create = name is None
+    shm = shared_memory.SharedMemory(
+        name=name, create=create, size=max(size, 1)
+    )
+    obj = ctype.from_address(_address(shm))
+    obj.shm = shm  # Keep shared memory alive as long as obj is
+    if create:
+        weakref.finalize(obj, shm.unlink)
+    return obj
+
+
+def attach_array(name, typecode, length):
+    """Attach an array in an existing shared memory block."""
+    ctype = _array_type(typecode, length)
+    return _new_shared(ctype, ctypes.sizeof(ctype), name)
+
+
+def attach_value(name, typecode):
+    """Attach a value in an existing shared memory block."""
+    ctype = _value_type(typecode)
+    return _new_shared(ctype, ctypes.sizeof(ctype), name)
+
+
+def RawArray(typecode, size_or_initializer):  # pylint: disable=invalid-name
+    """Create a shared array (see multiprocessing.RawArray)."""
+    if not is_service():
+        ctx = mp.get_context("spawn")
+        return ctx.RawArray(typecode, size_or_initializer)
+
+    if isinstance(size_or_initializer, int):
+        size, initializer = size_or_initializer, None
+    else:
+        initializer = list(size_or_initializer)
+        size = len(initializer)
+    ctype = _array_type(typecode, size)
+    obj = _new_shared(ctype, ctypes.sizeof(ctype))
+    if initializer:
+        obj[:] = initializer
+    return obj
+
+
+def RawValue(typecode, *args):  # pylint: disable=invalid-name
+    """Create a shared value (see multiprocessing.RawValue)."""
+    if not is_service():
+        ctx = mp.get_context("spawn")
+        return ctx.RawValue(typecode, *args)
+
+    ctype = _value_type(typecode)
+    obj = _new_shared(ctype, ctypes.sizeof(ctype))
+    if args:
+        obj.value = args[0]
+    return obj
+
+
+def Value(typecode, *args):  # pylint: disable=invalid-name
+    """Create a shared value, with lock (see multiprocessing.Value).
+
+    In service mode, all values share the same lock.
+    """
+    if not is_service():
+        ctx = mp.get_context("spawn")
+        return ctx.Value(typecode, *args)
+    return RawValue(typecode, *args)
+
+
+# *****************************************************************************
+
+
+class JobPool:
+    """A view on the persistent pool, for one job.
+
+    Tasks are wrapped so that workers run the job initializer before
+    executing their first task for the job.
+    """
+
+    def __init__(self, pool, initializer, initargs):
+        self._pool = pool
+        self._job = (os.getpid(), next(_JOB_IDS))
+        self._payload = pickle.dumps((initializer, initargs))
+
+    def _wrap(self, func):
+        return functools.partial(_run_task, self._job, self._payload, func)
+
+    def imap(self, func, iterable, chunksize=1):
+        """Run func on iterable, ordered (see multiprocessing.Pool.imap)."""
+        return self._pool.imap(self._wrap(func), iterable, chunksize)
+
+    def imap_unordered(self, func, iterable, chunksize=1):
+        """Run func on iterable, unordered (see Pool.imap_unordered)."""
+        return self._pool.imap_unordered(self._wrap(func), iterable, chunksize)
+
+    def map(self, func, iterable, chunksize=None):
+        """Run func on iterable (see multiprocessing.Pool.map)."""
+        return self._pool.map(self._wrap(func), iterable, chunksize)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        # The pool is persistent: we do not terminate it
+        self._payload = None
+
+
+def open_pool(ctx, processes, initializer, initargs=()):
+    """Open a pool of processes for a job.
+
+    In standalone mode, a new pool is created. In service mode, the
+    persistent pool is used.
+    """
+    if not is_service():
+        return ctx.Pool(processes, initializer, initargs)
+    return JobPool(_POOL, initializer, initargs)
+
+
+def _run_task(job, payload, func, arg):
+    """Run a task in a worker, initializing worker for job if needed."""
+    global _JOB  # pylint: disable=global-statement
+    if job != _JOB:
+        # Some initializers disable garbage collection for speed...
+        gc.enable()
+        gc.collect()
+        initializer, initargs = pickle.loads(payload)
+        initializer(*initargs)
+        _JOB = job
+    return func(arg)
+
+
+def _init_worker(lock, path):
+    """Initialize a worker of the persistent pool."""
+    global _LOCK  # pylint: disable=global-statement
+    _LOCK = lock
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+# *****************************************************************************
+
+
+def start(ctx, processes):
+    """Start the persistent pool (service mode)."""
+    global _POOL, _LOCK  # pylint: disable=global-statement
+    _LOCK = ctx.Lock()
+    path = os.path.dirname(__file__)
+    _POOL = ctx.Pool(processes, _init_worker, (_LOCK, path))
+    return _POOL
+
+
+def stop():
+    """Stop the persistent pool (service mode)."""
+    global _POOL  # pylint: disable=global-statement
+    if _POOL is not None:
+        _POOL.terminate()
+        _POOL.join()
+    _POOL = None
+
+
+def check(timeout):
+    """Check the persistent pool is responsive.
+
+    Returns:
+        True if all workers answered within timeout, False otherwise
+    """
+    if _POOL is None:
+        return False
+    processes = _POOL._processes  # pylint: disable=protected-access
+    results = _POOL.map_async(_ping, range(processes), chunksize=1)
+    try:
+        results.get(timeout)
+    except mp.TimeoutError:
+        return False
+    return True
+
+
+def _ping(_):
+    return os.getpid()
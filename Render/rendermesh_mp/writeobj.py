@@ -25,12 +25,18 @@
 It is a helper for Rendermesh._write_objfile_mp.
 """
 
+import os
+import sys
 import multiprocessing as mp
 from multiprocessing.shared_memory import SharedMemory
 from multiprocessing.managers import SharedMemoryManager
 import functools
 import operator
 
+sys.path.insert(0, os.path.dirname(__file__))
+# pylint: disable=wrong-import-position
+import workerpool
+
 
 # Init
 def init(*args):
@@ -119,28 +125,41 @@ def format_facets(chunk):
 
 
 # Main
-if __name__ == "__main__":
-    import os
-    import sys
+# pylint: disable=too-many-arguments
+def main(
+    python,
+    points,
+    facets,
+    vnormals,
+    uvmap,
+    has_vnormals,
+    has_uvmap,
+    mtlfilename,
+    objfile,
+    objname,
+    mtlname,
+    showtime,
+):
+    """Entry point for __main__.
+
+    This code executes in main process.
+    Keeping this code out of global scope makes all local objects to be freed
+    at the end of the function and thus avoid memory leaks.
+    """
+    # pylint: disable=import-outside-toplevel
+    # pylint: disable=too-many-locals
     import time
 
-    # pylint: disable=used-before-assignment
     tm0 = time.time()
-    if SHOWTIME:
+    if showtime:
         print("\nWRITE OBJ")
 
     def tick(message=""):
         """Print the time (debug purpose)."""
-        if SHOWTIME:
+        if showtime:
             print(message, time.time() - tm0)
 
-    # Get variables
-    try:
-        PYTHON
-    except NameError:
-        PYTHON = None
-
-    assert PYTHON, "No Python executable provided."
+    assert python, "No Python executable provided."
 
     # Set working directory
     save_dir = os.getcwd()
@@ -151,11 +170,11 @@ if __name__ == "__main__":
     sys.stdin = sys.__stdin__
 
     # Set executable
-    mp.set_executable(PYTHON)
-    mp.set_start_method("spawn", force=True)
+    ctx = mp.get_context("spawn")
+    ctx.set_executable(python)
 
-    CHUNK_SIZE = 20000
-    NPROC = os.cpu_count()
+    chunk_size = 20000
+    nproc = os.cpu_count()
 
     def make_chunks(chunk_size, length):
         """Compute a tuple (start, stop) to define a chunk."""
@@ -166,37 +185,37 @@ if __name__ == "__main__":
 
     # Run
     try:
-        SHARED = {
-            "points": POINTS,
-            "facets": FACETS,
-            "vnormals": VNORMALS,
-            "uvmap": UVMAP,
+        shared = {
+            "points": points,
+            "facets": facets,
+            "vnormals": vnormals,
+            "uvmap": uvmap,
         }
-        count_points = len(POINTS) // 3
-        count_facets = len(FACETS) // 3
-        count_vnormals = len(VNORMALS) // 3
-        count_uvmap = len(UVMAP) // 2
+        count_points = len(points) // 3
+        count_facets = len(facets) // 3
+        count_vnormals = len(vnormals) // 3
+        count_uvmap = len(uvmap) // 2
 
         # Mask for facets
-        if HAS_VNORMALS and HAS_UVMAP:
-            MASK = " {0}/{0}/{0}"
-        elif not HAS_VNORMALS and HAS_UVMAP:
-            MASK = " {0}/{0}"
-        elif HAS_VNORMALS and not HAS_UVMAP:
-            MASK = " {0}//{0}"
+        if has_vnormals and has_uvmap:
+            mask = " {0}/{0}/{0}"
+        elif not has_vnormals and has_uvmap:
+            mask = " {0}/{0}"
+        elif has_vnormals and not has_uvmap:
+            mask = " {0}//{0}"
         else:
-            MASK = " {}"
+            mask = " {}"
 
-        with SharedMemoryManager() as smm:
+        with SharedMemoryManager(ctx=ctx) as smm:
             tick("shared memory manager started")
-            pool_args = (MASK, SHARED, smm.address)
-            with mp.Pool(NPROC, init, pool_args) as pool:
+            pool_args = (mask, shared, smm.address)
+            with workerpool.open_pool(ctx, nproc, init, pool_args) as pool:
                 tick("pool started")
-                with open(OBJFILE, "w+b") as f:
+                with open(objfile, "w+b") as f:
 
                     def write_array(name, format_function, item_number):
                         """Write an array to disk, using a format."""
-                        chunks = make_chunks(CHUNK_SIZE, item_number)
+                        chunks = make_chunks(chunk_size, item_number)
                         buffers = pool.imap(format_function, chunks)
                         results = (
                             (SharedMemory(name=n, create=False), s)
@@ -214,27 +233,27 @@ if __name__ == "__main__":
                     f.write(
                         "# Written by FreeCAD-Render (mp)\n".encode("utf-8")
                     )
-                    if MTLFILENAME:
-                        mtl = f"mtllib {MTLFILENAME}\n\n"
+                    if mtlfilename:
+                        mtl = f"mtllib {mtlfilename}\n\n"
                         f.write(mtl.encode("utf-8"))
 
                     # Write vertices (points)
                     write_array("Vertices", format_points, count_points)
 
                     # Write uv
-                    if HAS_UVMAP:
+                    if has_uvmap:
                         write_array("Uv map", format_uvmap, count_uvmap)
 
                     # Write vertex normals
-                    if HAS_VNORMALS:
+                    if has_vnormals:
                         write_array(
                             "Vertex normals", format_vnormals, count_vnormals
                         )
 
                     # Write object statement
-                    f.write(f"o {OBJNAME}\n".encode("utf-8"))
-                    if MTLNAME is not None:
-                        f.write(f"usemtl {MTLNAME}\n".encode("utf-8"))
+                    f.write(f"o {objname}\n".encode("utf-8"))
+                    if mtlname is not None:
+                        f.write(f"usemtl {mtlname}\n".encode("utf-8"))
 
                     # Write facets
                     write_array("Faces", format_facets, count_facets)
@@ -242,15 +261,35 @@ if __name__ == "__main__":
     finally:
         os.chdir(save_dir)
         sys.stdin = save_stdin
-        # Release shared variables
-        POINTS = None
-        FACETS = None
-        VNORMALS = None
-        UVMAP = None
-        SHOWTIME = None
-        OBJFILE = None
-        HAS_VNORMALS = None
-        HAS_UVMAP = None
-        OBJNAME = None
-        MTLFILENAME = None
-        MTLNAME = None
+
+
+if __name__ == "__main__":
+    # pylint: disable=used-before-assignment
+    main(
+        PYTHON,
+        POINTS,
+        FACETS,
+        VNORMALS,
+        UVMAP,
+        HAS_VNORMALS,
+        HAS_UVMAP,
+        MTLFILENAME,
+        OBJFILE,
+        OBJNAME,
+        MTLNAME,
+        SHOWTIME,
+    )
+
+    # Release shared variables
+    PYTHON = None
+    POINTS = None
+    FACETS = None
+    VNORMALS = None
+    UVMAP = None
+    SHOWTIME = None
+    OBJFILE = None
+    HAS_VNORMALS = None
+    HAS_UVMAP = None
+    OBJNAME = None
+    MTLNAME = None
+    MTLFILENAME = None
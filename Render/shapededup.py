@@ -0,0 +1,255 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements deduplication of identical shapes at export.
+
+Imported assemblies (STEP...) often contain many distinct Part::Feature
+objects with identical shapes (screws, washers, standard profiles...), which
+differ only by their Placement. When deduplication is enabled (see
+'EnableShapeDedup' parameter), such objects are grouped before export: the
+first object of a group (the leader) is written along with the others, as
+instances of a single mesh (if renderer supports instancing).
+
+Besides, each shape to mesh is looked up in the registry, so that identical
+shapes are meshed only once, whatever their objects.
+
+Shapes are compared by a placement-invariant fingerprint (topology counts,
+volume, area, inertia and vertex set, at null placement). As a consequence,
+shapes whose geometry is identical but has been moved inside the shape
+itself (rather than by Placement) are not detected as identical.
+"""
+
+import threading
+import concurrent.futures
+import hashlib
+
+import FreeCAD as App
+
+from Render.utils import debug
+
+
+# Relative tolerance for fingerprint values (relative to shape size)
+TOLERANCE = 1e-7
+
+# View properties that do not affect rendering
+IGNORED_VIEW_PROPERTIES = frozenset(
+    (
+        "Source",
+        "ViewResult",
+        "Label",
+        "Label2",
+        "ExpressionEngine",
+        "Visibility",
+        "Proxy",
+    )
+)
+
+
+# ===========================================================================
+#                                 Fingerprints
+# ===========================================================================
+
+
+def shape_fingerprint(shape):
+    """Compute a placement-invariant fingerprint of a Part shape.
+
+    The fingerprint is computed at null placement, from topology counts,
+    volume, area, inertia and vertex set. Values are rounded relatively to
+    shape size, so that numerical noise does not prevent matching.
+
+    Returns:
+        The fingerprint, as a hex string
+    """
+    shape = shape.copy()
+    shape.Placement = App.Base.Placement()
+
+    counts = tuple(
+        len(getattr(shape, attr))
+        for attr in ("Solids", "Shells", "Faces", "Edges", "Vertexes")
+    )
+
+    size = shape.BoundBox.DiagonalLength if counts[4] else 0.0
+    unit = max(size, 1e-6) * TOLERANCE
+
+    def quantize(value, dimension=1):
+        return round(value / unit**dimension)
+
+    try:
+        inertia = shape.MatrixOfInertia.A
+    except (AttributeError, RuntimeError):
+        inertia = ()
+
+    vertices = sorted(
+        tuple(quantize(c) for c in vertex.Point) for vertex in shape.Vertexes
+    )
+
+    hasher = hashlib.sha256()
+    components = (
+        counts,
+        quantize(shape.Volume, 3),
+        quantize(shape.Area, 2),
+        tuple(quantize(i, 5) for i in inertia),
+        vertices,
+    )
+    for component in components:
+        hasher.update(b"\x00")
+        hasher.update(repr(component).encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def view_settings(view):
+    """Get the rendering settings of a view, as a hashable value.
+
+    Settings include view properties (material, autosmooth, uv projection,
+    renderer specifics...) and source material.
+    """
+    try:
+        properties = view.PropertiesList
+    except AttributeError:
+        properties = []
+
+    def normalize(value):
+        return getattr(value, "FullName", None) or str(value)
+
+    settings = tuple(
+        (prop, normalize(view.getPropertyByName(prop)))
+        for prop in sorted(properties)
+        if prop not in IGNORED_VIEW_PROPERTIES
+    )
+    source_material = getattr(view.Source, "Material", None)
+    return settings, normalize(source_material)
+
+
+def _is_eligible(view):
+    """Check whether a view may be deduplicated.
+
+    Only plain Part::Feature objects are deduplicated (links, arrays and
+    scripted objects are handled by their own mechanisms).
+    """
+    source = view.Source
+    return getattr(source, "TypeId", None) == "Part::Feature" and not (
+        source.Shape.isNull()
+    )
+
+
+# ===========================================================================
+#                                 Registry
+# ===========================================================================
+
+
+class ShapeDedup:
+    """An export-scoped registry of deduplicated shapes and objects.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self):
+        """Initialize registry."""
+        self._followers = {}  # Leader name -> list of follower views
+        self._leaders = {}  # Follower name -> leader name
+        self._futures = {}  # Mesh key -> future rendermesh
+        self._lock = threading.Lock()
+        self.objects = 0
+        self.groups = 0
+        self.shapes = 0
+
+    def group_views(self, views):
+        """Group views with identical shapes and settings.
+
+        The first view of each group becomes its leader, and will be
+        written along with the other views (followers).
+
+        Args:
+            views -- the views to group (list)
+        """
+        leaders = {}
+        for view in views:
+            if not _is_eligible(view):
+                continue
+            try:
+                key = (
+                    shape_fingerprint(view.Source.Shape),
+                    view_settings(view),
+                )
+            except (AttributeError, RuntimeError) as err:
+                debug("Dedup", view.Source.Label, f"Skipped ({err})")
+                continue
+            self.objects += 1
+            name = view.FullName
+            if (leader := leaders.setdefault(key, view)) is view:
+                self.groups += 1
+                continue
+            leader_name = leader.FullName
+            self._followers.setdefault(leader_name, []).append(view)
+            self._leaders[name] = leader_name
+
+    def followers(self, view):
+        """Get the views to be written along with a leader view."""
+        return self._followers.get(getattr(view, "FullName", None), [])
+
+    def leader(self, view):
+        """Get the leader name of a follower view (or None)."""
+        return self._leaders.get(getattr(view, "FullName", None))
+
+    def get_mesh(self, key, compute):
+        """Get the mesh for a key, computing it if necessary.
+
+        If several threads request the same key, only one computes the mesh,
+        the others wait for the result.
+
+        Args:
+            key -- the mesh key (hashable)
+            compute -- a callable computing the mesh
+
+        Returns:
+            The (shared) mesh
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._futures[key] = future
+            self.shapes += 1
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+
+        return future.result()
+
+    def report(self):
+        """Report deduplication ratios in export log."""
+        meshes = len(self._futures)
+        objects_ratio = self.objects / self.groups if self.groups else 1.0
+        shapes_ratio = self.shapes / meshes if meshes else 1.0
+        msg = (
+            "[Render][Dedup] "
+            f"{self.objects} objects in {self.groups} groups "
+            f"(ratio {objects_ratio:.2f}) - "
+            f"{self.shapes} shapes meshed as {meshes} "
+            f"(ratio {shapes_ratio:.2f})\n"
+        )
+        App.Console.PrintMessage(msg)
@@ -0,0 +1,119 @@
+# ***************************************************************************
+# *                                                                         *
+# *   Copyright (c) 2025 Howetuft <howetuft@gmail.com>                      *
+# *                                                                         *
+# *   This program is free software; you can redistribute it and/or modify  *
+# *   it under the terms of the GNU Lesser General Public License (LGPL)    *
+# *   as published by the Free Software Foundation; either version 2.1 of   *
+# *   the License, or (at your option) any later version.                   *
+# *   for detail see the LICENCE text file.                                 *
+# *                                                                         *
+# *   This program is distributed in the hope that it will be useful,       *
+# *   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+# *   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+# *   GNU Library General Public License for more details.                  *
+# *                                                                         *
+# *   You should have received a copy of the GNU Library General Public     *
+# *   License along with this program; if not, write to the Free Software   *
+# *   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+# *   USA                                                                   *
+# *                                                                         *
+# ***************************************************************************
+
+"""This module implements static batching of small meshes at export.
+
+Scenes made of thousands of tiny parts generate thousands of mesh files and
+object blocks, so that renderers may spend more time in parsing and building
+per-object structures than in rendering. When static batching is enabled
+(see 'StaticBatchingFacets' parameter), renderables below a facet threshold
+are not written with their objects: they are collected, grouped by material
+and color (which determine the resolved rendering material), and each group
+is eventually written as a single mesh, with transformations baked into the
+vertices.
+
+Instanced renderables (arrays, links...) are not batched, as instancing is
+already cheaper. Batching relies on numpy RenderMeshes (see
+Render.rendermesh.merge_rendermeshes): other meshes are written as usual.
+"""
+
+import threading
+
+from Render.rendermesh import merge_rendermeshes
+from Render.rendermesh_mixins import RenderMeshNumpyMixin
+from Render.utils import debug
+
+
+class StaticBatch:
+    """A registry of renderables to be merged by material.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, max_facets):
+        """Initialize registry.
+
+        Args:
+            max_facets -- the facet count below which renderables are batched
+        """
+        self.max_facets = int(max_facets)
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def add(self, renderable, kwargs):
+        """Try to add a renderable to the registry.
+
+        Args:
+            renderable -- the renderable to add (Renderable)
+            kwargs -- the keyword arguments to pass to renderer 'write_mesh'
+
+        Returns:
+            True if the renderable has been added (it must not be written
+            by the caller), False otherwise
+        """
+        mesh = renderable.mesh
+        if (
+            not isinstance(mesh, RenderMeshNumpyMixin)
+            or mesh.skip_meshing
+            or mesh.cache_metadata is not None
+            or mesh.count_facets >= self.max_facets
+        ):
+            return False
+        color = renderable.defcolor
+        key = (
+            id(renderable.material),
+            tuple(color.to_srgb()) if color is not None else None,
+            mesh.has_uvmap(),
+            mesh.has_vnormals(),
+            repr(sorted(kwargs.items())),
+        )
+        with self._lock:
+            group = self._groups.setdefault(key, ([], kwargs))
+            group[0].append(renderable)
+        return True
+
+    def pop_groups(self, name):
+        """Pop groups of renderables, with merged meshes.
+
+        Args:
+            name -- a name prefix for merged renderables (str)
+
+        Returns:
+            A list of (renderable, kwargs) tuples, one per group, where
+            renderable holds the merged mesh
+        """
+        with self._lock:
+            groups, self._groups = self._groups, {}
+        result = []
+        for index, (rends, kwargs) in enumerate(groups.values()):
+            first = rends[0]
+            if len(rends) > 1:
+                batch_name = f"{name}{index}"
+                mesh = merge_rendermeshes([r.mesh for r in rends], batch_name)
+                first = first._replace(name=batch_name, mesh=mesh)
+                msg = (
+                    f"{len(rends)} meshes batched "
+                    f"({mesh.count_facets} facets)"
+                )
+                debug("Batch", batch_name, msg)
+            result.append((first, kwargs))
+        return result
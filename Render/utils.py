@@ -277,6 +277,7 @@ def reload(module_name=None):
             "Render.rdrexecutor",
             "Render.renderables",
             "Render.rendermesh",
+            "Render.meshcache",
             "Render.utils",
             "Render.view",
             "Render.texture",
@@ -108,6 +108,30 @@ class View(FeatureBase):
             30,
             0,
         ),
+        "LOD": Prop(
+            "App::PropertyInteger",
+            "Level of Detail",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Decimate the mesh of this view down to this number of "
+                "facets (0 = no decimation). Useful for heavy meshes "
+                "(scans, terrains...)",
+            ),
+            0,
+            0,
+        ),
+        "LODError": Prop(
+            "App::PropertyLength",
+            "Level of Detail",
+            QT_TRANSLATE_NOOP(
+                "App::Property",
+                "Maximum geometric error allowed by decimation "
+                "(0 = no bound). If LOD is 0, the mesh is decimated up to "
+                "this error",
+            ),
+            0,
+            0,
+        ),
         "CyclesObjectCastCaustics": Prop(
             "App::PropertyBool",
             chr(127) + "Specifics",